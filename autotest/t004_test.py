@@ -558,6 +558,41 @@ def test_mflist():
     assert flx1.sum() == flx2.sum()
 
 
+def test_mflist_sparse():
+    dtype = flopy.modflow.ModflowWel.get_default_dtype()
+    m4d = np.zeros((3, 2, 4, 5)) + np.NaN
+    m4d[0, 1, 2, 3] = 1.
+    m4d[0, 0, 3, 4] = 2.
+    m4d[2, 1, 0, 0] = 3.
+    sp_data = flopy.utils.MfList.masked4D_arrays_to_stress_period_data(
+        dtype, {"flux": m4d})
+    assert [len(sp_data[kper]) for kper in range(3)] == [2, 0, 1]
+    # the same stress period data from zero-based node numbers
+    node = np.array([1 * 20 + 2 * 5 + 3, 3 * 5 + 4])
+    sparse = {0: (node[::-1], {"flux": [2., 1.]}),
+              1: ([], {"flux": []}),
+              2: ([20], {"flux": [3.]})}
+    sp_data2 = flopy.utils.MfList.sparse_to_stress_period_data(
+        dtype, sparse, 4, 5)
+    for kper in range(3):
+        assert np.array_equal(sp_data[kper], sp_data2[kper])
+
+    # well package from the compact budget list of a cell budget file
+    from flopy.utils.flopy_io import flux_to_wel
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=5, nrow=25, ncol=25, nper=3)
+    cbc = os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.BUD')
+    wel = flux_to_wel(cbc, 'RIVER LEAKAGE', model=ml)
+    cbf = flopy.utils.CellBudgetFile(cbc)
+    for kper in range(3):
+        kstpkper = [kk for kk in cbf.get_kstpkper() if kk[1] == kper][0]
+        q = cbf.get_data(kstpkper=kstpkper, text='RIVER LEAKAGE',
+                         full3D=True)[0]
+        spd = wel.stress_period_data[kper]
+        assert len(spd) == np.count_nonzero(q.filled(0.))
+        assert np.allclose(q[spd.k, spd.i, spd.j], spd.flux)
+
+
 def test_how():
     import numpy as np
     import flopy
@@ -585,6 +620,38 @@ def test_util3d_reset():
     ml.bas6.strt = arr
 
 
+def test_mflist_load_mixed_format():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, 3, 3, 3, 1)
+    # a free format record and a fixed format record with values that
+    # run together, both followed by a value that is not read
+    fname = os.path.join(out_dir, 'mixed.wel')
+    with open(fname, 'w') as f:
+        f.write('         2         0\n')
+        f.write('         2         0\n')
+        f.write('1 1 1 -50. 0.25\n')
+        f.write('         1         2         3-1.000E+02       0.5\n')
+    wel = flopy.modflow.ModflowWel.load(fname, ml)
+    ra = wel.stress_period_data[0]
+    assert np.array_equal(ra.k, [0, 0])
+    assert np.array_equal(ra.i, [0, 1])
+    assert np.array_equal(ra.j, [0, 2])
+    assert np.allclose(ra.flux, [-50., -100.])
+
+    # values that can not be converted are not truncated
+    for value in ['-1.0D+02', '-100x']:
+        with open(fname, 'w') as f:
+            f.write('         2         0\n')
+            f.write('         2         0\n')
+            f.write('1 1 1 -50.\n')
+            f.write('1 2 3 {}\n'.format(value))
+        try:
+            flopy.modflow.ModflowWel.load(fname, ml)
+            assert False, '{} should not be read'.format(value)
+        except ValueError:
+            pass
+
+
 if __name__ == '__main__':
     # test_util3d_reset()
     # test_mflist()
@@ -457,6 +457,257 @@ def test_map_rotation():
     check_vertices()
 
 
+def test_crosssection():
+    import matplotlib
+    matplotlib.use('Agg')
+    nlay, nrow, ncol = 3, 4, 5
+    m = flopy.modflow.Modflow()
+    botm = np.array([-10., -15., -20., -30.])
+    dis = flopy.modflow.ModflowDis(m, nlay=nlay, nrow=nrow, ncol=ncol,
+                                   delr=100., delc=100., top=0.,
+                                   botm=botm, laycbd=[1, 0, 0])
+    bas = flopy.modflow.ModflowBas(m)
+    xs = flopy.plot.ModelCrossSection(model=m, line={'row': 1})
+    # one row for each model layer and confining bed
+    assert xs.xcentergrid.shape == (nlay + 1, ncol)
+    assert np.allclose(xs.xcentergrid[0], np.arange(50., 500., 100.))
+    assert np.allclose(xs.zcentergrid[:, 0], [-5., -12.5, -17.5, -25.])
+
+    a = np.arange(nlay * nrow * ncol, dtype=np.float).reshape(nlay, nrow,
+                                                               ncol)
+    a[0, 1, 2] = np.nan
+    pc = xs.plot_array(a)
+    # confining bed cells are not plotted
+    assert len(pc.get_paths()) == nlay * ncol - 1
+    assert np.allclose(pc.get_array()[:ncol - 1], [5., 6., 8., 9.])
+    assert np.allclose(pc.get_paths()[0].vertices[:4],
+                       [[0., -10.], [0., 0.], [100., 0.], [100., -10.]])
+    lc = xs.plot_grid()
+    assert len(lc.get_segments()) == 4 * (nlay + 1) * ncol
+
+    # discharge vectors in every model layer
+    frf = np.ones((nlay, nrow, ncol))
+    fff = np.zeros((nlay, nrow, ncol))
+    flf = -np.ones((nlay, nrow, ncol))
+    q = xs.plot_discharge(frf, fff, flf)
+    assert q.N == nlay * ncol
+    assert np.all(np.asarray(q.V) > 0.)
+
+
+def test_specific_discharge():
+    from flopy.plot import plotutil
+    ntimes, nlay, nrow, ncol = 5, 3, 4, 6
+    rs = np.random.RandomState(1)
+    top = 10. * np.ones((nrow, ncol))
+    botm = np.array([5., 0., -5.])[:, None, None] * np.ones((nrow, ncol))
+    laytyp = [1, 0, 0]
+    head = rs.uniform(2., 12., size=(ntimes, nlay, nrow, ncol))
+    head[0, 0, 0, 0] = 999.
+    delr = rs.uniform(1., 2., ncol)
+    delc = rs.uniform(1., 2., nrow)
+    Q = [rs.normal(size=head.shape) for _ in range(3)]
+
+    sat_thk = plotutil.saturated_thickness(head, top, botm, laytyp, [999.],
+                                           chunksize=2)
+    assert sat_thk.shape == head.shape
+    assert sat_thk[0, 0, 0, 0] == 5.
+    assert np.allclose(sat_thk[:, 1:], 5.)
+    assert np.all(sat_thk[1:, 0] <= 5.)
+    q = plotutil.centered_specific_discharge(Q[0], Q[1], Q[2], delr, delc,
+                                             sat_thk, chunksize=2)
+    # stacked results are the same as results for each time
+    for t in range(ntimes):
+        s = plotutil.saturated_thickness(head[t], top, botm, laytyp, [999.])
+        assert np.allclose(s, sat_thk[t])
+        qt = plotutil.centered_specific_discharge(Q[0][t], Q[1][t], Q[2][t],
+                                                  delr, delc, s)
+        for a, b in zip(q, qt):
+            assert np.allclose(a[t], b)
+    qx, qy, qz = plotutil.centered_specific_discharge(Q[0], None, None, delr,
+                                                      delc, sat_thk)
+    assert np.allclose(qx, q[0]) and qy is None and qz is None
+
+
+def test_ensemble_statistics():
+    from flopy.export.utils import EnsembleStatistics
+    from flopy.export.netcdf import FILLVALUE
+    rs = np.random.RandomState(2017)
+    reals = [{'hk': rs.lognormal(size=(2, 5, 6)).astype(np.float32),
+              'ibound': rs.randint(0, 3, size=(2, 5, 6))}
+             for _ in range(200)]
+    reals[-1]['hk'][0, 0, 0] = np.nan
+    hk = np.array([r['hk'] for r in reals])
+    ib = np.array([r['ibound'] for r in reals])
+    es = EnsembleStatistics(minmax=True, quantiles=[0.1, 0.5])
+    for r in reals:
+        es.update(r)
+    stats = es.get_statistics()
+    assert list(stats.keys()) == ['**mean**', '**stdev**', '**min**',
+                                  '**max**', '**q10**', '**q50**']
+    for suffix in stats.keys():
+        assert stats[suffix]['hk'][0, 0, 0] == np.float32(FILLVALUE)
+    assert stats['**mean**']['hk'].dtype == np.float32
+    assert stats['**mean**']['ibound'].dtype == np.float64
+    assert np.allclose(stats['**mean**']['hk'][1], hk.mean(axis=0)[1])
+    assert np.allclose(stats['**stdev**']['hk'][1], hk.std(axis=0)[1])
+    assert np.allclose(stats['**mean**']['ibound'], ib.mean(axis=0))
+    assert np.array_equal(stats['**min**']['hk'][1], hk.min(axis=0)[1])
+    assert np.array_equal(stats['**max**']['ibound'], ib.max(axis=0))
+    # quantiles are estimated
+    for q in [10, 50]:
+        qnt = np.percentile(hk[:, 1], q, axis=0)
+        assert np.median(np.abs(stats['**q{}**'.format(q)]['hk'][1] - qnt) /
+                         qnt) < 0.1
+    # quantiles of a few realizations are exact
+    es = EnsembleStatistics(quantiles=[0.5])
+    for r in reals[:4]:
+        es.update(r)
+    assert np.allclose(es.get_statistics()['**q50**']['ibound'],
+                       np.median(ib[:4], axis=0))
+
+
+def test_netcdf_blocks():
+    from flopy.export.netcdf import _iter_blocks, _min_max, \
+        _difference_block, FILLVALUE
+
+    # blocks of the first dimension cover the variable once
+    shape = (7, 2, 3, 4)
+    for maxbytes in [1, 100, 200, 1e9]:
+        blocks = list(_iter_blocks(shape, 4, maxbytes))
+        idx = np.concatenate([np.arange(7)[sl] for sl in blocks])
+        assert np.array_equal(idx, np.arange(7))
+        n = max(1, int(maxbytes // (4 * 24)))
+        assert all(sl.stop - sl.start <= n for sl in blocks)
+    assert list(_iter_blocks((), 8, 100)) == [Ellipsis]
+    assert list(_iter_blocks((0, 3), 8, 100)) == []
+
+    # masked and nan values are ignored by the running min and max
+    a = np.ma.masked_array([1., -5., np.nan, 9.], mask=[0, 1, 0, 0])
+    assert _min_max(a) == (1., 9.)
+    assert _min_max(np.array([-2., 3.]), 1., 9.) == (-2., 9.)
+    assert _min_max(np.ma.masked_all(3), 1., 2.) == (1., 2.)
+    assert _min_max(np.array([np.nan])) == (None, None)
+
+    s = np.ma.masked_array([5., 4., 3., 2., 1., np.nan],
+                           mask=[0, 1, 0, 0, 1, 0])
+    o = np.ma.masked_array([1., 4., 3., 1., 1., 1.],
+                           mask=[0, 0, 0, 1, 1, 0])
+    d, raw = _difference_block(s, o, mask_zero_diff=False)
+    # masked values are zero in the raw difference, and are masked in
+    # the difference where the difference is zero
+    assert np.array_equal(raw[:5], [4., -4., 0., 2., 0.])
+    assert np.isnan(raw[5])
+    assert np.array_equal(d, [4., -4., 0., 2., FILLVALUE, FILLVALUE])
+    d, raw = _difference_block(s, o, minuend='other', mask_zero_diff=False)
+    assert np.array_equal(raw[:5], [-4., 4., 0., -2., 0.])
+    assert np.array_equal(d, [-4., 4., 0., -2., FILLVALUE, FILLVALUE])
+    d, raw = _difference_block(s, o)
+    assert np.array_equal(d, [4., -4., FILLVALUE, 2., FILLVALUE, FILLVALUE])
+    # the inputs are not changed
+    assert s[0] == 5. and s.mask[1] and o[3] is np.ma.masked
+    d, raw = _difference_block(np.array([2., 1.]), np.array([1., 1.]))
+    assert np.array_equal(d, [1., FILLVALUE])
+    try:
+        _difference_block(s, o, minuend='both')
+        assert False, 'unrecognized minuend should raise an error'
+    except Exception as e:
+        assert 'minuend' in str(e)
+
+
+def test_ensemble_helper_netcdf():
+    import os
+    import flopy
+    from flopy.export.utils import ensemble_helper
+
+    # Do not fail if netCDF4 not installed
+    try:
+        import netCDF4
+        import pyproj
+    except:
+        return
+
+    nam_file = "freyberg.nam"
+    model_ws = os.path.join('..', 'examples', 'data',
+                            'freyberg_multilayer_transient')
+    models = [flopy.modflow.Modflow.load(nam_file, model_ws=model_ws,
+                                         check=False, verbose=False,
+                                         load_only=['upw'])
+              for i in range(3)]
+    hk = models[0].upw.hk.array
+
+    fnc = os.path.join(npth, "ensemble_inputs.nc")
+    f_in, f_out = ensemble_helper(fnc, None, models, add_reals=False,
+                                  minmax=True)
+    assert f_out is None
+    # the statistics are written to the requested file
+    assert f_in.output_filename == fnc
+    assert os.path.exists(fnc)
+    names = list(f_in.nc.variables.keys())
+    for suffix in ['**mean**', '**stdev**', '**min**', '**max**']:
+        assert "hk" + suffix in names, names
+    assert np.allclose(f_in.nc.variables["hk**mean**"][:], hk)
+    assert np.allclose(f_in.nc.variables["hk**max**"][:], hk)
+    assert np.allclose(f_in.nc.variables["hk**stdev**"][:], 0.)
+
+
+def test_export_cbc_duplicate_text():
+    import os
+    from flopy.export.utils import _add_output_nc_variable
+    nlay, nrow, ncol = 2, 3, 4
+    h1 = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                   ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+    h2 = np.dtype([('imeth', 'i4'), ('delt', 'f4'), ('pertim', 'f4'),
+                   ('totim', 'f4')])
+    rec = np.dtype([('node', 'i4'), ('q', 'f4')])
+    # two packages write WELLS records at each time
+    fname = os.path.join(tpth, 'duplicate_text.cbc')
+    with open(fname, 'wb') as f:
+        for kper in range(2):
+            for q in [1., 10.]:
+                np.array([(1, kper + 1, '           WELLS', ncol, nrow,
+                           -nlay)], dtype=h1).tofile(f)
+                np.array([(2, 1., 1., kper + 1.)], dtype=h2).tofile(f)
+                np.array([2], dtype=np.int32).tofile(f)
+                np.array([(1, q), (nrow * ncol + 6, q + kper)],
+                         dtype=rec).tofile(f)
+    cbc = flopy.utils.CellBudgetFile(fname)
+    text = cbc.get_unique_record_names()[0]
+    # the first record of each time is exported
+    f = _add_output_nc_variable({}, cbc.get_times(), (nlay, nrow, ncol),
+                                cbc, 'cbc', text=text)
+    assert np.array_equal(f['wells'][:, 0, 0, 0], [1., 1.])
+    assert np.array_equal(f['wells'][:, 1, 1, 1], [1., 2.])
+    cbc.close()
+
+
+def test_get_rc():
+    delr = np.array([100.] * 5 + [50.] * 10 + [100.] * 5)
+    delc = np.array([200.] * 10 + [100.] * 20)
+    for rotation in [0., 30., -135.]:
+        sr = flopy.utils.SpatialReference(delr=delr, delc=delc,
+                                          xul=500000, yul=2934000,
+                                          rotation=rotation,
+                                          length_multiplier=.3048)
+        r, c = np.meshgrid(np.arange(sr.nrow), np.arange(sr.ncol),
+                           indexing='ij')
+        x, y = sr.get_xy(r.ravel(), c.ravel())
+        assert np.allclose(x, sr.xcentergrid.ravel())
+        assert np.allclose(y, sr.ycentergrid.ravel())
+        rr, cc = sr.get_rc(x, y)
+        assert np.array_equal(rr, r.ravel())
+        assert np.array_equal(cc, c.ravel())
+
+        assert sr.get_rc(*sr.get_xy(3, 7)) == (3, 7)
+        # corners of the grid are inside, points past them are not
+        xg, yg = sr.xgrid, sr.ygrid
+        assert sr.get_rc(xg[0, 0], yg[0, 0]) == (0, 0)
+        assert sr.get_rc(xg[-1, -1], yg[-1, -1]) == (sr.nrow - 1, sr.ncol - 1)
+        xo, yo = sr.transform(np.array([-1., 1., 1501., 500.]),
+                              np.array([1., -1., 500., 4001.]))
+        rr, cc = sr.get_rc(xo, yo)
+        assert np.all(rr == -1) and np.all(cc == -1)
+
+
 def test_netcdf_classmethods():
     import os
     import flopy
@@ -483,6 +734,43 @@ def test_netcdf_classmethods():
     assert len(diff) == 0, str(diff)
 
 
+def test_netcdf_difference():
+    import os
+    import flopy
+
+    # Do not fail if netCDF4 not installed
+    try:
+        import netCDF4
+        import pyproj
+    except:
+        return
+
+    nam_file = "freyberg.nam"
+    model_ws = os.path.join('..', 'examples', 'data',
+                            'freyberg_multilayer_transient')
+    ml = flopy.modflow.Modflow.load(nam_file, model_ws=model_ws, check=False,
+                                    verbose=False, load_only=[])
+
+    f = ml.export(os.path.join(npth, "freyberg_diff.nc"))
+    f2 = f.copy(os.path.join(npth, "freyberg_copy.nc"))
+    assert np.allclose(f2.nc.variables["model_top"][:],
+                       f.nc.variables["model_top"][:])
+
+    # variables without differences are not written
+    d = f.difference(f2.nc)
+    assert "model_top" not in d.nc.variables
+
+    # several differences in one pass, in small blocks
+    fnames = [os.path.join(npth, "freyberg_diff{}.nc".format(i))
+              for i in range(2)]
+    diffs = f.difference([f2.nc, f2.nc], onlydiff=False,
+                         mask_zero_diff=False, output_filename=fnames,
+                         maxbytes=1000)
+    assert len(diffs) == 2
+    for d in diffs:
+        assert np.allclose(d.nc.variables["model_top"][:], 0.)
+
+
 # def test_netcdf_overloads():
 #     import os
 #     import flopy
@@ -574,6 +862,7 @@ if __name__ == '__main__':
     # test_shapefile_ibound()
     # test_netcdf_overloads()
     #test_netcdf_classmethods()
+    #test_netcdf_difference()
     # build_netcdf()
     # build_sfr_netcdf()
     test_sr()
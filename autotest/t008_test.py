@@ -4,6 +4,7 @@ These are the examples that are distributed with MODFLOW-2005.
 """
 
 import os
+import numpy as np
 import flopy
 
 tpth = os.path.join('temp', 't008')
@@ -119,6 +120,60 @@ def load_nwt_model(nfile):
                                       'temp')
 
 
+def test_modflow_load_lazy():
+    namfile = 'freyberg.nam'
+    model_ws = os.path.join('..', 'examples', 'data', 'freyberg')
+    m = flopy.modflow.Modflow.load(namfile, model_ws=model_ws,
+                                   verbose=False, check=False)
+    ml = flopy.modflow.Modflow.load(namfile, model_ws=model_ws,
+                                    verbose=False, check=False, lazy=True)
+    assert len(ml.packagelist) == 2, ml.get_package_list()
+    assert sorted(ml.get_package_list()) == sorted(m.get_package_list())
+    # packages are loaded on first access
+    assert ml.lpf is not None
+    assert ml.lpf in ml.packagelist
+    assert np.array_equal(ml.lpf.hk.array, m.lpf.hk.array)
+    assert np.array_equal(ml.wel.stress_period_data[0],
+                          m.wel.stress_period_data[0])
+    # write_input loads the remaining packages
+    ml.change_model_ws(tpth)
+    ml.write_input()
+    assert len(ml.packagelist) == len(m.packagelist)
+
+
+def test_modflow_load_lazy_remove_missing():
+    import shutil
+    namfile = 'freyberg.nam'
+    model_ws = os.path.join('..', 'examples', 'data', 'freyberg')
+    ml = flopy.modflow.Modflow.load(namfile, model_ws=model_ws,
+                                    verbose=False, check=False, lazy=True)
+    # pending packages can be removed without loading them
+    ml.remove_package('RIV')
+    assert 'RIV' not in ml.get_package_list()
+    assert ml.get_package('RIV') is None
+    ml.load_lazy_packages()
+    assert 'RIV' not in ml.get_package_list()
+
+    # package files that can not be opened are reported when loading
+    pth = os.path.join(tpth, 'freyberg_missing')
+    if os.path.isdir(pth):
+        shutil.rmtree(pth)
+    os.makedirs(pth)
+    for f in os.listdir(model_ws):
+        if f.startswith('freyberg.') and f != 'freyberg.wel':
+            shutil.copy(os.path.join(model_ws, f), pth)
+    ml = flopy.modflow.Modflow.load(namfile, model_ws=pth, verbose=False,
+                                    check=False, lazy=True)
+    assert ml.load_fail
+    assert 'WEL' not in ml.get_package_list()
+    try:
+        flopy.modflow.Modflow.load(namfile, model_ws=pth, verbose=False,
+                                   check=False, lazy=True, forgive=False)
+        assert False, 'missing package file should raise an error'
+    except Exception as e:
+        assert 'freyberg.wel' in str(e)
+
+
 if __name__ == '__main__':
     for fnwt in nwt_nam:
         load_nwt_model(fnwt)
@@ -168,6 +168,99 @@ def test_sfr_renumbering():
     assert 'segment numbering order' in chk.passed
 
 
+def test_sfr_routing():
+    from flopy.utils.routing import SegmentRouting
+
+    # 1 -> 4 -> 8 <- 6 <- 3 <- 5, 2 -> 0, 7 -> 1, 9 -> 8 -> lake 1
+    routing = SegmentRouting(range(1, 10), [4, 0, 6, 8, 3, 8, 1, -1, 8])
+    assert not routing.has_cycles
+    assert sorted(routing.get_upstream(8)) == [1, 3, 4, 5, 6, 7, 9]
+    assert routing.get_upstream(4).tolist() == [1, 7]
+    assert routing.get_downstream(7).tolist() == [1, 4, 8]
+    assert sorted(routing.get_headwaters()) == [2, 5, 7, 9]
+    outlets = routing.get_outlets()
+    assert outlets[2] == 2 and outlets[5] == -1 and outlets[8] == -1
+    order = routing.get_topological_order().tolist()
+    assert sorted(order) == list(range(1, 10))
+    for s, o in zip(routing.nseg, routing.outseg):
+        if o > 0:
+            assert order.index(s) < order.index(o)
+
+    # circular routing 2 -> 3 -> 4 -> 2, with 1 and 5 upstream of the circle
+    r = np.zeros(6, dtype=[('iseg', int), ('ireach', int)]).view(np.recarray)
+    r['iseg'] = [1, 2, 3, 4, 5, 6]
+    r['ireach'] = 1
+    d = np.zeros(6, dtype=[('nseg', int), ('outseg', int)]).view(np.recarray)
+    d['nseg'] = range(1, 7)
+    d['outseg'] = [2, 3, 4, 2, 1, 0]
+    m = flopy.modflow.Modflow()
+    sfr = flopy.modflow.ModflowSfr2(m, reach_data=r, segment_data={0: d})
+    routing = sfr.get_routing()
+    assert routing.cycles == [[2, 3, 4]]
+    assert sorted(routing.get_upstream(3)) == [1, 2, 4, 5]
+    upsegs = sfr.get_upsegs()[0]
+    assert upsegs[1] == [5]
+    assert upsegs[2] == [1, 2, 3, 4, 5]
+    assert upsegs[4] == [1, 2, 3, 4, 5]
+    txt = sfr.get_outlets(level=1, verbose=False)
+    assert '1 instances of circular routing' in txt
+    assert '2 3 4 2' in txt
+    assert sfr.outlets[0] == {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 6}
+    chk = sfr.check(level=1)
+    assert 'circular routing' in chk.errors
+    try:
+        sfr.renumber_segments()
+        assert False, 'renumbering circular routing should fail'
+    except ValueError:
+        pass
+
+    # a network without segments
+    routing = SegmentRouting([], [])
+    assert len(routing.get_topological_order()) == 0
+    assert routing.get_all_upstream() == {}
+    assert routing.get_outlets() == {}
+
+    # break in routing to a segment that does not exist
+    sfr.segment_data[0]['outseg'][5] = 10
+    chk = sfr.check(level=1)
+    assert 'route to segments that do not exist' in chk.txt
+
+
+def test_sfr_check():
+    m = flopy.modflow.Modflow.load('UZFtest2.nam', model_ws=path,
+                                   load_only=['dis', 'sfr'], verbose=False)
+    sfr = m.get_package('SFR')
+    chk = sfr.check(level=1)
+    assert 'continuity in segment and reach numbering' in chk.passed
+    assert '3 model cells with multiple non-zero SFR conductances' in chk.txt
+
+    # reach numbering gap in segment 1
+    ireach = sfr.reach_data.ireach.copy()
+    sfr.reach_data['ireach'][3] = 7
+    chk = sfr.check(level=1)
+    assert 'continuity in segment and reach numbering' in chk.errors
+    assert 'Segment 1 has Invalid reach numbering' in chk.txt
+    sfr.reach_data['ireach'] = ireach
+
+    # first two reaches in the same cell
+    node = sfr.reach_data.node.copy()
+    sfr.reach_data['node'][1] = sfr.reach_data.node[0]
+    chk = sfr.check(level=1)
+    assert 'overlapping conductance' in chk.warnings
+    assert '4 model cells with multiple non-zero SFR conductances' in chk.txt
+    sfr.reach_data['node'] = node
+
+    # interpolated widths start at width1 for icalc 0 and 1;
+    # an arbitrary width of 5 is used for icalc 3
+    width = sfr._interpolate_to_reaches('width1', 'width2')
+    assert len(width) == len(sfr.reach_data)
+    segment_data = sfr.segment_data[0]
+    first = width[sfr.reach_data.ireach == 1]
+    icalc = segment_data.icalc
+    assert np.allclose(first[icalc < 2], segment_data.width1[icalc < 2])
+    assert np.allclose(width[sfr.reach_data.iseg == 5], 5.)
+
+
 def test_example():
     m = flopy.modflow.Modflow.load('test1ss.nam', version='mf2005',
                                    exe_name='mf2005.exe',
@@ -387,6 +387,90 @@ def test_mfnwt_keat_uzf():
     return
 
 
+def test_load_obs_mas():
+    import numpy as np
+    pth = os.path.join(pthtest, 'mf2kmt3d', 'zeroth')
+    obs = flopy.mt3d.Mt3dms.load_obs(os.path.join(pth, 'MT3D001.OBS'))
+    mas = flopy.mt3d.Mt3dms.load_mas(os.path.join(pth, 'MT3D001.MAS'))
+    assert obs.dtype.names[:2] == ('step', 'time')
+    assert np.all(np.diff(obs.time) >= 0)
+    assert len(mas.dtype.names) == 9
+    assert np.all(np.diff(mas.time) >= 0)
+
+    # records on more than one line, duplicate observation points and
+    # numbers with three digit exponents
+    if not os.path.isdir(newpth):
+        os.makedirs(newpth)
+    fname = os.path.join(newpth, 'test.obs')
+    with open(fname, 'w') as f:
+        f.write('  STEP   TOTAL TIME             LOCATION OF ' +
+                'OBSERVATION POINTS (K,I,J)\n')
+        f.write(20 * ' ' + '   1   1   1   1   2   3\n')
+        f.write(20 * ' ' + '   1   1   1\n')
+        f.write('     1    1.0000     0.1000      0.2000\n')
+        f.write('  0.3000\n')
+        f.write('     2    2.0000     0.1000-100  0.2000\n')
+        f.write('  0.3000\n')
+    obs = flopy.mt3d.Mt3dms.load_obs(fname)
+    assert obs.dtype.names == ('step', 'time', '(1, 1, 1)', '(1, 2, 3)',
+                               '(1, 1, 1)3')
+    assert np.array_equal(obs.step, [1, 2])
+    assert np.allclose(obs['(1, 1, 1)3'], 0.3)
+    assert np.allclose(obs['(1, 1, 1)'], [0.1, 0.1e-100], rtol=0, atol=0)
+
+    # three digit and D exponents in the last value of the file
+    for value, expected in [('4.234-100', 4.234e-100),
+                            ('4.234D-10', 4.234e-10)]:
+        with open(fname, 'w') as f:
+            f.write('  STEP   TOTAL TIME             LOCATION OF ' +
+                    'OBSERVATION POINTS (K,I,J)\n')
+            f.write(20 * ' ' + '   1   1   1\n')
+            f.write('     1    1.0000     0.1000\n')
+            f.write('     2    2.0000  {}\n'.format(value))
+        obs = flopy.mt3d.Mt3dms.load_obs(fname)
+        assert obs['(1, 1, 1)'][-1] == expected
+    with open(fname, 'a') as f:
+        f.write('     3    3.0000     4.234x\n')
+    try:
+        flopy.mt3d.Mt3dms.load_obs(fname)
+        assert False, 'invalid values should not be read'
+    except ValueError:
+        pass
+
+
+def test_ucnfileset():
+    import numpy as np
+    pth = os.path.join(pth2000, 'MultiDiffusion')
+    mt = flopy.mt3d.mt.Mt3dms.load('P7MT.NAM', model_ws=pth, verbose=False)
+    ucnset = flopy.utils.UcnFileSet.from_model(mt)
+    assert ucnset.ncomp == 3
+    assert ucnset.shape[1:] == (10, 8, 15, 21)
+    for icomp in range(ucnset.ncomp):
+        fname = os.path.join(pth, 'MT3D{:03d}.UCN'.format(icomp + 1))
+        ucn = flopy.utils.UcnFile(fname)
+        assert ucnset.get_times() == ucn.get_times()
+        assert np.array_equal(ucnset[icomp], ucn.get_alldata(nodata=np.nan))
+        totim = ucn.get_times()[4]
+        assert np.array_equal(ucnset.get_data(totim=totim, mflay=2)[icomp],
+                              ucn.get_data(totim=totim, mflay=2))
+        assert np.array_equal(ucnset[icomp, 4, 1:3, 5, [2, 7]],
+                              ucn.get_data(totim=totim)[1:3, 5, [2, 7]])
+        ucn.close()
+    assert ucnset[:, -1].shape == (3, 8, 15, 21)
+    assert ucnset[:, :, 0, 7, 10].shape == (3, 10)
+    ucnset.close()
+
+    # files with different records are indexed separately; records at
+    # times that are not in a file are nan
+    fnames = [os.path.join(pth, 'MT3D001.UCN'),
+              os.path.join(pth2005, 'P07', 'MT3D001.UCN')]
+    ucnset = flopy.utils.UcnFileSet(fnames)
+    ucn = flopy.utils.UcnFile(fnames[1])
+    assert np.all(np.isnan(ucnset[1, :-1]))
+    assert np.array_equal(ucnset[1, -1], ucn.get_data(totim=100.))
+    ucn.close()
+    ucnset.close()
+
 if __name__ == '__main__':
     #test_mf2000_mnw()
     #test_mf2005_p07()
@@ -30,6 +30,69 @@ def test_formattedfile_read():
     return
 
 
+def test_formattedfile_fixed_width():
+    import os
+    import flopy
+
+    # values that fill the field width are not separated by spaces
+    nlay, nrow, ncol = 2, 3, 12
+    a = np.arange(nlay * nrow * ncol).reshape(nlay, nrow, ncol) * 11.111 + \
+        1000.
+    a[0, 0, 0] = -99.999
+    fname = os.path.join('temp', 't017_fixed_width.fhd')
+    with open(fname, 'w') as f:
+        for kper in [1, 2]:
+            for k in range(nlay):
+                f.write(' {:5d} {:5d} {:14.6E} {:14.6E}             HEAD '
+                        '{:5d} {:5d} {:5d} (5F8.3)\n'.format(1, kper, 1.,
+                                                             float(kper),
+                                                             ncol, nrow,
+                                                             k + 1))
+                for i in range(nrow):
+                    for j in range(0, ncol, 5):
+                        f.write(''.join('{:8.3f}'.format(v)
+                                        for v in kper * a[k, i, j:j + 5]))
+                        f.write('\n')
+    h = flopy.utils.FormattedHeadFile(fname)
+    assert h.get_times() == [1., 2.]
+    for kper in [1, 2]:
+        assert np.allclose(h.get_data(totim=float(kper)), kper * a)
+    ts = h.get_ts([(1, 2, 11), (0, 0, 0), (1, 2, 3)])
+    assert np.allclose(ts[:, 1:], [[a[1, 2, 11], a[0, 0, 0], a[1, 2, 3]],
+                                   [2. * a[1, 2, 11], 2. * a[0, 0, 0],
+                                    2. * a[1, 2, 3]]])
+    h.close()
+
+
+def test_formattedfile_invalid_values():
+    import os
+    import flopy
+
+    # a value that can not be read at the end of the record is not
+    # truncated to the digits before it
+    with open(os.path.join('..', 'examples', 'data', 'mf2005_test',
+                           'test1tr.githds')) as f:
+        lines = f.readlines()
+    fname = os.path.join('temp', 't017_invalid.githds')
+    for value, expected in [('  1.23-100', None), ('   1.0D+03', 1000.)]:
+        lines[15] = lines[15].rstrip()[:-10] + value + '\n'
+        with open(fname, 'w') as f:
+            f.writelines(lines)
+        h = flopy.utils.FormattedHeadFile(fname)
+        if expected is None:
+            for get in [lambda: h.get_data(idx=0),
+                        lambda: h.get_ts((0, 14, 9))]:
+                try:
+                    get()
+                    assert False, '{} should not be read'.format(value)
+                except Exception as e:
+                    assert 'Invalid data' in str(e)
+        else:
+            assert h.get_data(idx=0)[0, 14, 9] == expected
+            assert h.get_ts((0, 14, 9))[0, 1] == expected
+        h.close()
+
+
 def test_binaryfile_read():
     import os
     import flopy
@@ -172,6 +235,278 @@ def test_cellbudgetfile_readrecord_waux():
     return
 
 
+def test_cellbudgetfile_full3D_out():
+    import os
+    import flopy
+
+    v = flopy.utils.CellBudgetFile(
+        os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.BUD'))
+    shape = (v.nlay, v.nrow, v.ncol)
+    masked = np.ma.zeros(shape, dtype=np.float32)
+    unmasked = np.zeros(shape, dtype=np.float64)
+    for text in ['WELLS', 'RIVER LEAKAGE']:
+        for kk in v.get_kstpkper():
+            rec = v.get_data(kstpkper=kk, text=text)[0]
+            t = v.get_data(kstpkper=kk, text=text, full3D=True)[0]
+            assert t.count() == len(np.unique(rec['node']))
+            assert np.isclose(t.filled(0.).sum(), rec['q'].sum())
+            # the same array is reused for all times
+            t1 = v.get_data(kstpkper=kk, text=text, full3D=True,
+                            out=masked)[0]
+            assert t1 is masked
+            assert np.array_equal(t1.mask, t.mask)
+            assert np.array_equal(t1.filled(0.), t.filled(0.))
+            t2 = v.get_data(kstpkper=kk, text=text, full3D=True,
+                            out=unmasked)[0]
+            assert t2 is unmasked
+            assert np.allclose(t2, t.filled(0.))
+
+    # out can only be used for one record with the shape of the grid
+    try:
+        v.get_data(text='WELLS', full3D=True, out=masked)
+        assert False, 'out should not be used for more than one record'
+    except ValueError:
+        pass
+    try:
+        v.get_data(idx=0, full3D=True, out=np.ma.zeros((1, 25, 25)))
+        assert False, 'out with the wrong shape should not be used'
+    except ValueError:
+        pass
+
+
+def test_cellbudgetfile_get_ts():
+    import os
+    import flopy
+
+    v = flopy.utils.CellBudgetFile(
+        os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.BUD'))
+    idx = [(0, 0, 0), (4, 24, 24), (2, 10, 12), (0, 0, 0)]
+    for text in ['FLOW RIGHT FACE', 'RECHARGE', 'STORAGE', 'RIVER LEAKAGE']:
+        # river cells are in the compact list records
+        cells = list(idx)
+        if text == 'RIVER LEAKAGE':
+            node = v.get_data(text=text)[0]['node'][:2] - 1
+            cells += list(zip(*np.unravel_index(node, (v.nlay, v.nrow,
+                                                       v.ncol))))
+        ts = v.get_ts(cells, text=text)
+        recs = v.get_data(text=text, full3D=True)
+        times = [t for t in v.get_times() if
+                 len(v.get_data(totim=t, text=text)) > 0]
+        assert ts.shape == (len(recs), len(cells) + 1)
+        assert np.allclose(ts[:, 0], times)
+        for t, a in zip(ts, recs):
+            a = np.ma.filled(a, 0.)
+            if a.ndim == 2:
+                a = np.array([a] + (v.nlay - 1) * [np.zeros_like(a)])
+            assert np.allclose(t[1:], [a[k, i, j] for k, i, j in cells])
+    ts = v.get_ts((2, 10, 12), text='STORAGE', times=v.get_times()[:3])
+    assert ts.shape == (2, 2)
+
+
+def test_record_cache():
+    import os
+    import flopy
+    from flopy.utils.datafile import RecordCache
+
+    c = RecordCache(maxbytes=200)
+    for key in range(3):
+        c.put(key, np.zeros(10))
+    assert len(c) == 2 and 0 not in c and c.nbytes == 160
+    assert c.get(1) is not None and c.get(0) is None
+    # 2 is the least recently used record
+    c.put(3, np.zeros(10))
+    assert 2 not in c and 1 in c
+    c.put(4, np.zeros(100))
+    assert 4 not in c
+    stats = c.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['evictions'] == 2
+
+    pth = os.path.join('..', 'examples', 'data', 'mp6')
+    h = flopy.utils.HeadFile(os.path.join(pth, 'EXAMPLE.HED'))
+    hc = flopy.utils.HeadFile(os.path.join(pth, 'EXAMPLE.HED'),
+                              cache_size=1e6)
+    for totim in 2 * h.get_times():
+        a = hc.get_data(totim=totim)
+        assert np.array_equal(a, h.get_data(totim=totim))
+        # returned arrays do not change the cached records
+        a[:] = 0.
+    assert hc.cache.hits == hc.cache.misses == len(hc.recordarray)
+
+    v = flopy.utils.CellBudgetFile(os.path.join(pth, 'EXAMPLE.BUD'))
+    vc = flopy.utils.CellBudgetFile(os.path.join(pth, 'EXAMPLE.BUD'),
+                                    cache_size=1e6)
+    for text in 2 * ['FLOW RIGHT FACE', 'WELLS']:
+        for kk in v.get_kstpkper():
+            a = vc.get_data(kstpkper=kk, text=text)
+            b = v.get_data(kstpkper=kk, text=text)
+            assert all(np.array_equal(a0, b0) for a0, b0 in zip(a, b))
+            for a0 in a:
+                a0['q' if a0.dtype.names else Ellipsis] = 0.
+    assert vc.cache.hits == vc.cache.misses
+    vc.set_cache(None)
+    assert vc.cache is None
+
+
+def test_thread_safe_read():
+    import os
+    import flopy
+    from multiprocessing.pool import ThreadPool
+
+    pth = os.path.join('..', 'examples', 'data', 'mp6')
+    h = flopy.utils.HeadFile(os.path.join(pth, 'EXAMPLE.HED'),
+                             thread_safe=True)
+    v = flopy.utils.CellBudgetFile(os.path.join(pth, 'EXAMPLE.BUD'),
+                                   thread_safe=True, cache_size=1e5)
+    times = h.get_times()
+    heads = [h.get_data(totim=t) for t in times]
+    kstpkper = v.get_kstpkper()
+    flows = [v.get_data(kstpkper=kk, text='FLOW RIGHT FACE')[0]
+             for kk in kstpkper]
+    ts = v.get_ts((0, 10, 10), text='RIVER LEAKAGE')
+
+    def read(i):
+        for n in range(i, i + 50):
+            it = n % len(times)
+            assert np.array_equal(h.get_data(totim=times[it]), heads[it])
+            ik = n % len(kstpkper)
+            assert np.array_equal(v.get_data(kstpkper=kstpkper[ik],
+                                             text='FLOW RIGHT FACE')[0],
+                                  flows[ik])
+            assert np.array_equal(v.get_ts((0, 10, 10),
+                                           text='RIVER LEAKAGE'), ts)
+        return True
+
+    pool = ThreadPool(4)
+    assert all(pool.map(read, range(8)))
+    pool.close()
+    h.close()
+    v.close()
+
+
+def test_async_read():
+    import os
+    import flopy
+
+    # asyncio and concurrent.futures are not available in python 2.7 and
+    # 3.3
+    try:
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        return
+
+    pth = os.path.join('..', 'examples', 'data', 'mp6')
+    h = flopy.utils.HeadFile(os.path.join(pth, 'EXAMPLE.HED'))
+    v = flopy.utils.CellBudgetFile(os.path.join(pth, 'EXAMPLE.BUD'))
+    times = h.get_times()
+    kstpkper = v.get_kstpkper()
+    executor = ThreadPoolExecutor(4)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        futures = [h.aget_data(totim=t, executor=executor) for t in times]
+        futures += [v.aget_data(kstpkper=kk, text='FLOW RIGHT FACE',
+                                executor=executor) for kk in kstpkper]
+        futures.append(h.aget_ts((0, 10, 10), executor=executor))
+        futures.append(v.aget_ts((0, 10, 10), text='RIVER LEAKAGE',
+                                 executor=executor))
+        results = loop.run_until_complete(asyncio.gather(*futures))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+        executor.shutdown()
+    assert h._handles is not None and v._handles is not None
+    for t, a in zip(times, results):
+        assert np.array_equal(a, h.get_data(totim=t))
+    results = results[len(times):]
+    for kk, a in zip(kstpkper, results):
+        b = v.get_data(kstpkper=kk, text='FLOW RIGHT FACE')
+        assert np.array_equal(a[0], b[0])
+    assert np.array_equal(results[-2], h.get_ts((0, 10, 10)))
+    assert np.array_equal(results[-1], v.get_ts((0, 10, 10),
+                                                text='RIVER LEAKAGE'))
+    h.close()
+    v.close()
+
+
+def test_output_store():
+    import os
+    import shutil
+    import flopy
+    pth = os.path.join('..', 'examples', 'data', 'mp6')
+    h = flopy.utils.HeadFile(os.path.join(pth, 'EXAMPLE.HED'))
+    v = flopy.utils.CellBudgetFile(os.path.join(pth, 'EXAMPLE.BUD'))
+    lst = flopy.utils.MfListBudget(os.path.join(pth, 'EXAMPLE.LST'))
+    spth = os.path.join('temp', 't017_store')
+    if os.path.exists(spth):
+        shutil.rmtree(spth)
+    # small chunks so that arrays have partial chunks on each axis
+    store = flopy.utils.write_output_store(spth, hds=h, cbc=v, lst=lst,
+                                           chunks=(5, 2, 10, 20))
+    assert 'head' in store.get_variable_names()
+
+    hs = store.get_variable('head')
+    assert hs.get_times() == h.get_times()
+    assert hs.get_kstpkper() == h.get_kstpkper()
+    assert np.array_equal(hs.get_alldata(), h.get_alldata())
+    assert np.array_equal(hs.get_alldata(mflay=2), h.get_alldata(mflay=2))
+    for kk in h.get_kstpkper():
+        assert np.array_equal(hs.get_data(kstpkper=kk),
+                              h.get_data(kstpkper=kk))
+    assert np.array_equal(hs.get_data(idx=3, mflay=4),
+                          h.get_data(totim=h.get_times()[3], mflay=4))
+    idx = [(0, 0, 0), (4, 24, 24), (2, 11, 21), (2, 11, 3)]
+    assert np.array_equal(hs.get_ts(idx), h.get_ts(idx))
+    assert np.array_equal(hs.get_ts((1, 5, 5)), h.get_ts((1, 5, 5)))
+
+    for text in v.get_unique_record_names():
+        vs = store.get_variable(text)
+        for kk in vs.get_kstpkper():
+            b = v.get_data(kstpkper=kk, text=text, full3D=True)[0]
+            if isinstance(b, np.ma.MaskedArray):
+                b = b.filled(0.)
+            assert np.array_equal(vs.get_data(kstpkper=kk),
+                                  b.reshape(vs.nlay, 25, 25))
+    ts = store['flow right face'].get_ts([(0, 12, 12), (1, 3, 4)])
+    assert np.array_equal(ts, v.get_ts([(0, 12, 12), (1, 3, 4)],
+                                       text='FLOW RIGHT FACE'))
+
+    inc = store.get_incremental()
+    assert np.array_equal(inc, lst.get_incremental())
+    cum = store.get_cumulative(names='STORAGE_IN')
+    assert np.array_equal(cum['STORAGE_IN'],
+                          lst.get_cumulative()['STORAGE_IN'])
+
+    # the same store can be opened again and does not change
+    store = flopy.utils.OutputStore(spth, cache_size=None)
+    assert np.array_equal(store['head'].get_alldata(), h.get_alldata())
+    try:
+        store.add_listbudget(lst)
+        assert False, 'read only store should not be written'
+    except Exception as e:
+        assert 'read only' in str(e)
+
+    # rewriting a store only replaces the files of the store
+    with open(os.path.join(spth, 'keepme.dat'), 'w') as f:
+        f.write('model file\n')
+    store = flopy.utils.write_output_store(spth, hds=h)
+    assert os.path.isfile(os.path.join(spth, 'keepme.dat'))
+    assert store.get_variable_names() == ['head']
+    assert not os.path.isdir(os.path.join(spth, 'flow_right_face'))
+    assert not os.path.isfile(os.path.join(spth,
+                                           'listbudget_incremental.npy'))
+
+    # a directory with other files is not a store and is not written
+    os.remove(os.path.join(spth, 'store.json'))
+    try:
+        flopy.utils.write_output_store(spth, hds=h)
+        assert False, 'a non-empty directory should not be written'
+    except Exception as e:
+        assert 'not empty' in str(e)
+    assert os.path.isfile(os.path.join(spth, 'keepme.dat'))
+
+
 def test_binaryfile_writeread():
     import os
     import numpy as np
@@ -237,7 +572,14 @@ def test_binaryfile_writeread():
 if __name__ == '__main__':
     test_binaryfile_writeread()
     test_formattedfile_read()
+    test_formattedfile_fixed_width()
     test_binaryfile_read()
     test_cellbudgetfile_read()
     test_cellbudgetfile_readrecord()
     test_cellbudgetfile_readrecord_waux()
+    test_cellbudgetfile_full3D_out()
+    test_cellbudgetfile_get_ts()
+    test_record_cache()
+    test_thread_safe_read()
+    test_async_read()
+    test_output_store()
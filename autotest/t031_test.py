@@ -197,6 +197,42 @@ def test_get_destination_data():
                            sr=m.sr)
 
 
+def test_plot_pathline():
+    import matplotlib
+    matplotlib.use('Agg')
+    m = flopy.modflow.Modflow.load('EXAMPLE.nam', model_ws=path)
+    pthobj = PathlineFile(os.path.join(path, 'EXAMPLE-3.pathline'))
+    well_pthld = pthobj.get_destination_pathline_data(dest_cells=[(4, 12, 12)])
+    pids = np.unique(well_pthld.particleid)
+    pl = [pthobj.get_data(partid=pid) for pid in pids]
+
+    mm = flopy.plot.ModelMap(model=m)
+    # a single rec array is split into a line for each particle
+    lc = mm.plot_pathline(well_pthld, layer='all')
+    assert len(lc.get_segments()) == len(pids)
+    lc2 = mm.plot_pathline(pl, layer='all')
+    for s, s2 in zip(lc.get_segments(), lc2.get_segments()):
+        assert np.allclose(s, s2)
+    # unsorted pathlines
+    lc2 = mm.plot_pathline(well_pthld[::-1], layer='all')
+    assert len(lc2.get_segments()) == len(pids)
+
+    # lines only include points in the layer
+    lc = mm.plot_pathline(well_pthld, layer=4)
+    npts = sum(len(s) for s in lc.get_segments())
+    assert npts == np.sum(well_pthld.k == 4)
+    lc = mm.plot_pathline(well_pthld, layer='all', travel_time='> 1e4')
+    npts = sum(len(s) for s in lc.get_segments())
+    assert npts == np.sum(well_pthld.time > 1e4)
+
+    # decimated lines keep the first and last point of each pathline
+    lc = mm.plot_pathline(pl, layer='all', decimate=5)
+    for s, p in zip(lc.get_segments(), pl):
+        assert len(s) == (len(p) - 1) // 5 + 1 + int((len(p) - 1) % 5 > 0)
+        assert np.allclose(s[-1], mm.plot_pathline(
+            p, layer='all').get_segments()[0][-1])
+
+
 def test_loadtxt():
     from flopy.utils.flopy_io import loadtxt
     pthfile = os.path.join(path, 'EXAMPLE-3.pathline')
@@ -0,0 +1,75 @@
+"""
+Test loading of stress period list data
+"""
+import os
+import shutil
+import numpy as np
+import flopy
+from flopy.utils.flopy_io import read_list_block
+
+out_dir = os.path.join('temp', 't050')
+if os.path.exists(out_dir):
+    shutil.rmtree(out_dir)
+os.mkdir(out_dir)
+
+
+def test_read_list_block():
+    dtype = flopy.modflow.ModflowWel.get_default_dtype()
+
+    # free format, with extra trailing values
+    lines = ['1 2 3 -100.\n', '  2 3 4 -2.5E+02  99\n']
+    ra = read_list_block(lines, dtype)
+    assert ra.shape == (2,)
+    assert np.array_equal(ra.k, [1, 2])
+    assert np.array_equal(ra.i, [2, 3])
+    assert np.array_equal(ra.j, [3, 4])
+    assert np.allclose(ra.flux, [-100., -250.])
+
+    # fixed format, with values that run together
+    lines = ['         1        12        13   -100.00\n',
+             '        100000000002        14-2.500E+02\n']
+    ra = read_list_block(lines, dtype)
+    assert np.array_equal(ra.k, [1, 10])
+    assert np.array_equal(ra.i, [12, 2])
+    assert np.array_equal(ra.j, [13, 14])
+    assert np.allclose(ra.flux, [-100., -250.])
+
+    # free and fixed format lines, where the total number of values is
+    # a multiple of the number of fields
+    lines = ['1 2 3 -100. 7\n',
+             '         2         3         4-2.500E+02\n']
+    ra = read_list_block(lines, dtype)
+    assert np.array_equal(ra.k, [1, 2])
+    assert np.array_equal(ra.i, [2, 3])
+    assert np.array_equal(ra.j, [3, 4])
+    assert np.allclose(ra.flux, [-100., -250.])
+
+    ra = read_list_block([], dtype)
+    assert ra.shape == (0,)
+    return
+
+
+def test_load_reused_stress_period():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=10, ncol=10, nper=4)
+    sp_data = {0: [[0, 1, 1, -1.0], [1, 2, 3, -2.0], [0, 9, 9, -3.0]],
+               1: -1,
+               2: [[1, 5, 5, 4.0]],
+               3: 0}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    wel.write_file()
+
+    wel2 = flopy.modflow.ModflowWel.load(wel.fn_path, ml, check=False)
+    spd = wel2.stress_period_data
+    assert np.array_equal(spd[0], wel.stress_period_data[0])
+    assert np.array_equal(spd[1], wel.stress_period_data[0])
+    assert np.array_equal(spd[2], wel.stress_period_data[2])
+    # data for reused stress periods is shared, not copied
+    assert spd.data[1] is spd.data[0]
+    assert spd.data[3] == 0
+    return
+
+
+if __name__ == '__main__':
+    test_read_list_block()
+    test_load_reused_stress_period()
@@ -0,0 +1,158 @@
+"""
+Test binary model snapshots and writing of model input
+"""
+import os
+import shutil
+import numpy as np
+import flopy
+
+out_dir = os.path.join('temp', 't051')
+if os.path.exists(out_dir):
+    shutil.rmtree(out_dir)
+os.makedirs(out_dir)
+
+
+def read_files(model_ws):
+    files = {}
+    for fname in sorted(os.listdir(model_ws)):
+        with open(os.path.join(model_ws, fname)) as f:
+            files[fname] = f.read()
+    return files
+
+
+def test_modflow_snapshot():
+    model_ws = os.path.join('..', 'examples', 'data', 'freyberg')
+    m = flopy.modflow.Modflow.load('freyberg.nam', model_ws=model_ws,
+                                   verbose=False, check=False)
+    fname = os.path.join(out_dir, 'freyberg.snap')
+    m.save_snapshot(fname)
+
+    m2 = flopy.modflow.Modflow.load_snapshot(
+        fname, model_ws=os.path.join(out_dir, 'snapshot'))
+    assert isinstance(m2, flopy.modflow.Modflow)
+    assert m2.get_package_list() == m.get_package_list()
+    assert m2.lpf.parent is m2
+    assert np.array_equal(m2.lpf.hk.array, m.lpf.hk.array)
+    assert np.array_equal(m2.riv.stress_period_data[0],
+                          m.riv.stress_period_data[0])
+    assert isinstance(m2.riv.stress_period_data[0], np.recarray)
+
+    # the written input is the same
+    m2.write_input()
+    m.change_model_ws(os.path.join(out_dir, 'text'))
+    m.write_input()
+    assert read_files(m2.model_ws) == read_files(m.model_ws)
+
+    # arrays can be changed without changing the snapshot file
+    m2.lpf.hk = 2. * m.lpf.hk.array
+    m3 = flopy.modflow.Modflow.load_snapshot(fname, mmap=False)
+    assert np.array_equal(m3.lpf.hk.array, m.lpf.hk.array)
+
+
+def test_mt3d_snapshot():
+    model_ws = os.path.join('..', 'examples', 'data', 'mt3d_test',
+                            'mf2005mt3d', 'P07')
+    mf = flopy.modflow.Modflow.load('p7mf2005.nam', model_ws=model_ws,
+                                    verbose=False, check=False)
+    mt = flopy.mt3d.Mt3dms.load('p7mt.nam', model_ws=model_ws,
+                                modflowmodel=mf, verbose=False)
+    fname = os.path.join(out_dir, 'p7mt.snap')
+    mt.save_snapshot(fname)
+    mt2 = flopy.mt3d.Mt3dms.load_snapshot(fname)
+    assert isinstance(mt2, flopy.mt3d.Mt3dms)
+    assert mt2.get_package_list() == mt.get_package_list()
+    assert mt2.mf.get_package_list() == mf.get_package_list()
+    assert np.array_equal(mt2.btn.prsity.array, mt.btn.prsity.array)
+
+
+def test_incremental_write_input():
+    model_ws = os.path.join('..', 'examples', 'data', 'freyberg')
+    m = flopy.modflow.Modflow.load('freyberg.nam', model_ws=model_ws,
+                                   verbose=False, check=False)
+    m.change_model_ws(os.path.join(out_dir, 'incremental'))
+    m.write_input(incremental=True)
+    files = read_files(m.model_ws)
+    mtimes = dict((p.fn_path, os.path.getmtime(p.fn_path))
+                  for p in m.packagelist)
+
+    hash0 = m.lpf.content_hash
+    assert m.lpf.hk.content_hash == m.lpf.hk.content_hash
+    m.lpf.hk[0][0, 0] = 999.
+    assert m.lpf.content_hash != hash0
+    m.write_input(incremental=True)
+    for p in m.packagelist:
+        if p is m.lpf:
+            assert read_files(m.model_ws)[os.path.basename(p.fn_path)] != \
+                   files[os.path.basename(p.fn_path)]
+        else:
+            assert os.path.getmtime(p.fn_path) == mtimes[p.fn_path], \
+                '{} was rewritten'.format(p.name[0])
+
+    # removed files are written again
+    os.remove(m.wel.fn_path)
+    m.write_input(incremental=True)
+    assert os.path.isfile(m.wel.fn_path)
+
+    # removed external array files are written again
+    m.external_path = 'ref'
+    os.makedirs(os.path.join(m.model_ws, 'ref'))
+    m.lpf.hk = m.lpf.hk.array
+    m.write_input(incremental=True)
+    fname = os.path.join(m.model_ws, 'ref', 'hk_layer_1.ref')
+    assert os.path.isfile(fname)
+    mtime = os.path.getmtime(m.lpf.fn_path)
+    m.write_input(incremental=True)
+    assert os.path.getmtime(m.lpf.fn_path) == mtime
+    os.remove(fname)
+    m.write_input(incremental=True)
+    assert os.path.isfile(fname)
+
+    # methods are hashed by name, not by their address
+    from flopy.utils.utils_def import get_content_hash
+    m2 = flopy.modflow.Modflow()
+    assert get_content_hash([m.write_input]) == \
+           get_content_hash([m2.write_input])
+
+
+def test_parallel_write_input():
+    model_ws = os.path.join('..', 'examples', 'data', 'freyberg')
+    m = flopy.modflow.Modflow.load('freyberg.nam', model_ws=model_ws,
+                                   verbose=False, check=False)
+    m.change_model_ws(os.path.join(out_dir, 'serial'))
+    m.write_input()
+    files = read_files(m.model_ws)
+    m.change_model_ws(os.path.join(out_dir, 'parallel'))
+    m.write_input(nprocs=3)
+    assert read_files(m.model_ws) == files
+
+    # external arrays are written by the worker processes
+    m.external_path = 'ref'
+    m.change_model_ws(os.path.join(out_dir, 'parallel_external'))
+    m.lpf.hk = m.lpf.hk.array
+    m.write_input(nprocs=3)
+    fname = os.path.join(m.model_ws, 'ref', 'hk_layer_1.ref')
+    assert np.allclose(np.loadtxt(fname), m.lpf.hk.array[0])
+
+    # models can be written concurrently
+    import threading
+    models = []
+    for i in range(2):
+        m = flopy.modflow.Modflow.load('freyberg.nam', model_ws=model_ws,
+                                       verbose=False, check=False)
+        m.change_model_ws(os.path.join(out_dir, 'concurrent{}'.format(i)))
+        models.append(m)
+    threads = [threading.Thread(target=m.write_input, kwargs={'nprocs': 2})
+               for m in models]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for m in models:
+        assert read_files(m.model_ws) == files
+
+
+if __name__ == '__main__':
+    test_modflow_snapshot()
+    test_mt3d_snapshot()
+    test_incremental_write_input()
+    test_parallel_write_input()
@@ -0,0 +1,175 @@
+"""
+Test intersection of features and points with model grids
+"""
+import os
+import shutil
+import numpy as np
+import flopy
+from flopy.utils.gridintersect import GridIntersect, CellIndex
+
+out_dir = os.path.join('temp', 't052')
+if os.path.exists(out_dir):
+    shutil.rmtree(out_dir)
+os.makedirs(out_dir)
+
+
+def get_sr(rotation=0.):
+    return flopy.utils.SpatialReference(delr=np.ones(10) * 10.,
+                                        delc=np.ones(8) * 10.,
+                                        xll=100., yll=200.,
+                                        rotation=rotation)
+
+
+def test_intersect_points():
+    for rotation in [0., 30.]:
+        sr = get_sr(rotation)
+        ix = GridIntersect(sr)
+        rs = np.random.RandomState(0)
+        x, y = sr.transform(rs.uniform(-10., 110., 500),
+                            rs.uniform(-10., 90., 500))
+        points = list(zip(x, y))
+        result = ix.intersect(points, 'point')
+        r, c = sr.get_rc(x, y)
+        inside = np.where(r >= 0)[0]
+        assert np.array_equal(result.pointid, inside)
+        assert np.array_equal(result.nodenumber,
+                              r[inside] * sr.ncol + c[inside])
+        assert np.array_equal(result.SHAPEID, inside)
+
+
+def test_intersect_lines():
+    ix = GridIntersect(get_sr())
+    # horizontal line through row 2, starting outside of the grid
+    line = [(90., 255.), (155., 255.)]
+    result = ix.intersect([line], 'line')
+    assert np.array_equal(result.nodenumber, 2 * 10 + np.arange(6))
+    assert np.allclose(result.length, [10., 10., 10., 10., 10., 5.])
+    assert np.allclose(result.starting_distance,
+                       [10., 20., 30., 40., 50., 60.])
+    assert np.allclose(result.ending_distance,
+                       [20., 30., 40., 50., 60., 65.])
+
+    # the lengths of a line in a rotated grid add up to the line length
+    sr = get_sr(30.)
+    ix = GridIntersect(sr)
+    x, y = sr.transform(np.array([5., 55., 95.]), np.array([5., 75., 3.]))
+    line = list(zip(x, y))
+    result = ix.intersect([[line]], 'line')
+    assert np.isclose(result.length.sum(),
+                      np.hypot(np.diff(x), np.diff(y)).sum())
+    assert np.all(np.diff(result.starting_distance) >= 0.)
+    assert len(np.unique(result.nodenumber)) == len(result)
+
+
+def test_intersect_edges():
+    for rotation in [0., 30.]:
+        sr = get_sr(rotation)
+        ix = GridIntersect(sr)
+        # points on the outer boundary and on shared edges and corners are
+        # in the lowest cell number that contains them
+        x, y = sr.transform(np.array([100., 100., 0., 50., 100., 30.]),
+                            np.array([40., 0., 80., 80., 80., 40.]))
+        assert np.array_equal(ix.index.locate(x, y), [39, 79, 0, 4, 9, 32])
+        r, c = sr.get_rc(x, y)
+        assert np.all(r >= 0)
+
+        # a line on a shared row edge is only in the row above the edge,
+        # and a line on the outer boundary is in the boundary cells
+        for yl, row in [(30., 4), (0., 7)]:
+            x, y = sr.transform(np.array([0., 100.]), np.array([yl, yl]))
+            result = ix.intersect([list(zip(x, y))], 'line')
+            assert np.isclose(result.length.sum(), 100.)
+            assert np.array_equal(result.nodenumber, row * 10 + np.arange(10))
+            assert np.allclose(result.length, 10.)
+
+        # a line through a cell corner is not in the cells that only touch
+        # the corner
+        x, y = sr.transform(np.array([5., 55.]), np.array([5., 75.]))
+        result = ix.intersect([list(zip(x, y))], 'line')
+        assert np.isclose(result.length.sum(), np.hypot(50., 70.))
+
+
+def test_intersect_polygons():
+    ix = GridIntersect(get_sr())
+    # square with a square hole
+    outer = [(115., 215.), (115., 245.), (145., 245.), (145., 215.),
+             (115., 215.)]
+    hole = [(125., 225.), (135., 225.), (135., 235.), (125., 235.),
+            (125., 225.)]
+    result = ix.intersect([[outer, hole]], 'polygon')
+    assert np.isclose(result.totalarea.sum(), 900. - 100.)
+    area = dict(zip(result.nodenumber, result.totalarea))
+    # corner cell, edge cell, and a cell with part of the hole
+    assert np.isclose(area[6 * 10 + 1], 25.)
+    assert np.isclose(area[6 * 10 + 2], 50.)
+    assert np.isclose(area[5 * 10 + 2], 75.)
+
+    # concave polygon in an unstructured grid of triangles
+    verts = np.array([[0., 0.], [10., 0.], [10., 10.], [0., 10.],
+                      [20., 0.], [20., 10.]])
+    iverts = [[0, 1, 2], [0, 2, 3], [1, 4, 5], [1, 5, 2]]
+    ix = GridIntersect(CellIndex.from_iverts(verts, iverts))
+    polygon = [(2., 2.), (18., 2.), (18., 8.), (10., 5.), (2., 8.)]
+    result = ix.intersect([polygon], 'polygon')
+    assert np.isclose(result.totalarea.sum(), 16. * 6. - 16. * 3. / 2.)
+
+
+def test_intersect_shapefile():
+    from flopy.utils.gridgen import features_to_shapefile
+    ix = GridIntersect(get_sr())
+    points = [(101., 201.), (155., 235.), (0., 0.)]
+    fname = os.path.join(out_dir, 'points')
+    features_to_shapefile(points, 'point', fname)
+    result = ix.intersect(fname, 'point')
+    assert np.array_equal(result.nodenumber, [70, 45])
+    assert np.array_equal(result.pointid, [0, 1])
+
+
+def test_sr_unstructured_get_node():
+    # grid of triangles, two in each square of a 20 by 10 grid
+    nx, ny = 20, 10
+    x, y = np.meshgrid(np.arange(nx + 1) * 5., np.arange(ny + 1) * 5.)
+    verts = np.column_stack((x.ravel(), y.ravel()))
+    iverts = []
+    for i in range(ny):
+        for j in range(nx):
+            v0 = i * (nx + 1) + j
+            v1, v2, v3 = v0 + 1, v0 + nx + 2, v0 + nx + 1
+            iverts.append([v0, v1, v2, v0])
+            iverts.append([v0, v2, v3, v0])
+    xc = np.array([verts[iv[:3], 0].mean() for iv in iverts])
+    yc = np.array([verts[iv[:3], 1].mean() for iv in iverts])
+    sr = flopy.utils.reference.SpatialReferenceUnstructured(
+        xc, yc, verts, iverts, np.array([len(iverts)]))
+
+    rs = np.random.RandomState(0)
+    px, py = rs.uniform(-5., 105., 2000), rs.uniform(-5., 55., 2000)
+    node = sr.get_node(px, py)
+    i, j = np.floor(py / 5.).astype(int), np.floor(px / 5.).astype(int)
+    upper = (py - 5. * i) > (px - 5. * j)
+    expected = 2 * (i * nx + j) + upper
+    outside = (px < 0.) | (px > 100.) | (py < 0.) | (py > 50.)
+    expected[outside] = -1
+    assert np.array_equal(node, expected)
+    assert sr.get_node(2., 1.) == 0
+
+    nearest = sr.get_nearest_node(px, py)
+    d = (px[:, np.newaxis] - xc) ** 2 + (py[:, np.newaxis] - yc) ** 2
+    assert np.allclose(d[np.arange(len(px)), nearest], d.min(axis=1))
+    assert sr.get_nearest_node(200., 200.) == len(iverts) - 1
+
+    # the index is cached and rebuilt when the grid changes
+    assert sr.cell_index is sr.cell_index
+    index = sr.cell_index
+    sr.verts = verts + 1000.
+    assert sr.cell_index is not index
+    assert sr.get_node(2., 1.) == -1
+
+
+if __name__ == '__main__':
+    test_intersect_points()
+    test_intersect_lines()
+    test_intersect_edges()
+    test_intersect_polygons()
+    test_intersect_shapefile()
+    test_sr_unstructured_get_node()
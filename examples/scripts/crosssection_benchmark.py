@@ -0,0 +1,61 @@
+"""
+Time building a ModelCrossSection and plotting an array, the grid, and
+discharge vectors along a model row for increasing numbers of layers and
+columns.
+
+    python crosssection_benchmark.py [nlay ...]
+
+"""
+import sys
+import time
+
+import numpy as np
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import flopy
+
+
+def build_model(nlay=10, nrow=10, ncol=100):
+    m = flopy.modflow.Modflow('xsbench')
+    rs = np.random.RandomState(2017)
+    top = 100. + rs.uniform(size=(nrow, ncol))
+    thk = rs.uniform(1., 5., size=(nlay, nrow, ncol))
+    botm = top - np.cumsum(thk, axis=0)
+    flopy.modflow.ModflowDis(m, nlay=nlay, nrow=nrow, ncol=ncol, delr=10.,
+                             delc=10., top=top, botm=botm)
+    flopy.modflow.ModflowBas(m)
+    return m
+
+
+def main(*nlays):
+    nlays = [int(n) for n in nlays] or [10, 25, 50]
+    print('{:>6s} {:>6s} {:>8s} {:>8s} {:>8s} {:>8s}'
+          .format('nlay', 'ncol', 'init', 'array', 'grid', 'quiver'))
+    rs = np.random.RandomState(2017)
+    for nlay in nlays:
+        for ncol in [100, 500, 1000]:
+            m = build_model(nlay, ncol=ncol)
+            shape = (nlay, m.nrow, ncol)
+            a = rs.uniform(size=shape)
+            frf, fff, flf = [rs.normal(size=shape) for _ in range(3)]
+            fig, ax = plt.subplots()
+            times = []
+            t0 = time.time()
+            xs = flopy.plot.ModelCrossSection(model=m, line={'row': 5},
+                                              ax=ax)
+            times.append(time.time() - t0)
+            for f, args in [(xs.plot_array, (a,)), (xs.plot_grid, ()),
+                            (xs.plot_discharge, (frf, fff, flf))]:
+                t0 = time.time()
+                f(*args)
+                times.append(time.time() - t0)
+            plt.close(fig)
+            print('{:6d} {:6d} '.format(nlay, ncol) +
+                  ' '.join('{:8.3f}'.format(t) for t in times))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
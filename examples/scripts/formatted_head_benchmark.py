@@ -0,0 +1,70 @@
+"""
+Time reading a synthetic formatted head file (3 layers of 200 rows and
+200 columns, 10 times) with FormattedHeadFile, and the same heads from a
+binary head file with HeadFile.
+
+    python formatted_head_benchmark.py [nrow_ncol] [ntimes]
+
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import flopy
+
+
+def write_heads(fhd, hds, nlay=3, nrow=200, ncol=200, ntimes=10):
+    rs = np.random.RandomState(2017)
+    header = ' {:5d} {:5d} {:14.6E} {:14.6E}             HEAD ' + \
+             '{:5d} {:5d} {:5d} (10F10.3)\n'
+    hdt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('pertim', 'f4'),
+                    ('totim', 'f4'), ('text', 'a16'), ('ncol', 'i4'),
+                    ('nrow', 'i4'), ('ilay', 'i4')])
+    with open(fhd, 'w') as f, open(hds, 'wb') as fb:
+        for t in range(ntimes):
+            for k in range(nlay):
+                a = rs.uniform(0., 100., size=(nrow, ncol)).round(3)
+                f.write(header.format(1, t + 1, 1., t + 1., ncol, nrow,
+                                      k + 1))
+                for i in range(nrow):
+                    for j0 in range(0, ncol, 10):
+                        f.write(''.join('{:10.3f}'.format(v)
+                                        for v in a[i, j0:j0 + 10]) + '\n')
+                np.array([(1, t + 1, 1., t + 1., '            HEAD', ncol,
+                           nrow, k + 1)], dtype=hdt).tofile(fb)
+                a.astype(np.float32).tofile(fb)
+
+
+def main(n=200, ntimes=10):
+    n, ntimes = int(n), int(ntimes)
+    ws = tempfile.mkdtemp()
+    fhd = os.path.join(ws, 'heads.fhd')
+    hds = os.path.join(ws, 'heads.hds')
+    write_heads(fhd, hds, nrow=n, ncol=n, ntimes=ntimes)
+    print('{} x {} x {} cells, {} times ({:.1f} MB formatted)'
+          .format(3, n, n, ntimes, os.path.getsize(fhd) / 1e6))
+
+    idx = [(k, i, 5) for k in range(3) for i in range(0, n, 10)]
+    for label, cls, fname in [('formatted',
+                               flopy.utils.FormattedHeadFile, fhd),
+                              ('binary', flopy.utils.HeadFile, hds)]:
+        t0 = time.time()
+        h = cls(fname)
+        a = h.get_alldata()
+        print('{:25s} {:8.2f} s'.format(label + ' get_alldata',
+                                        time.time() - t0))
+        t0 = time.time()
+        h.get_ts(idx)
+        print('{:25s} {:8.2f} s'.format(label + ' get_ts',
+                                        time.time() - t0))
+        h.close()
+    os.remove(fhd)
+    os.remove(hds)
+    os.rmdir(ws)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,72 @@
+"""
+Time Mt3dms.load_obs and Mt3dms.load_mas for synthetic MT3D observation
+and mass budget files with 1,000 observation points and 5,000 output
+steps.
+
+    python mt3d_obs_benchmark.py [nobs] [nsteps]
+
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import flopy
+
+
+def write_obs(fname, nobs=1000, nsteps=5000, nperline=16):
+    rs = np.random.RandomState(2017)
+    kij = np.column_stack((np.ones(nobs, dtype=np.int),
+                           rs.randint(1, 500, size=(nobs, 2))))
+    with open(fname, 'w') as f:
+        f.write('  STEP   TOTAL TIME             LOCATION OF OBSERVATION ' +
+                'POINTS (K,I,J)\n')
+        for i0 in range(0, nobs, nperline):
+            f.write(20 * ' ' + ''.join('{:4d}{:4d}{:4d}'.format(*p)
+                                       for p in kij[i0:i0 + nperline]) +
+                    '\n')
+        fmt = '{:11.5G}'
+        for step in range(1, nsteps + 1):
+            values = rs.uniform(size=nobs)
+            lines = [''.join(fmt.format(v) for v in values[i0:i0 + nperline])
+                     for i0 in range(0, nobs, nperline)]
+            lines[0] = '{:6d}{:12.5G}'.format(step, step * 10.) + lines[0]
+            f.write('\n'.join(lines) + '\n')
+
+
+def write_mas(fname, nsteps=5000):
+    rs = np.random.RandomState(2017)
+    with open(fname, 'w') as f:
+        f.write('      TIME       TOTAL IN      TOTAL OUT ...\n')
+        f.write('     (DAY )        (UNDF)        (UNDF) ...\n')
+        for step in range(1, nsteps + 1):
+            f.write(''.join('{:14.5G}'.format(v) for v in
+                            [step * 10.] + rs.uniform(size=8).tolist()) +
+                    '\n')
+
+
+def main(nobs=1000, nsteps=5000):
+    nobs, nsteps = int(nobs), int(nsteps)
+    ws = tempfile.mkdtemp()
+    fobs = os.path.join(ws, 'MT3D001.OBS')
+    fmas = os.path.join(ws, 'MT3D001.MAS')
+    write_obs(fobs, nobs, nsteps)
+    write_mas(fmas, nsteps)
+    print('{} observation points, {} steps ({:.1f} MB)'
+          .format(nobs, nsteps, os.path.getsize(fobs) / 1e6))
+
+    t0 = time.time()
+    obs = flopy.mt3d.Mt3dms.load_obs(fobs)
+    print('{:25s} {:8.2f} s'.format('load_obs', time.time() - t0))
+    t0 = time.time()
+    mas = flopy.mt3d.Mt3dms.load_mas(fmas)
+    print('{:25s} {:8.2f} s'.format('load_mas', time.time() - t0))
+    os.remove(fobs)
+    os.remove(fmas)
+    os.rmdir(ws)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
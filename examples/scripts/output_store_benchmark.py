@@ -0,0 +1,67 @@
+"""
+Time map and time series queries of a synthetic binary head file (3 layers
+of 200 rows and 200 columns, 200 times) with HeadFile, and of the same
+heads after conversion to an OutputStore.
+
+    python output_store_benchmark.py [nrow_ncol] [ntimes]
+
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import flopy
+
+
+def write_heads(hds, nlay=3, nrow=200, ncol=200, ntimes=200):
+    y, x = np.mgrid[0:nrow, 0:ncol] / float(max(nrow, ncol))
+    hdt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('pertim', 'f4'),
+                    ('totim', 'f4'), ('text', 'a16'), ('ncol', 'i4'),
+                    ('nrow', 'i4'), ('ilay', 'i4')])
+    with open(hds, 'wb') as fb:
+        for t in range(ntimes):
+            for k in range(nlay):
+                np.array([(1, t + 1, 1., t + 1., '            HEAD', ncol,
+                           nrow, k + 1)], dtype=hdt).tofile(fb)
+                a = (100. - 20. * x - 5. * k + 2. * np.sin(6. * y + t / 10.))
+                a = a.round(2)
+                a.astype(np.float32).tofile(fb)
+
+
+def main(n=200, ntimes=200):
+    n, ntimes = int(n), int(ntimes)
+    ws = tempfile.mkdtemp()
+    hds = os.path.join(ws, 'heads.hds')
+    write_heads(hds, nrow=n, ncol=n, ntimes=ntimes)
+    print('{} x {} x {} cells, {} times ({:.1f} MB)'
+          .format(3, n, n, ntimes, os.path.getsize(hds) / 1e6))
+
+    t0 = time.time()
+    flopy.utils.write_output_store(os.path.join(ws, 'store'), hds=hds)
+    print('{:25s} {:8.2f} s'.format('write_output_store', time.time() - t0))
+    size = sum(os.path.getsize(os.path.join(ws, 'store', 'head', f))
+               for f in os.listdir(os.path.join(ws, 'store', 'head')))
+    print('store size {:.1f} MB'.format(size / 1e6))
+
+    idx = [(k, i, 5) for k in range(3) for i in range(0, n, 10)]
+    h = flopy.utils.HeadFile(hds)
+    store = flopy.utils.OutputStore(os.path.join(ws, 'store'))
+    for label, obj in [('binary', h), ('store', store.get_variable('head'))]:
+        t0 = time.time()
+        obj.get_ts(idx)
+        print('{:25s} {:8.2f} s'.format(label + ' get_ts', time.time() - t0))
+        t0 = time.time()
+        for totim in obj.get_times()[::10]:
+            obj.get_data(totim=totim, mflay=0)
+        print('{:25s} {:8.2f} s'.format(label + ' get_data',
+                                        time.time() - t0))
+    h.close()
+    shutil.rmtree(ws)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,66 @@
+"""
+Time ModelMap.plot_pathline for a synthetic set of MODPATH pathlines with
+100,000 particles of 10 points each, passed as a list of rec arrays (one
+for each particle, as returned by PathlineFile.get_alldata()) and as a
+single rec array sorted by particle.
+
+    python pathline_benchmark.py [nparticles] [points_per_particle]
+
+"""
+import sys
+import time
+
+import numpy as np
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import flopy
+
+
+def build_pathlines(nparticles=100000, npoints=10, nlay=3, nrow=100,
+                    ncol=100, delr=100.):
+    rs = np.random.RandomState(2017)
+    dtype = np.dtype([('x', np.float32), ('y', np.float32),
+                      ('z', np.float32), ('time', np.float32),
+                      ('k', np.int), ('particleid', np.int)])
+    n = nparticles * npoints
+    pl = np.empty(n, dtype=dtype).view(np.recarray)
+    x0 = rs.uniform(0., ncol * delr, nparticles)
+    y0 = rs.uniform(0., nrow * delr, nparticles)
+    step = rs.normal(scale=delr, size=(2, n))
+    pl['x'] = np.repeat(x0, npoints) + step[0]
+    pl['y'] = np.repeat(y0, npoints) + step[1]
+    pl['z'] = 0.
+    pl['time'] = np.tile(np.arange(npoints) * 100., nparticles)
+    pl['k'] = rs.randint(0, nlay, size=n)
+    pl['particleid'] = np.repeat(np.arange(nparticles), npoints)
+    return pl
+
+
+def main(nparticles=100000, npoints=10):
+    nparticles, npoints = int(nparticles), int(npoints)
+    m = flopy.modflow.Modflow('plbench')
+    flopy.modflow.ModflowDis(m, nlay=3, nrow=100, ncol=100, delr=100.,
+                             delc=100.)
+    pl = build_pathlines(nparticles, npoints)
+    plist = np.split(pl, np.arange(npoints, len(pl), npoints))
+    print('{} particles, {} points'.format(nparticles, len(pl)))
+
+    for label, data, kwargs in [('list, all layers', plist, {}),
+                                ('array, all layers', pl, {}),
+                                ('array, layer 0', pl, {'layer': 0}),
+                                ('array, decimate=3', pl, {'decimate': 3})]:
+        kwargs = dict(kwargs)
+        kwargs.setdefault('layer', 'all')
+        fig, ax = plt.subplots()
+        mm = flopy.plot.ModelMap(model=m, ax=ax)
+        t0 = time.time()
+        mm.plot_pathline(data, **kwargs)
+        print('{:25s} {:8.2f} s'.format(label, time.time() - t0))
+        plt.close(fig)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,74 @@
+"""
+Time ModflowSfr2.check() and the individual SFR2 checks for a synthetic
+stream network with 100,000 reaches (10,000 segments of 10 reaches).
+
+    python sfr_check_benchmark.py [nss] [reaches_per_segment]
+
+"""
+import sys
+import time
+
+import numpy as np
+
+import flopy
+
+
+def build_model(nss=10000, nreaches=10, nrow=500, ncol=500):
+    m = flopy.modflow.Modflow('sfrbench')
+    rs = np.random.RandomState(2017)
+    top = 100. + rs.uniform(size=(nrow, ncol))
+    flopy.modflow.ModflowDis(m, nlay=1, nrow=nrow, ncol=ncol, delr=100.,
+                             delc=100., top=top, botm=0.)
+
+    # each segment routes to one of the next 50 segments; the last is the outlet
+    nseg = np.arange(1, nss + 1)
+    outseg = np.minimum(nseg + rs.randint(1, 50, size=nss), nss)
+    outseg[-1] = 0
+
+    nstrm = nss * nreaches
+    reach_data = flopy.modflow.ModflowSfr2.get_empty_reach_data(nstrm)
+    reach_data['iseg'] = np.repeat(nseg, nreaches)
+    reach_data['ireach'] = np.tile(np.arange(1, nreaches + 1), nss)
+    reach_data['k'] = 0
+    reach_data['i'] = rs.randint(0, nrow, size=nstrm)
+    reach_data['j'] = rs.randint(0, ncol, size=nstrm)
+    reach_data['rchlen'] = rs.uniform(50., 150., size=nstrm)
+    reach_data['strtop'] = np.linspace(99., 1., nstrm)
+    reach_data['strthick'] = 1.
+    reach_data['strhc1'] = 1.
+    reach_data['slope'] = 0.001
+
+    segment_data = flopy.modflow.ModflowSfr2.get_empty_segment_data(nss)
+    segment_data['nseg'] = nseg
+    segment_data['outseg'] = outseg
+    segment_data['icalc'] = 1
+    segment_data['width1'] = 5.
+    segment_data['width2'] = 10.
+    segment_data['roughch'] = 0.037
+
+    sfr = flopy.modflow.ModflowSfr2(m, nstrm=-nstrm, nss=nss, isfropt=1,
+                                    reachinput=True, reach_data=reach_data,
+                                    segment_data={0: segment_data})
+    return m, sfr
+
+
+def main(nss=10000, nreaches=10):
+    t0 = time.time()
+    m, sfr = build_model(int(nss), int(nreaches))
+    print('{} reaches, {} segments; model built in {:.2f} s'
+          .format(len(sfr.reach_data), sfr.nss, time.time() - t0))
+
+    chk = flopy.modflow.mfsfr2.check(sfr, verbose=False, level=1)
+    for name in ['numbering', 'routing', 'overlapping_conductance',
+                 'elevations', 'slope']:
+        t0 = time.time()
+        getattr(chk, name)()
+        print('{:25s} {:8.2f} s'.format(name, time.time() - t0))
+
+    t0 = time.time()
+    sfr.check(verbose=False)
+    print('{:25s} {:8.2f} s'.format('check', time.time() - t0))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
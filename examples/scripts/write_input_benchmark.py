@@ -0,0 +1,78 @@
+"""
+Time BaseModel.write_input for a large model using a different number of
+processes to write the package files: 1, 2 and 4, and then doubling up to
+the number of CPUs. The speedup is relative to writing with one process.
+
+The model has 10 layers of 500 rows and 500 columns (2.5 million cells).
+Run with an external_path argument to also write the model arrays to
+external files.
+
+    python write_input_benchmark.py [external_path]
+
+"""
+import os
+import sys
+import time
+import shutil
+import multiprocessing
+
+import numpy as np
+
+import flopy
+
+
+def build_model(model_ws, nlay=10, nrow=500, ncol=500, nper=3,
+                external_path=None):
+    ml = flopy.modflow.Modflow('bench', model_ws=model_ws,
+                               external_path=external_path)
+    botm = np.linspace(-10., -10. * nlay, nlay)
+    rs = np.random.RandomState(2017)
+    top = 10. + rs.uniform(size=(nrow, ncol))
+    flopy.modflow.ModflowDis(ml, nlay=nlay, nrow=nrow, ncol=ncol, nper=nper,
+                             delr=100., delc=100., top=top, botm=botm)
+    ibound = np.ones((nlay, nrow, ncol), dtype=np.int)
+    ibound[:, :, 0] = -1
+    strt = np.repeat(top[np.newaxis], nlay, axis=0)
+    flopy.modflow.ModflowBas(ml, ibound=ibound, strt=strt)
+    hk = 10. ** rs.normal(size=(nlay, nrow, ncol))
+    vka = 0.1 * hk
+    flopy.modflow.ModflowLpf(ml, hk=hk, vka=vka, laytyp=1)
+    rech = dict((kper, 1e-4 * rs.uniform(size=(nrow, ncol)))
+                for kper in range(nper))
+    flopy.modflow.ModflowRch(ml, rech=rech)
+    nwells = 10000
+    k = rs.randint(0, nlay, size=nwells)
+    i = rs.randint(0, nrow, size=nwells)
+    j = rs.randint(1, ncol, size=nwells)
+    wel = dict((kper, np.column_stack((k, i, j,
+                                       -rs.uniform(size=nwells))).tolist())
+               for kper in range(nper))
+    flopy.modflow.ModflowWel(ml, stress_period_data=wel)
+    flopy.modflow.ModflowOc(ml)
+    flopy.modflow.ModflowPcg(ml)
+    return ml
+
+
+def main(external_path=None):
+    model_ws = os.path.join('temp', 'write_input_benchmark')
+    if os.path.exists(model_ws):
+        shutil.rmtree(model_ws)
+    os.makedirs(model_ws)
+    ml = build_model(model_ws, external_path=external_path)
+    ncpu = multiprocessing.cpu_count()
+    nprocs = [1, 2, 4]
+    while nprocs[-1] < ncpu:
+        nprocs.append(min(2 * nprocs[-1], ncpu))
+    print('{} cells, {} cpus'.format(ml.nlay * ml.nrow * ml.ncol, ncpu))
+    t1 = None
+    for n in nprocs:
+        t0 = time.time()
+        ml.write_input(nprocs=n)
+        t = time.time() - t0
+        if t1 is None:
+            t1 = t
+        print('nprocs={:3d}: {:8.2f} s, speedup {:5.2f}'.format(n, t, t1 / t))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
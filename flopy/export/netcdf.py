@@ -17,6 +17,84 @@ PRECISION_STRS = ["f4", "f8", "i4"]
 STANDARD_VARS = ["longitude", "latitude", "layer", "elevation", "delr", "delc",
                  "time"]
 
+# maximum size in bytes of the blocks of a variable that are processed at
+# a time by the arithmetic operators, copy(), append() and difference()
+BLOCK_BYTES = 50e6
+
+
+def _iter_blocks(shape, itemsize, maxbytes=None):
+    """
+    Slices of the first dimension (time for transient variables, layer for
+    the others) of a variable, for blocks of at most maxbytes.  A block
+    has at least one index of the first dimension.
+
+    """
+    if maxbytes is None:
+        maxbytes = BLOCK_BYTES
+    if len(shape) == 0:
+        yield Ellipsis
+        return
+    nbytes = max(1, itemsize * int(np.prod(shape[1:])))
+    n = max(1, int(maxbytes // nbytes))
+    for i0 in range(0, shape[0], n):
+        yield slice(i0, min(i0 + n, shape[0]))
+
+
+def _min_max(data, vmin=None, vmax=None):
+    """
+    Update the minimum and maximum of a variable with a block of its
+    values.  Masked and nan values are ignored.
+
+    """
+    data = np.ma.compressed(np.ma.masked_invalid(data))
+    if data.size == 0:
+        return vmin, vmax
+    dmin, dmax = data.min(), data.max()
+    if vmin is None or dmin < vmin:
+        vmin = dmin
+    if vmax is None or dmax > vmax:
+        vmax = dmax
+    return vmin, vmax
+
+
+def _difference_block(s_data, o_data, minuend="self", mask_zero_diff=True):
+    """
+    Difference of a block of two variables for NetCdf.difference().  The
+    masks of both blocks are carried through to the difference.  Returns
+    the difference and the difference before the masks were applied.
+
+    """
+    # keep the masks to apply later
+    s_mask, o_mask = None, None
+    if isinstance(s_data, np.ma.MaskedArray):
+        s_mask = np.ma.getmaskarray(s_data).copy()
+        s_data = np.array(s_data)
+        s_data[s_mask] = 0.0
+    if isinstance(o_data, np.ma.MaskedArray):
+        o_mask = np.ma.getmaskarray(o_data).copy()
+        o_data = np.array(o_data)
+        o_data[o_mask] = 0.0
+
+    if minuend.lower() == "self":
+        d_data = s_data - o_data
+    elif minuend.lower() == "other":
+        d_data = o_data - s_data
+    else:
+        raise Exception("unrecognized minuend {0}".format(minuend))
+    raw = d_data.copy()
+
+    # reapply masks
+    if s_mask is not None:
+        s_mask[d_data != 0.0] = False
+        d_data[s_mask] = FILLVALUE
+    if o_mask is not None:
+        o_mask[d_data != 0.0] = False
+        d_data[o_mask] = FILLVALUE
+    d_data[np.isnan(d_data)] = FILLVALUE
+    if mask_zero_diff:
+        d_data[d_data == 0.0] = FILLVALUE
+    return d_data, raw
+
 
 class Logger(object):
     """
@@ -172,71 +250,77 @@ class NetCdf(object):
         self.log("initializing file")
 
     def __add__(self, other):
-        new_net = NetCdf.zeros_like(self)
-        if np.isscalar(other) or isinstance(other, np.ndarray):
-            for vname in self.var_attr_dict.keys():
-                new_net.nc.variables[vname][:] = self.nc.variables[vname][:] + \
-                                                 other
-        elif isinstance(other, NetCdf):
-            for vname in self.var_attr_dict.keys():
-                new_net.nc.variables[vname][:] = self.nc.variables[vname][:] + \
-                                                 other.nc.variables[vname][:]
-        else:
-            raise Exception("NetCdf.__add__(): unrecognized other:{0}". \
-                            format(str(type(other))))
-        return new_net
+        return self._arithmetic(other, np.add, "__add__")
 
     def __sub__(self, other):
-        new_net = NetCdf.zeros_like(self)
-        if np.isscalar(other) or isinstance(other, np.ndarray):
-            for vname in self.var_attr_dict.keys():
-                new_net.nc.variables[vname][:] = self.nc.variables[vname][:] - \
-                                                 other
-        elif isinstance(other, NetCdf):
-            for vname in self.var_attr_dict.keys():
-                new_net.nc.variables[vname][:] = self.nc.variables[vname][:] - \
-                                                 other.nc.variables[vname][:]
-        else:
-            raise Exception("NetCdf.__sub__(): unrecognized other:{0}". \
-                            format(str(type(other))))
-        return new_net
+        return self._arithmetic(other, np.subtract, "__sub__")
 
     def __mul__(self, other):
-        new_net = NetCdf.zeros_like(self)
-        if np.isscalar(other) or isinstance(other, np.ndarray):
-            for vname in self.var_attr_dict.keys():
-                new_net.nc.variables[vname][:] = self.nc.variables[vname][:] * \
-                                                 other
-        elif isinstance(other, NetCdf):
-            for vname in self.var_attr_dict.keys():
-                new_net.nc.variables[vname][:] = self.nc.variables[vname][:] * \
-                                                 other.nc.variables[vname][:]
-        else:
-            raise Exception("NetCdf.__mul__(): unrecognized other:{0}". \
-                            format(str(type(other))))
-        return new_net
+        return self._arithmetic(other, np.multiply, "__mul__")
 
     def __div__(self, other):
         return self.__truediv__(other)
 
     def __truediv__(self, other):
-        new_net = NetCdf.zeros_like(self)
         with np.errstate(invalid="ignore"):
-            if np.isscalar(other) or isinstance(other, np.ndarray):
-                for vname in self.var_attr_dict.keys():
-                    new_net.nc.variables[vname][:] = self.nc.variables[vname][
-                                                     :] / \
-                                                     other
-            elif isinstance(other, NetCdf):
-                for vname in self.var_attr_dict.keys():
-                    new_net.nc.variables[vname][:] = self.nc.variables[vname][
-                                                     :] / \
-                                                     other.nc.variables[vname][
-                                                     :]
-            else:
-                raise Exception("NetCdf.__sub__(): unrecognized other:{0}". \
-                                format(str(type(other))))
-            return new_net
+            return self._arithmetic(other, np.true_divide, "__truediv__")
+
+    def _arithmetic(self, other, op, opname):
+        """
+        Make a new NetCdf instance with op applied to each variable of self
+        and other, one block of the variable at a time (see BLOCK_BYTES).
+
+        """
+        if isinstance(other, NetCdf):
+            def func(vname, sl, data):
+                return op(data, other.nc.variables[vname][sl])
+        elif np.isscalar(other) or isinstance(other, np.ndarray):
+            def func(vname, sl, data):
+                # arrays with the shape of the variable are sliced with
+                # the block, other arrays are broadcast
+                shape = self.nc.variables[vname].shape
+                if isinstance(other, np.ndarray) and sl is not Ellipsis \
+                        and other.shape == shape:
+                    return op(data, other[sl])
+                return op(data, other)
+        else:
+            raise Exception("NetCdf.{0}(): unrecognized other:{1}".
+                            format(opname, str(type(other))))
+        return self._map_variables(func)
+
+    def _map_variables(self, func, output_filename=None, verbose=None,
+                       logger=None):
+        """
+        Make a new NetCdf instance with the variables of self, which are
+        written one block of the first dimension at a time as
+        func(vname, sl, data), where data is the block sl of the variable
+        vname of self.  Variables that are written when the file is
+        initialized (for example the coordinates) are not changed.
+
+        """
+        new_net = NetCdf.empty_like(self, output_filename=output_filename,
+                                    verbose=verbose, logger=logger)
+        # add the vars to the instance
+        for vname in self.var_attr_dict.keys():
+            if new_net.nc.variables.get(vname) is not None:
+                new_net.logger.warn("variable {0} already defined, skipping". \
+                                    format(vname))
+                continue
+            new_net.log("adding variable {0}".format(vname))
+            var = self.nc.variables[vname]
+            new_var = new_net.create_variable(vname,
+                                              self.var_attr_dict[vname],
+                                              var.dtype,
+                                              dimensions=var.dimensions)
+            for sl in _iter_blocks(var.shape, var.dtype.itemsize):
+                new_var[sl] = func(vname, sl, var[sl])
+            new_net.log("adding variable {0}".format(vname))
+        global_attrs = {}
+        for attr in self.nc.ncattrs():
+            if attr not in new_net.nc.ncattrs():
+                global_attrs[attr] = self.nc[attr]
+        new_net.add_global_attributes(global_attrs)
+        return new_net
 
     def append(self, other, suffix="_1"):
         assert isinstance(other, NetCdf) or isinstance(other, dict)
@@ -256,12 +340,21 @@ class NetCdf(object):
                 assert new_vname not in self.nc.variables.keys(), \
                     "var already exists:{0} in {1}". \
                         format(new_vname, ",".join(self.nc.variables.keys()))
-                attrs["max"] = var[:].max()
-                attrs["min"] = var[:].min()
                 new_var = self.create_variable(new_vname, attrs,
                                                var.dtype,
                                                dimensions=var.dimensions)
-                new_var[:] = var[:]
+                # copy the variable one block at a time, and set max and
+                # min when all of the values have been copied
+                vmin, vmax = None, None
+                for sl in _iter_blocks(var.shape, var.dtype.itemsize):
+                    data = var[sl]
+                    vmin, vmax = _min_max(data, vmin, vmax)
+                    new_var[sl] = data
+                if vmin is not None:
+                    attrs["max"] = vmax
+                    attrs["min"] = vmin
+                    new_var.setncattr("max", vmax)
+                    new_var.setncattr("min", vmin)
         else:
             for vname, array in other.items():
                 vname_norm = self.normalize_name(vname)
@@ -294,44 +387,21 @@ class NetCdf(object):
         return
 
     def copy(self, output_filename):
-        new_net = NetCdf.zeros_like(self, output_filename=output_filename)
-        for vname in self.var_attr_dict.keys():
-            new_net.nc.variables[vname][:] = self.nc.variables[vname][:]
-        return new_net
+        return self._map_variables(lambda vname, sl, data: data,
+                                   output_filename=output_filename)
 
     @classmethod
     def zeros_like(cls, other, output_filename=None,
                    verbose=None, logger=None):
-        new_net = NetCdf.empty_like(other, output_filename=output_filename,
+
+        def zeros(vname, sl, data):
+            new_data = np.zeros(data.shape, dtype=data.dtype)
+            if isinstance(data, np.ma.MaskedArray):
+                new_data[np.ma.getmaskarray(data)] = FILLVALUE
+            return new_data
+
+        return other._map_variables(zeros, output_filename=output_filename,
                                     verbose=verbose, logger=logger)
-        # add the vars to the instance
-        for vname in other.var_attr_dict.keys():
-            if new_net.nc.variables.get(vname) is not None:
-                new_net.logger.warn("variable {0} already defined, skipping". \
-                                    format(vname))
-                continue
-            new_net.log("adding variable {0}".format(vname))
-            var = other.nc.variables[vname]
-            data = var[:]
-            try:
-                mask = data.mask
-                data = np.array(data)
-            except:
-                mask = None
-            new_data = np.zeros_like(data)
-            new_data[mask] = FILLVALUE
-            new_var = new_net.create_variable(vname,
-                                              other.var_attr_dict[vname],
-                                              var.dtype,
-                                              dimensions=var.dimensions)
-            new_var[:] = new_data
-            new_net.log("adding variable {0}".format(vname))
-        global_attrs = {}
-        for attr in other.nc.ncattrs():
-            if attr not in new_net.nc.ncattrs():
-                global_attrs[attr] = other.nc[attr]
-        new_net.add_global_attributes(global_attrs)
-        return new_net
 
     @classmethod
     def empty_like(cls, other, output_filename=None,
@@ -353,15 +423,16 @@ class NetCdf(object):
         return new_net
 
     def difference(self, other, minuend="self", mask_zero_diff=True,
-                   onlydiff=True):
+                   onlydiff=True, output_filename=None, maxbytes=None):
         """
         make a new NetCDF instance that is the difference with another
-        netcdf file
+        netcdf file, or make a NetCDF instance for the difference with each
+        of several netcdf files in one pass over the variables of self
 
         Parameters
         ----------
         other : either an str filename of a netcdf file or
-            a netCDF4 instance
+            a netCDF4 instance, or a list of them
 
         minuend : (optional) the order of the difference operation.
             Default is self (e.g. self - other).  Can be "self" or "other"
@@ -372,17 +443,29 @@ class NetCdf(object):
 
         only_diff : bool flag to only add non-zero diffs to output file
 
+        output_filename : (optional) str filename of the new .nc file, or
+            a list with a filename for each of other.  Default is
+            <self.output_filename>.diff.nc, or
+            <self.output_filename>.diff1.nc, <self.output_filename>.diff2.nc,
+            ... if other is a list
+
+        maxbytes : (optional) maximum size in bytes of the blocks of the
+            variables that are differenced at a time.  Default is
+            BLOCK_BYTES
+
         Returns
         -------
-        net NetCDF instance
+        net NetCDF instance, or a list of NetCDF instances if other is a list
 
         Notes
         -----
         assumes the current NetCDF instance has been populated.  The
         variable names and dimensions between the two files must match
-        exactly. The name of the new .nc file is
-        <self.output_filename>.diff.nc.  The masks from both self and
-        other are carried through to the new instance
+        exactly.  The masks from both self and other are carried through
+        to the new instance.  Variables are differenced one block of the
+        first dimension (time for transient variables) at a time, so that
+        memory use does not depend on the size of the files.  Each block of
+        self is read once for all of the other files.
 
         """
 
@@ -395,111 +478,132 @@ class NetCdf(object):
             self.logger.warn(mess)
             raise Exception(mess)
 
-        if isinstance(other, str):
-            assert os.path.exists(other), "filename 'other' not found:" + \
-                                          "{0}".format(other)
-            other = netCDF4.Dataset(other, 'r')
+        if minuend.lower() not in ["self", "other"]:
+            mess = "unrecognized minuend {0}".format(minuend)
+            self.logger.warn(mess)
+            raise Exception(mess)
 
-        assert isinstance(other, netCDF4.Dataset)
+        islist = isinstance(other, (list, tuple))
+        if islist:
+            others = list(other)
+        else:
+            others = [other]
+        for i, other in enumerate(others):
+            if isinstance(other, str):
+                assert os.path.exists(other), \
+                    "filename 'other' not found:{0}".format(other)
+                others[i] = netCDF4.Dataset(other, 'r')
+            assert isinstance(others[i], netCDF4.Dataset)
 
         # check for similar variables
         self_vars = set(self.nc.variables.keys())
-        other_vars = set(other.variables)
-        diff = self_vars.symmetric_difference(other_vars)
-        if len(diff) > 0:
-            self.logger.warn("variables are not the same between the two " + \
-                             "nc files: " + ','.join(diff))
-            return
-
-        # check for similar dimensions
-        self_dimens = self.nc.dimensions
-        other_dimens = other.dimensions
-        for d in self_dimens.keys():
-            if d not in other_dimens:
-                self.logger.warn("missing dimension in other:{0}".format(d))
-                return
-            if len(self_dimens[d]) != len(other_dimens[d]):
-                self.logger.warn("dimension not consistent: " + \
-                                 "{0}:{1}".format(self_dimens[d],
-                                                  other_dimens[d]))
+        for other in others:
+            other_vars = set(other.variables)
+            diff = self_vars.symmetric_difference(other_vars)
+            if len(diff) > 0:
+                self.logger.warn("variables are not the same between the " + \
+                                 "two nc files: " + ','.join(diff))
                 return
+
+            # check for similar dimensions
+            self_dimens = self.nc.dimensions
+            other_dimens = other.dimensions
+            for d in self_dimens.keys():
+                if d not in other_dimens:
+                    self.logger.warn(
+                        "missing dimension in other:{0}".format(d))
+                    return
+                if len(self_dimens[d]) != len(other_dimens[d]):
+                    self.logger.warn("dimension not consistent: " + \
+                                     "{0}:{1}".format(self_dimens[d],
+                                                      other_dimens[d]))
+                    return
+
+        if output_filename is None:
+            if islist:
+                output_filename = [self.output_filename.replace(
+                    ".nc", ".diff{0}.nc".format(i + 1))
+                    for i in range(len(others))]
+            else:
+                output_filename = self.output_filename.replace(".nc",
+                                                               ".diff.nc")
+        if isinstance(output_filename, str):
+            output_filename = [output_filename]
+        assert len(output_filename) == len(others), \
+            "one output_filename is needed for each other"
+
         # should be good to go
         time_values = self.nc.variables.get("time")[:]
-        new_net = NetCdf(self.output_filename.replace(".nc", ".diff.nc"),
-                         self.model, time_values=time_values)
-        # add the vars to the instance
-        for vname in self_vars:
+        new_nets = [NetCdf(fname, self.model, time_values=time_values)
+                    for fname in output_filename]
+        # add the vars to the instances
+        for vname in self.nc.variables.keys():
             if vname not in self.var_attr_dict or \
-                            new_net.nc.variables.get(vname) is not None:
+                            new_nets[0].nc.variables.get(vname) is not None:
                 self.logger.warn("skipping variable: {0}".format(vname))
                 continue
             self.log("processing variable {0}".format(vname))
             s_var = self.nc.variables[vname]
-            o_var = other.variables[vname]
-            s_data = s_var[:]
-            o_data = o_var[:]
-            o_mask, s_mask = None, None
-
-            # keep the masks to apply later
-            if isinstance(s_data, np.ma.MaskedArray):
-                self.logger.warn("masked array for {0}".format(vname))
-                s_mask = s_data.mask
-                s_data = np.array(s_data)
-                s_data[s_mask] = 0.0
-            else:
-                np.nan_to_num(s_data)
-
-            if isinstance(o_data, np.ma.MaskedArray):
-                o_mask = o_data.mask
-                o_data = np.array(o_data)
-                o_data[o_mask] = 0.0
-            else:
-                np.nan_to_num(o_data)
-
-            # difference with self
-            if minuend.lower() == "self":
-                d_data = s_data - o_data
-            elif minuend.lower() == "other":
-                d_data = o_data - s_data
-            else:
-                mess = "unrecognized minuend {0}".format(minuend)
-                self.logger.warn(mess)
-                raise Exception(mess)
-
-            # check for non-zero diffs
-            if onlydiff and d_data.sum() == 0.0:
+            blocks = list(_iter_blocks(s_var.shape, s_var.dtype.itemsize,
+                                       maxbytes))
+
+            # check for non-zero diffs, which only reads the first blocks
+            # of variables that have differences
+            active = list(range(len(others)))
+            if onlydiff:
+                active = []
+                for sl in blocks:
+                    s_data = s_var[sl]
+                    for i, other in enumerate(others):
+                        if i in active:
+                            continue
+                        d_data = _difference_block(
+                            s_data, other.variables[vname][sl], minuend)[1]
+                        if np.any(d_data != 0.0):
+                            active.append(i)
+                    if len(active) == len(others):
+                        break
+                active.sort()
+                if len(active) < len(others):
+                    nzero = len(others) - len(active)
+                    self.logger.warn(
+                        "var {0} has zero differences with {1} of the "
+                        "files, skipping...".format(vname, nzero))
+                if len(active) == 0:
+                    continue
+
+            new_vars = {}
+            for i in active:
+                new_vars[i] = new_nets[i].create_variable(
+                    vname, self.var_attr_dict[vname].copy(), s_var.dtype,
+                    dimensions=s_var.dimensions)
+            vmin = dict((i, None) for i in active)
+            vmax = dict((i, None) for i in active)
+            for sl in blocks:
+                s_data = s_var[sl]
+                for i in active:
+                    d_data, raw = _difference_block(
+                        s_data, others[i].variables[vname][sl], minuend,
+                        mask_zero_diff)
+                    vmin[i], vmax[i] = _min_max(raw, vmin[i], vmax[i])
+                    new_vars[i][sl] = d_data
+
+            # reset the max and min attributes to the differences
+            for i in active:
+                if vmin[i] is None:
+                    continue
                 self.logger.warn(
-                    "var {0} has zero differences, skipping...".format(vname))
-                continue
-
-            self.logger.warn(
-                "resetting diff attrs max,min:{0},{1}".format(d_data.min(),
-                                                              d_data.max()))
-            attrs = self.var_attr_dict[vname].copy()
-            attrs["max"] = np.nanmax(d_data)
-            attrs["min"] = np.nanmin(d_data)
-            # reapply masks
-            if s_mask is not None:
-                self.log("applying self mask")
-                s_mask[d_data != 0.0] = False
-                d_data[s_mask] = FILLVALUE
-                self.log("applying self mask")
-            if o_mask is not None:
-                self.log("applying other mask")
-                o_mask[d_data != 0.0] = False
-                d_data[o_mask] = FILLVALUE
-                self.log("applying other mask")
-
-            d_data[np.isnan(d_data)] = FILLVALUE
-            if mask_zero_diff:
-                d_data[np.where(d_data == 0.0)] = FILLVALUE
-
-            var = new_net.create_variable(vname, attrs,
-                                          s_var.dtype,
-                                          dimensions=s_var.dimensions)
-
-            var[:] = d_data
+                    "resetting diff attrs max,min:{0},{1}".format(vmax[i],
+                                                                  vmin[i]))
+                attrs = new_nets[i].var_attr_dict[vname]
+                attrs["max"] = vmax[i]
+                attrs["min"] = vmin[i]
+                new_vars[i].setncattr("max", vmax[i])
+                new_vars[i].setncattr("min", vmin[i])
             self.log("processing variable {0}".format(vname))
+        if islist:
+            return new_nets
+        return new_nets[0]
 
     def _dt_str(self, dt):
         """ for datetime to string for year < 1900
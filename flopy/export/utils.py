@@ -1,4 +1,6 @@
 from __future__ import print_function
+import os
+from collections import OrderedDict
 import numpy as np
 from ..utils import Util2d, Util3d, Transient2d, MfList, \
     HeadFile, CellBudgetFile, UcnFile, FormattedHeadFile
@@ -65,95 +67,342 @@ def get_var_array_dict(m):
     return vdict
 
 
+class _P2Quantile(object):
+    """
+    Streaming estimate of a quantile of each value of an array with the
+    P-square algorithm (Jain and Chlamtac, 1985), which stores five
+    markers for each value instead of all of the observations.
+
+    """
+
+    def __init__(self, p):
+        self.p = float(p)
+        self.count = 0
+        self.shape = None
+        self._obs = []
+        self.dn = np.array([0., p / 2., p, (1. + p) / 2., 1.])
+        self.ndesired = np.array([0., 2. * p, 4. * p, 2. + 2. * p, 4.])
+
+    def update(self, a):
+        a = np.asarray(a, dtype=np.float64)
+        self.shape = a.shape
+        x = a.ravel()
+        self.count += 1
+        if self.count <= 5:
+            self._obs.append(x.copy())
+            if self.count == 5:
+                # marker heights and positions
+                self.q = np.sort(np.array(self._obs), axis=0)
+                self.n = np.repeat(np.arange(5.)[:, np.newaxis], len(x),
+                                   axis=1)
+                self._obs = None
+            return
+        q, n = self.q, self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # marker interval of each observation
+            k = np.sum(x >= q[1:4], axis=0)
+            q[0] = np.minimum(q[0], x)
+            q[4] = np.maximum(q[4], x)
+            n[1:] += np.arange(1, 5)[:, np.newaxis] > k
+            self.ndesired += self.dn
+            for i in range(1, 4):
+                d = self.ndesired[i] - n[i]
+                move = ((d >= 1.) & (n[i + 1] - n[i] > 1.)) | \
+                       ((d <= -1.) & (n[i - 1] - n[i] < -1.))
+                if not np.any(move):
+                    continue
+                d = np.where(d >= 0., 1., -1.)
+                # parabolic prediction of the marker height
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) /
+                    (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) /
+                    (n[i] - n[i - 1]))
+                # linear prediction if the parabolic one is out of order
+                qd = np.where(d > 0., q[i + 1], q[i - 1])
+                nd = np.where(d > 0., n[i + 1], n[i - 1])
+                ql = q[i] + d * (qd - q[i]) / (nd - n[i])
+                qp = np.where((q[i - 1] < qp) & (qp < q[i + 1]), qp, ql)
+                q[i] = np.where(move, qp, q[i])
+                n[i] = np.where(move, n[i] + d, n[i])
+
+    def get_quantile(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # exact quantile of the observations
+            obs = self.q if self._obs is None else np.array(self._obs)
+            qnt = np.percentile(obs, 100. * self.p, axis=0)
+        else:
+            qnt = self.q[2]
+        return qnt.reshape(self.shape)
+
+
+class EnsembleStatistics(object):
+    """
+    Statistics of an ensemble of model realizations that are updated one
+    realization at a time, so that the realizations do not have to be
+    kept in memory.
+
+    The mean and standard deviation are computed with Welford's online
+    algorithm. Quantiles are estimated with the P-square algorithm, which
+    needs memory for ten values for each array value and quantile.
+
+    Parameters
+    ----------
+    minmax : bool
+        If True, the minimum and maximum are also computed.
+        (default is False)
+    quantiles : list of floats
+        Quantiles (between 0 and 1) to estimate. (default is None)
+
+    Examples
+    --------
+    >>> stats = EnsembleStatistics(minmax=True, quantiles=[0.05, 0.95])
+    >>> for m in models:
+    ...     vdict = {}
+    ...     m.export(vdict)
+    ...     stats.update(vdict)
+    >>> results = stats.get_statistics()
+    >>> mean_hk = results['**mean**']['hk']
+
+    """
+
+    def __init__(self, minmax=False, quantiles=None):
+        self.minmax = minmax
+        if quantiles is None:
+            quantiles = []
+        self.quantiles = [float(q) for q in quantiles]
+        for q in self.quantiles:
+            if q < 0. or q > 1.:
+                raise ValueError('quantiles must be between 0 and 1: ' +
+                                 '{}'.format(q))
+        self.count = OrderedDict()
+        self._dtype = {}
+        self._mean = {}
+        self._m2 = {}
+        self._min = {}
+        self._max = {}
+        self._qnt = {}
+        self._nodata = {}
+
+    def update(self, vdict):
+        """
+        Add a realization.
+
+        Parameters
+        ----------
+        vdict : dict
+            Dictionary of arrays of a realization, for example from
+            model.export(dict)
+
+        """
+        for vname, a in vdict.items():
+            a = np.asarray(a)
+            x = a.astype(np.float64)
+            if vname not in self.count:
+                self.count[vname] = 0
+                self._dtype[vname] = a.dtype
+                self._mean[vname] = np.zeros(a.shape, dtype=np.float64)
+                self._m2[vname] = np.zeros(a.shape, dtype=np.float64)
+                if self.minmax:
+                    self._min[vname] = x.copy()
+                    self._max[vname] = x.copy()
+                self._qnt[vname] = [_P2Quantile(q) for q in self.quantiles]
+            self.count[vname] += 1
+            delta = x - self._mean[vname]
+            self._mean[vname] += delta / self.count[vname]
+            self._m2[vname] += delta * (x - self._mean[vname])
+            if self.minmax:
+                np.minimum(self._min[vname], x, out=self._min[vname])
+                np.maximum(self._max[vname], x, out=self._max[vname])
+            for qnt in self._qnt[vname]:
+                qnt.update(x)
+            # values without data in the last realization are not used
+            self._nodata[vname] = np.isnan(x) | (x == netcdf.FILLVALUE)
+
+    def get_statistics(self):
+        """
+        Get the statistics of the realizations.
+
+        Returns
+        -------
+        stats : OrderedDict
+            Dictionary of the form {suffix: {vname: array}}, where suffix
+            is '**mean**', '**stdev**', '**min**', '**max**', or
+            '**q{:g}**'.format(100 * quantile) (for example '**q95**').
+            Array values without data (nan or netcdf.FILLVALUE) in the last
+            realization are set to netcdf.FILLVALUE.
+
+        """
+        stats = OrderedDict([('**mean**', {}), ('**stdev**', {})])
+        if self.minmax:
+            stats['**min**'] = {}
+            stats['**max**'] = {}
+        for q in self.quantiles:
+            stats['**q{:g}**'.format(100. * q)] = {}
+        for vname, n in self.count.items():
+            arrays = [self._mean[vname], np.sqrt(self._m2[vname] / n)]
+            if self.minmax:
+                arrays += [self._min[vname], self._max[vname]]
+            arrays += [qnt.get_quantile() for qnt in self._qnt[vname]]
+            # same precision as numpy's mean of the realizations
+            dtype = self._dtype[vname]
+            if not np.issubdtype(dtype, np.floating):
+                dtype = np.float64
+            for suffix, a in zip(stats.keys(), arrays):
+                a = a.astype(dtype)
+                a[self._nodata[vname]] = netcdf.FILLVALUE
+                stats[suffix][vname] = a
+        return stats
+
+
+def _load_ensemble_model(model):
+    """load a model from a name file, or return a model instance"""
+    if isinstance(model, str):
+        from ..modflow import Modflow
+        model_ws, namefile = os.path.split(model)
+        if model_ws == '':
+            model_ws = '.'
+        model = Modflow.load(namefile, model_ws=model_ws, check=False)
+    return model
+
+
+def _export_realization(args):
+    """export the inputs and outputs of a realization to dicts"""
+    model, inputs, outputs, kwargs = args
+    m = _load_ensemble_model(model)
+    suffix = m.name.split('.')[0].split('_')[-1]
+    vin, vout = None, None
+    if inputs:
+        vin = {}
+        m.export(vin, **kwargs)
+    if outputs:
+        vout = {}
+        output_helper(vout, m, m.load_results(as_dict=True), **kwargs)
+    return suffix, m.get_nrow_ncol_nlay_nper(), vin, vout
+
+
+def _export_realizations(models, inputs, outputs, nproc, kwargs):
+    """
+    export realizations one at a time, or in nproc worker processes
+
+    """
+    if nproc is None or nproc <= 1:
+        for m in models:
+            yield _export_realization((m, inputs, outputs, kwargs))
+        return
+
+    args = []
+    for m in models:
+        if not isinstance(m, str):
+            raise TypeError('ensemble_helper: models must be name ' +
+                            'files when nproc > 1')
+        args.append((m, inputs, outputs, kwargs))
+
+    import multiprocessing
+    pool = multiprocessing.Pool(nproc)
+    try:
+        # the workers export the next realizations while the results are
+        # added to the statistics and the netcdf files
+        for result in pool.imap(_export_realization, args):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
 def ensemble_helper(inputs_filename, outputs_filename, models, add_reals=True,
-                    **kwargs):
+                    minmax=False, quantiles=None, nproc=1, **kwargs):
     """ helper to export an ensemble of model instances.  Assumes
     all models have same dis and sr, only difference is properties and
     boundary conditions.  Assumes model.nam.split('_')[-1] is the
     realization suffix to use in the netcdf variable names
+
+    The realizations are processed one at a time: each realization is
+    appended to the netcdf files (if add_reals is True) and added to
+    the ensemble statistics (EnsembleStatistics), and is then released.
+    models can be a generator that loads the models one at a time.
+
+    Parameters
+    ----------
+    inputs_filename : str
+        netcdf file for the model inputs (None to skip the inputs)
+    outputs_filename : str
+        netcdf file for the model outputs (None to skip the outputs)
+    models : list or iterable
+        flopy models, or MODFLOW name files that are loaded one at a time
+    add_reals : bool
+        If True, each realization after the first is written to the netcdf
+        files.  The files always have the variables of the first
+        realization and the ensemble statistics.
+    minmax : bool
+        If True, the ensemble minimum and maximum are also written.
+    quantiles : list of floats
+        Ensemble quantiles (between 0 and 1) to estimate and write.
+    nproc : int
+        Number of worker processes that load and export the realizations
+        after the first one. models must be name files if nproc > 1,
+        because flopy models can not be sent to other processes.
+        (default is 1)
+    **kwargs : keyword arguments passed to the export functions
+
+    Returns
+    -------
+    f_in, f_out : NetCdf instances for the inputs and outputs
+
     """
     f_in, f_out = None, None
-    for m in models[1:]:
-        assert m.get_nrow_ncol_nlay_nper() == models[
-            0].get_nrow_ncol_nlay_nper()
-    if inputs_filename is not None:
-        f_in = models[0].export(inputs_filename, **kwargs)
-        vdict = {}
-        vdicts = [models[0].export(vdict, **kwargs)]
-        i = 1
-        for m in models[1:]:
-            suffix = m.name.split('.')[0].split('_')[-1]
-            vdict = {}
-            m.export(vdict, **kwargs)
-            vdicts.append(vdict)
-            if add_reals:
-                f_in.append(vdict, suffix=suffix)
-            i += 1
-        mean, stdev = {}, {}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-
-        if i >= 2:
-            if not add_reals:
-                f_in.write()
-                f_in = NetCdf.empty_like(mean, output_filename=inputs_filename)
-                f_in.append(mean, suffix="**mean**")
-                f_in.append(stdev, suffix="**stdev**")
-            else:
-                f_in.append(mean, suffix="**mean**")
-                f_in.append(stdev, suffix="**stdev**")
-        f_in.add_global_attributes({"namefile": ''})
+    inputs = inputs_filename is not None
+    outputs = outputs_filename is not None
+    in_stats = EnsembleStatistics(minmax, quantiles)
+    out_stats = EnsembleStatistics(minmax, quantiles)
 
-    if outputs_filename is not None:
-        f_out = output_helper(outputs_filename, models[0], models[0]. \
-                              load_results(as_dict=True), **kwargs)
+    models = iter(models)
+    try:
+        m0 = _load_ensemble_model(next(models))
+    except StopIteration:
+        return f_in, f_out
+    shape0 = m0.get_nrow_ncol_nlay_nper()
+    if inputs:
+        f_in = m0.export(inputs_filename, **kwargs)
+        vdict = {}
+        m0.export(vdict, **kwargs)
+        in_stats.update(vdict)
+    if outputs:
+        oudic = m0.load_results(as_dict=True)
+        f_out = output_helper(outputs_filename, m0, oudic, **kwargs)
         vdict = {}
-        vdicts = [output_helper(vdict, models[0], models[0]. \
-                                load_results(as_dict=True), **kwargs)]
-        i = 1
-        for m in models[1:]:
-            suffix = m.name.split('.')[0].split('_')[-1]
-            oudic = m.load_results(as_dict=True)
-            vdict = {}
-            output_helper(vdict, m, oudic, **kwargs)
-            vdicts.append(vdict)
+        output_helper(vdict, m0, oudic, **kwargs)
+        out_stats.update(vdict)
+    del m0, vdict
+
+    i = 1
+    for suffix, shape, vin, vout in _export_realizations(models, inputs,
+                                                         outputs, nproc,
+                                                         kwargs):
+        assert shape == shape0
+        if inputs:
+            in_stats.update(vin)
+            if add_reals:
+                f_in.append(vin, suffix=suffix)
+        if outputs:
+            out_stats.update(vout)
             if add_reals:
-                f_out.append(vdict, suffix=suffix)
-            i += 1
-
-        mean, stdev = {}, {}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            mean[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
+                f_out.append(vout, suffix=suffix)
+        i += 1
+
+    f = [f_in, f_out]
+    for n, stats in enumerate([in_stats, out_stats]):
+        if f[n] is None:
+            continue
+        # the statistics are added to the file of the first realization,
+        # which has the variables of the statistics
         if i >= 2:
-            if not add_reals:
-                f_out.write()
-                f_out = NetCdf.empty_like(mean,
-                                          output_filename=outputs_filename)
-                f_out.append(mean, suffix="**mean**")
-                f_out.append(stdev, suffix="**stdev**")
-
-            else:
-                f_out.append(mean, suffix="**mean**")
-                f_out.append(stdev, suffix="**stdev**")
-        f_out.add_global_attributes({"namefile": ''})
+            for suffix, vdict in stats.get_statistics().items():
+                f[n].append(vdict, suffix=suffix)
+        f[n].add_global_attributes({"namefile": ''})
+    f_in, f_out = f
     return f_in, f_out
 
 
@@ -167,13 +416,20 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
     array = np.zeros((len(times), shape3d[0], shape3d[1], shape3d[2]),
                      dtype=np.float32)
     array[:] = np.NaN
+    # reused for the list-style budget records of each time
+    buffer = np.ma.zeros(shape3d, dtype=np.float32)
     for i, t in enumerate(times):
         if t in out_obj.recordarray["totim"]:
             try:
                 if text:
-                    a = out_obj.get_data(totim=t, full3D=True, text=text)
-                    if isinstance(a, list):
-                        a = a[0]
+                    # the first record of text at this time, which can be
+                    # read into the buffer when records of several packages
+                    # have the same text
+                    idx = out_obj.get_indices(text)
+                    idx = idx[out_obj.recordarray['totim'][idx] == t]
+                    if len(idx) == 0:
+                        raise Exception('record not found')
+                    a = out_obj.get_record(idx[0], full3D=True, out=buffer)
                 else:
                     a = out_obj.get_data(totim=t)
             except Exception as e:
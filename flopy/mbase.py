@@ -11,12 +11,15 @@ import os
 import subprocess as sp
 import shutil
 import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 if sys.version_info > (3, 0):
     import queue as Queue
 else:
     import Queue
 from datetime import datetime
+from collections import OrderedDict
 import copy
 import numpy as np
 from flopy import utils
@@ -27,6 +30,75 @@ iconst = 1  # Multiplier for individual array elements in integer and real array
 iprn = -1  # Printout flag. If >= 0 then array values read are printed in listing file.
 
 
+# packages being written by a write_input worker process, set in each
+# worker when it starts
+_worker_packages = None
+
+
+def _write_package_file(p):
+    # prevent individual package checks from running after
+    # model-level package check above
+    # otherwise checks are run twice
+    # or the model level check procedure would have to be split up
+    # or each package would need a check arguemnt,
+    # or default for package level check would have to be False
+    try:
+        p.write_file(check=False)
+    except TypeError:
+        p.write_file()
+
+
+def _package_util2ds(p):
+    # Util2d instances held by a package
+    from .utils.util_array import Util2d, Util3d, Transient2d, Transient3d
+    values = list(vars(p).values())
+    while values:
+        value = values.pop()
+        if isinstance(value, Util2d):
+            yield value
+        elif isinstance(value, Util3d):
+            values.extend(value.util_2ds)
+        elif isinstance(value, Transient2d):
+            values.extend(value.transient_2ds.values())
+        elif isinstance(value, Transient3d):
+            values.extend(value.transient_3ds.values())
+        elif isinstance(value, (list, tuple)):
+            values.extend(value)
+
+
+def _uses_external_units(p):
+    # arrays written to EXTERNAL files get a unit number from the model
+    # and are added to the name file entries of the model while the
+    # package is written, which can only be done in the parent process
+    for u2d in _package_util2ds(p):
+        if u2d.how == 'external' or not u2d.format.array_free_format:
+            return True
+    return False
+
+
+def _array_files(p):
+    # files that the arrays of a package are written to, see
+    # Util2d.get_file_entry
+    files = []
+    for u2d in _package_util2ds(p):
+        if u2d.how in ('external', 'openclose') or u2d.format.binary or \
+                u2d.model.external_path is not None:
+            files.append(u2d.python_file_path)
+    return sorted(set(files))
+
+
+def _init_write_worker(packages):
+    # worker processes are forked, so the packages are inherited from the
+    # parent process and only the package index needs to be sent
+    global _worker_packages
+    _worker_packages = packages
+
+
+def _write_package_worker(idx):
+    _write_package_file(_worker_packages[idx])
+    return idx
+
+
 def is_exe(fpath):
     return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
 
@@ -104,6 +176,9 @@ class BaseModel(object):
         self.namefile_ext = namefile_ext
         self.namefile = self.__name + '.' + self.namefile_ext
         self.packagelist = []
+        self._lazy_packages = OrderedDict()
+        # content hashes of packages written with write_input(incremental)
+        self._write_hashes = {}
         self.heading = ''
         self.exe_name = exe_name
         self.external_extension = 'ref'
@@ -192,6 +267,7 @@ class BaseModel(object):
         # for pak in self.packagelist:
         #    f = pak.export(f)
         # return f
+        self.load_lazy_packages()
         from .export import utils
         return utils.model_helper(f, self, **kwargs)
 
@@ -238,6 +314,13 @@ class BaseModel(object):
             Name of the package, such as 'RIV', 'BAS6', etc.
 
         """
+        # packages registered for lazy loading are not loaded
+        lazy_packages = vars(self).get('_lazy_packages')
+        if lazy_packages and pname.upper() in lazy_packages:
+            if self.verbose:
+                print('removing Package: ', pname.upper())
+            lazy_packages.pop(pname.upper())
+            return
         for i, pp in enumerate(self.packagelist):
             if pname in pp.name:
                 if self.verbose:
@@ -701,8 +784,46 @@ class BaseModel(object):
         for pp in (self.packagelist):
             if (pp.name[0].upper() == name.upper()):
                 return pp
+        # load the package if it was registered for lazy loading
+        lazy_packages = vars(self).get('_lazy_packages')
+        if lazy_packages and name.upper() in lazy_packages:
+            self._load_lazy_package(name.upper())
+            return self.get_package(name)
         return None
 
+    def add_lazy_package(self, name, load):
+        """
+        Register a package that will not be loaded until it is accessed.
+
+        Parameters
+        ----------
+        name : str
+            Name of the package, 'RIV', 'LPF', etc.
+        load : callable
+            Function, called without arguments, that loads the package
+            and adds it to the model.
+
+        """
+        self._lazy_packages[name.upper()] = load
+
+    def _load_lazy_package(self, name):
+        load = self._lazy_packages.pop(name)
+        load()
+
+    def load_lazy_packages(self):
+        """
+        Load all packages that were registered for lazy loading and have
+        not been accessed yet.
+
+        """
+        lazy_packages = vars(self).get('_lazy_packages')
+        if not lazy_packages:
+            return
+        for name in list(lazy_packages.keys()):
+            # packages may have been loaded by another package
+            if name in lazy_packages:
+                self._load_lazy_package(name)
+
     def get_package_list(self):
         """
         Get a list of all the package names.
@@ -720,6 +841,9 @@ class BaseModel(object):
         val = []
         for pp in (self.packagelist):
             val.append(pp.name[0].upper())
+        lazy_packages = vars(self).get('_lazy_packages')
+        if lazy_packages:
+            val += list(lazy_packages.keys())
         return val
 
     def set_version(self, version):
@@ -903,7 +1027,8 @@ class BaseModel(object):
 
         return None
 
-    def write_input(self, SelPackList=False, check=False):
+    def write_input(self, SelPackList=False, check=False, incremental=False,
+                    nprocs=1):
         """
         Write the input.
 
@@ -911,7 +1036,31 @@ class BaseModel(object):
         ----------
         SelPackList : False or list of packages
 
+        check : boolean
+            Check model input for common errors before writing.
+            (default is False)
+
+        incremental : boolean
+            Only write packages whose data have changed since they were
+            last written to the model workspace with incremental=True, or
+            whose input file or external array files have been changed or
+            removed since. Packages that change their own data when they
+            are written are written again by the next call. The name file
+            is always written. (default is False)
+
+        nprocs : int
+            Number of processes used to write the package files (and any
+            external array files of the packages) concurrently. Processes
+            are forked from the current process; threads are used on macOS,
+            where forking is not safe, and on platforms that do not support
+            fork. Packages with arrays that
+            are written to EXTERNAL units are written by the current
+            process. (default is 1)
+
         """
+        # all packages are needed to write the name file
+        self.load_lazy_packages()
+
         if check:
             # run check prior to writing input
             self.check(f='{}.chk'.format(self.name), verbose=self.verbose,
@@ -921,30 +1070,45 @@ class BaseModel(object):
             print('\nWriting packages:')
 
         if SelPackList == False:
-            for p in self.packagelist:
-                if self.verbose:
-                    print('   Package: ', p.name[0])
-                # prevent individual package checks from running after
-                # model-level package check above
-                # otherwise checks are run twice
-                # or the model level check procedure would have to be split up
-                # or each package would need a check arguemnt,
-                # or default for package level check would have to be False
-                try:
-                    p.write_file(check=False)
-                except TypeError:
-                    p.write_file()
+            packages = list(self.packagelist)
         else:
+            packages = []
             for pon in SelPackList:
-                for i, p in enumerate(self.packagelist):
-                    if pon in p.name:
-                        if self.verbose:
-                            print('   Package: ', p.name[0])
-                        try:
-                            p.write_file(check=False)
-                        except TypeError:
-                            p.write_file()
-                            break
+                for p in self.packagelist:
+                    if pon in p.name and p not in packages:
+                        packages.append(p)
+
+        if incremental:
+            changed = []
+            hashes = {}
+            for p in packages:
+                fpth = os.path.abspath(p.fn_path)
+                hashes[fpth] = self._get_write_hash(p)
+                if self._write_hashes.get(fpth) == \
+                        (hashes[fpth], self._get_file_stamps(p)):
+                    if self.verbose:
+                        print('   Package: ', p.name[0], '(unchanged)')
+                else:
+                    changed.append(p)
+            packages = changed
+
+        if self.verbose:
+            for p in packages:
+                print('   Package: ', p.name[0])
+        if nprocs > 1 and len(packages) > 1:
+            self._write_packages_parallel(packages, nprocs)
+        else:
+            for p in packages:
+                _write_package_file(p)
+
+        if incremental:
+            # the content hashes from before writing are kept, only the
+            # files have changed
+            for p in packages:
+                fpth = os.path.abspath(p.fn_path)
+                self._write_hashes[fpth] = (hashes[fpth],
+                                            self._get_file_stamps(p))
+
         if self.verbose:
             print(' ')
         # write name file
@@ -952,6 +1116,137 @@ class BaseModel(object):
         # os.chdir(org_dir)
         return
 
+    @staticmethod
+    def _write_packages_parallel(packages, nprocs):
+        # packages with external arrays are written in this process
+        # once the other packages have been written
+        serial = [p for p in packages if _uses_external_units(p)]
+        packages = [p for p in packages if p not in serial]
+        if len(packages) < 2:
+            for p in packages + serial:
+                _write_package_file(p)
+            return
+        nprocs = min(nprocs, len(packages))
+        if sys.platform == 'darwin':
+            # system libraries are not safe to use in a forked process
+            ctx = None
+        else:
+            try:
+                ctx = multiprocessing.get_context('fork')
+            except AttributeError:
+                # python 2 uses fork on all platforms that support it
+                ctx = multiprocessing if hasattr(os, 'fork') else None
+            except ValueError:
+                ctx = None
+        if ctx is None:
+            pool = ThreadPool(nprocs)
+            try:
+                pool.map(_write_package_file, packages, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            pool = ctx.Pool(nprocs, initializer=_init_write_worker,
+                            initargs=(packages,))
+            try:
+                pool.map(_write_package_worker, range(len(packages)),
+                         chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        for p in serial:
+            _write_package_file(p)
+
+    def _get_write_hash(self, p):
+        """
+        Get the package content hash and a hash of the model settings used
+        when writing packages.
+
+        """
+        settings = dict((k, v) for k, v in vars(self).items()
+                        if isinstance(v, (bool, int, float, str)))
+        # the files written from the package are checked separately
+        skip_files = [p.fn_path] + _array_files(p)
+        return utils.utils_def.get_content_hash(p, skip_types=(BaseModel,),
+                                                skip_files=skip_files), \
+               utils.utils_def.get_content_hash(settings)
+
+    @staticmethod
+    def _get_file_stamps(p):
+        """
+        Get the size and modification time of the package file and of the
+        external files of its arrays; None for files that do not exist.
+
+        """
+        stamps = []
+        for fpth in [p.fn_path] + _array_files(p):
+            stamp = None
+            if os.path.isfile(fpth):
+                st = os.stat(fpth)
+                stamp = (st.st_size, st.st_mtime)
+            stamps.append((fpth, stamp))
+        return stamps
+
+    def save_snapshot(self, filename):
+        """
+        Save the model and all of its packages to a binary snapshot file
+        that can be reloaded with load_snapshot without parsing the model
+        input files.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the snapshot file. If filename does not include a path,
+            the file is written to the model workspace.
+
+        Examples
+        --------
+        >>> import flopy
+        >>> m = flopy.modflow.Modflow.load('model.nam')
+        >>> m.save_snapshot('model.snap')
+
+        """
+        from .utils.snapshot import save_snapshot
+        # packages registered for lazy loading can not be saved
+        self.load_lazy_packages()
+        if os.path.dirname(filename) == '':
+            filename = os.path.join(self.model_ws, filename)
+        save_snapshot(self, filename)
+
+    @staticmethod
+    def load_snapshot(filename, model_ws=None, mmap=True):
+        """
+        Load a model from a binary snapshot file written by save_snapshot.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the snapshot file.
+        model_ws : str
+            Model workspace for the loaded model. If None, the model
+            workspace of the saved model is used. (default is None)
+        mmap : bool
+            If True, arrays are copy-on-write views of a memory map of the
+            snapshot file. (default is True)
+
+        Returns
+        -------
+        m : model object of the type that was saved
+
+        Examples
+        --------
+        >>> import flopy
+        >>> m = flopy.modflow.Modflow.load_snapshot('model.snap')
+
+        """
+        from .utils.snapshot import load_snapshot
+        m = load_snapshot(filename, mmap=mmap)
+        if not isinstance(m, BaseModel):
+            raise TypeError('{} does not contain a model'.format(filename))
+        if model_ws is not None:
+            m.change_model_ws(model_ws)
+        return m
+
     def write_name_file(self):
         """
         Every Package needs its own writenamefile function
@@ -1152,6 +1447,8 @@ class BaseModel(object):
         if self.verbose:
             print('\nPlotting Packages')
 
+        self.load_lazy_packages()
+
         axes = []
         ifig = 0
         if SelPackList is None:
@@ -7,6 +7,7 @@ mf module.  Contains the ModflowGlobal, ModflowList, and Modflow classes.
 import os
 import sys
 import inspect
+import functools
 import flopy
 from ..mbase import BaseModel
 from ..pakbase import Package
@@ -425,7 +426,8 @@ class Modflow(BaseModel):
 
     @staticmethod
     def load(f, version='mf2005', exe_name='mf2005.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=True, check=True):
+             model_ws='.', load_only=None, forgive=True, check=True,
+             lazy=False):
         """
         Load an existing model.
 
@@ -442,6 +444,19 @@ class Modflow(BaseModel):
 
         check : boolean
             Check model input for common errors. (default True)
+
+        lazy : boolean
+            Only load the DIS and BAS6 packages. Other packages in the name
+            file are registered with the model and loaded the first time
+            they are accessed (for example, ml.lpf or
+            ml.get_package('LPF')). Only loaded packages are checked if
+            check is True. Package files that can not be opened are
+            handled when the model is loaded, but errors in the package
+            files are only raised (forgive=False) or set load_fail
+            (forgive=True) when the package is accessed. Use
+            ml.load_lazy_packages() to load the remaining packages.
+            (default False)
+
         Returns
         -------
         ml : Modflow object
@@ -637,44 +652,14 @@ class Modflow(BaseModel):
         ml.mfpar.set_zone(ml, ext_unit_dict)
         ml.mfpar.set_mult(ml, ext_unit_dict)
 
+        # packages to load after dis and bas
+        load_items = []
+
         # try loading packages in ext_unit_dict
         for key, item in ext_unit_dict.items():
             if item.package is not None:
                 if item.filetype in load_only and item.filetype != "DIS":
-                    if not forgive:
-                        if "check" in inspect.getargspec(item.package.load):
-                            pck = item.package.load(item.filename, ml,
-                                                    ext_unit_dict=ext_unit_dict,
-                                                    check=False)
-                        else:
-                            pck = item.package.load(item.filename, ml,
-                                                    ext_unit_dict=ext_unit_dict)
-                        files_succesfully_loaded.append(item.filename)
-                        if ml.verbose:
-                            sys.stdout.write(
-                                '   {:4s} package load...success\n'
-                                .format(pck.name[0]))
-                    else:
-                        try:
-                            try:
-                                pck = item.package.load(item.filename, ml,
-                                                        ext_unit_dict=ext_unit_dict,
-                                                        check=False)
-                            except TypeError:
-                                pck = item.package.load(item.filename, ml,
-                                                        ext_unit_dict=ext_unit_dict)
-                            files_succesfully_loaded.append(item.filename)
-                            if ml.verbose:
-                                sys.stdout.write(
-                                    '   {:4s} package load...success\n'
-                                    .format(pck.name[0]))
-                        except BaseException as o:
-                            ml.load_fail = True
-                            if ml.verbose:
-                                sys.stdout.write(
-                                    '   {:4s} package load...failed\n   {!s}\n'
-                                    .format(item.filetype, o))
-                            files_not_loaded.append(item.filename)
+                    load_items.append(item)
                 else:
                     if ml.verbose:
                         sys.stdout.write('   {:4s} package load...skipped\n'
@@ -699,6 +684,37 @@ class Modflow(BaseModel):
                                                    in item.filetype.lower())
                         ml.external_output.append(False)
 
+        if lazy:
+            # register packages so they are loaded on first access; files
+            # that can not be opened are reported now
+            for item in load_items:
+                if item.filehandle is None:
+                    if not forgive:
+                        raise Exception('could not open {} package file: '
+                                        '{}'.format(item.filetype,
+                                                    item.filename))
+                    ml.load_fail = True
+                    if ml.verbose:
+                        sys.stdout.write(
+                            '   {:4s} package load...failed\n   could not '
+                            'open {}\n'.format(item.filetype, item.filename))
+                    files_not_loaded.append(item.filename)
+                    continue
+                try:
+                    name = item.package.ftype()
+                except AttributeError:
+                    name = item.filetype
+                load = functools.partial(Modflow._load_registered_package,
+                                         ml, item, ext_unit_dict, forgive)
+                ml.add_lazy_package(name, load)
+        else:
+            for item in load_items:
+                pck = Modflow._load_package(ml, item, ext_unit_dict, forgive)
+                if pck is None:
+                    files_not_loaded.append(item.filename)
+                else:
+                    files_succesfully_loaded.append(item.filename)
+
         # pop binary output keys and any external file units that are now
         # internal
         for key in ml.pop_key_list:
@@ -731,3 +747,58 @@ class Modflow(BaseModel):
 
         # return model object
         return ml
+
+    @staticmethod
+    def _load_package(ml, item, ext_unit_dict=None, forgive=True):
+        """
+        Load a package from a name file entry. Returns the package or
+        None if the package could not be loaded and forgive is True.
+
+        """
+        if not forgive:
+            if "check" in inspect.getargspec(item.package.load):
+                pck = item.package.load(item.filename, ml,
+                                        ext_unit_dict=ext_unit_dict,
+                                        check=False)
+            else:
+                pck = item.package.load(item.filename, ml,
+                                        ext_unit_dict=ext_unit_dict)
+            if ml.verbose:
+                sys.stdout.write(
+                    '   {:4s} package load...success\n'
+                    .format(pck.name[0]))
+        else:
+            try:
+                try:
+                    pck = item.package.load(item.filename, ml,
+                                            ext_unit_dict=ext_unit_dict,
+                                            check=False)
+                except TypeError:
+                    pck = item.package.load(item.filename, ml,
+                                            ext_unit_dict=ext_unit_dict)
+                if ml.verbose:
+                    sys.stdout.write(
+                        '   {:4s} package load...success\n'
+                        .format(pck.name[0]))
+            except BaseException as o:
+                ml.load_fail = True
+                if ml.verbose:
+                    sys.stdout.write(
+                        '   {:4s} package load...failed\n   {!s}\n'
+                        .format(item.filetype, o))
+                pck = None
+        return pck
+
+    @staticmethod
+    def _load_registered_package(ml, item, ext_unit_dict, forgive=True):
+        """
+        Load a package registered for lazy loading and remove output
+        files and external units that are now owned by the package.
+
+        """
+        pck = Modflow._load_package(ml, item, ext_unit_dict, forgive)
+        for key in ml.pop_key_list:
+            if key in ext_unit_dict:
+                ml.remove_external(unit=key)
+                ext_unit_dict.pop(key)
+        return pck
@@ -213,16 +213,16 @@ class ModflowBas(Package):
         #f_bas.write('%s\n' % self.heading)
         f_bas.write('{0:s}\n'.format(self.heading))
         # Second line: format specifier
-        self.options = ''
+        options = ''
         if self.ixsec:
-            self.options += 'XSECTION'
+            options += 'XSECTION'
         if self.ichflg:
-            self.options += ' CHTOCH'
+            options += ' CHTOCH'
         if self.ifrefm:
-            self.options += ' FREE'
+            options += ' FREE'
         if self.stoper is not None:
-            self.options += ' STOPERROR {0}'.format(self.stoper)
-        f_bas.write('{0:s}\n'.format(self.options))
+            options += ' STOPERROR {0}'.format(self.stoper)
+        f_bas.write('{0:s}\n'.format(options))
         # IBOUND array
         f_bas.write(self.ibound.get_file_entry())
         # Head in inactive cells
@@ -8,6 +8,7 @@ from numpy.lib import recfunctions
 from ..pakbase import Package
 from ..utils import MfList
 from ..utils.flopy_io import line_parse
+from ..utils.routing import SegmentRouting
 
 
 class ModflowSfr2(Package):
@@ -169,8 +170,9 @@ class ModflowSfr2(Package):
     outsegs : dictionary of arrays
         Each array is of shape nss rows x maximum of nss columns. The first column contains the SFR segments,
         the second column contains the outsegs of those segments; the third column the outsegs of the outsegs,
-        and so on, until all outlets have been encountered, or nss is reached. The latter case indicates
-        circular routing. This attribute is created by the get_outlets() method.
+        and so on, until all outlets have been encountered. Segments in circular routing repeat until each
+        circle is complete. This attribute is created from the routing traced by the get_outlets() method;
+        the arrays are created each time the attribute is accessed.
 
     Methods
     -------
@@ -367,7 +369,7 @@ class ModflowSfr2(Package):
         self.dataset_5 = dataset_5
 
         # Attributes not included in SFR package input
-        self.outsegs = {}  # dictionary of arrays; see Attributes section of documentation
+        self._routing = {}  # routing by stress period; outsegs are created from this on request
         self.outlets = {}  # nested dictionary of format {per: {segment: outlet}}
         # -input format checks:
         assert isfropt in [0, 1, 2, 3, 4, 5]
@@ -694,6 +696,28 @@ class ModflowSfr2(Package):
             # f.close()
         return chk
 
+    @property
+    def outsegs(self):
+        return {per: routing.get_outseg_sequences()
+                for per, routing in self._routing.items()}
+
+    def get_routing(self, per=0):
+        """Returns the routing connections between segments.
+
+        Parameters
+        ----------
+        per : int
+            Stress period for which to get the routing (default 0)
+
+        Returns
+        -------
+        routing : flopy.utils.routing.SegmentRouting
+            Graph of the segments, with methods to list outlets, upstream and downstream
+            segments, circular routing, and the topological order of the segments.
+        """
+        segment_data = self.segment_data[per]
+        return SegmentRouting(segment_data.nseg, segment_data.outseg)
+
     def get_outlets(self, level=0, verbose=True):
         """Traces all routing connections from each headwater to the outlet.
         """
@@ -701,71 +725,29 @@ class ModflowSfr2(Package):
         for per in range(self.nper):
             if per > 0 > self.dataset_5[per][0]:  # skip stress periods where seg data not defined
                 continue
-            segments = self.segment_data[per].nseg
-            outsegs = self.segment_data[per].outseg
-            all_outsegs = np.vstack([segments, outsegs])
-            max_outseg = all_outsegs[-1].max()
-            knt = 1
-            while max_outseg > 0:
-
-                nextlevel = np.array([outsegs[s - 1] if s > 0 and s < 999999 else 0
-                                      for s in all_outsegs[-1]])
-
-                all_outsegs = np.vstack([all_outsegs, nextlevel])
-                max_outseg = nextlevel.max()
-                if max_outseg == 0:
-                    break
-                knt += 1
-                if knt > self.nss:
-                    # subset outsegs map to only include rows with outseg number > 0 in last column
-                    circular_segs = all_outsegs.T[all_outsegs[-1] > 0]
-
-                    # only retain one instance of each outseg number at iteration=nss
-                    vals = []  # append outseg values to vals after they've appeared once
-                    mask = [(True, vals.append(v))[0]
-                            if v not in vals
-                            else False for v in circular_segs[-1]]
-                    circular_segs = circular_segs[:, np.array(mask)]
-
-                    # cull the circular segments array to remove duplicate instances of routing circles
-                    circles = []
-                    duplicates = []
-                    for i in range(np.shape(circular_segs)[0]):
-                        # find where values in the row equal the last value;
-                        # record the index of the second to last instance of last value
-                        repeat_start_ind = np.where(circular_segs[i] == circular_segs[i, -1])[0][-2:][0]
-                        # use that index to slice out the repeated segment sequence
-                        circular_seq = circular_segs[i, repeat_start_ind:].tolist()
-                        # keep track of unique sequences of repeated segments
-                        if set(circular_seq) not in circles:
-                            circles.append(set(circular_seq))
-                            duplicates.append(False)
-                        else:
-                            duplicates.append(True)
-                    circular_segs = circular_segs[~np.array(duplicates), :]
-
-                    txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
-                        .format(len(circular_segs), self.nss)
-                    if level == 1:
-                        txt += '\n'.join([' '.join(map(str, row)) for row in circular_segs]) + '\n'
-                    else:
-                        f = 'circular_routing.csv'
-                        np.savetxt(f, circular_segs, fmt='%d', delimiter=',', header=txt)
-                        txt += 'See {} for details.'.format(f)
-                    if verbose:
-                        print(txt)
-                    break
-
-            # the array of segment sequence is useful for other other operations,
+            routing = self.get_routing(per)
+            if routing.has_cycles:
+                circles = [c + c[:1] for c in routing.cycles]
+                txt += '{0} instances of circular routing found!\n'.format(len(circles))
+                if level == 1:
+                    txt += '\n'.join([' '.join(map(str, c)) for c in circles]) + '\n'
+                else:
+                    f = 'circular_routing.csv'
+                    with open(f, 'w') as output:
+                        output.write('# {}'.format(txt))
+                        output.write('\n'.join([','.join(map(str, c)) for c in circles]) + '\n')
+                    txt += 'See {} for details.'.format(f)
+                if verbose:
+                    print(txt)
+
+            # the array of segment sequence (outsegs) is useful for other other operations,
             # such as plotting elevation profiles
-            self.outsegs[per] = all_outsegs
+            self._routing[per] = routing
 
             # create a dictionary listing outlets associated with each segment
-            # outlet is the last value in each row of outseg array that is != 0 or 999999
-            self.outlets[per] = {i + 1: r[(r != 0) & (r != 999999)][-1]
-            if len(r[(r != 0) & (r != 999999)]) > 0
-            else i + 1
-                                 for i, r in enumerate(all_outsegs.T)}
+            # outlet is the last segment in the routing, or the outseg number of that segment if it
+            # is not 0 or 999999 (a lake); segments in circular routing have an outlet of 0
+            self.outlets[per] = routing.get_outlets()
         return txt
 
     def get_outreaches(self):
@@ -776,32 +758,32 @@ class ModflowSfr2(Package):
         reach_data = self.reach_data
         segment_data = self.segment_data[0]
         # this vectorized approach is more than an order of magnitude faster than a list comprehension
-        first_reaches = reach_data[reach_data.ireach == 1]
-        last_reaches = np.append((np.diff(reach_data.iseg) == 1), True)
-        reach_data.outreach = np.append(reach_data.reachID[1:], 0)
+        first, last = _get_segment_offsets(reach_data.iseg)
+        last_reaches = np.arange(len(reach_data)) == last
+        outreach = np.append(reach_data.reachID[1:], 0)
+        # outseg of the segment of each last reach;
         # for now, treat lakes (negative outseg number) the same as outlets
-        reach_data.outreach[last_reaches] = [first_reaches.reachID[s] if s > 0
-                                             else 0
-                                             for s in segment_data.outseg - 1]
-        self.reach_data['outreach'] = reach_data.outreach
+        outseg = _lookup(segment_data.nseg, segment_data.outseg, reach_data.iseg[last_reaches])
+        # reachID of the first reach in each outseg
+        first_reaches = reach_data[first == np.arange(len(reach_data))]
+        outreach[last_reaches] = _lookup(first_reaches.iseg, first_reaches.reachID, outseg)
+        self.reach_data['outreach'] = outreach
 
     def get_slopes(self):
         """Compute slopes by reach using values in strtop (streambed top) and rchlen (reach length)
         columns of reach_data. The slope for a reach n is computed as strtop(n+1) - strtop(n) / rchlen(n).
         Slopes for outlet reaches are assumed to be equal to slope of previous reach. """
         slopes = np.append(np.diff(self.reach_data.strtop), 0) / self.reach_data.rchlen
-        last_reaches = np.append((np.diff(self.reach_data.iseg) == 1), True)
+        last_reaches = np.where(np.append((np.diff(self.reach_data.iseg) == 1), True))[0]
         last_reach_data = self.reach_data[last_reaches]
-        last_reaches_outreach_elevs = [self.reach_data.strtop[o - 1] if o != 0 else 0
-                                       for o in last_reach_data.outreach]
-        second_to_last_reaches = np.append(last_reaches[1:], False)
+        outreach = last_reach_data.outreach
+        last_reaches_outreach_elevs = np.where(outreach != 0, self.reach_data.strtop[outreach - 1], 0)
+        second_to_last_reaches = np.maximum(last_reaches - 1, 0)
         # compute slopes for last reaches
-        slopes[last_reaches] = [slopes[second_to_last_reaches][i]
-                                if last_reaches_outreach_elevs[i] == 0
-                                else
-                                (last_reaches_outreach_elevs[i] - last_reach_data.strtop[i])
-                                / last_reach_data.rchlen[i]
-                                for i in range(len(last_reach_data))]
+        slopes[last_reaches] = np.where(last_reaches_outreach_elevs == 0,
+                                        slopes[second_to_last_reaches],
+                                        (last_reaches_outreach_elevs - last_reach_data.strtop)
+                                        / last_reach_data.rchlen)
         self.reach_data['slope'] = slopes * -1  # convert from numpy to sfr package convention
 
     def get_upsegs(self):
@@ -815,41 +797,17 @@ class ModflowSfr2(Package):
 
         Notes
         -----
-        This method will not work if there are instances of circular routing.
+        Keys include outseg numbers that are not segments (such as 999999), with the
+        segments that route to them. For segments in circular routing, upsegs include
+        the other segments in the circle and the segment itself.
 
         """
         all_upsegs = {}
         for per in range(self.nper):
             if per > 0 > self.dataset_5[per][0]:  # skip stress periods where seg data not defined
                 continue
-            segment_data = self.segment_data[per]
-
-            # make a list of adjacent upsegments keyed to outseg list in Mat2
-            upsegs = {o: segment_data.nseg[segment_data.outseg == o].tolist()
-                      for o in np.unique(segment_data.outseg)}
-
-            outsegs = [k for k in list(upsegs.keys()) if k > 0]  # exclude 0, which is the outlet designator
-
-            # for each outseg key, for each upseg, check for more upsegs, append until headwaters has been reached
-            for outseg in outsegs:
-
-                up = True
-                upsegslist = upsegs[outseg]
-                while up:
-                    added_upsegs = []
-                    for us in upsegslist:
-                        if us in outsegs:
-                            added_upsegs += upsegs[us]
-                    if len(added_upsegs) == 0:
-                        up = False
-                        break
-                    else:
-                        upsegslist = added_upsegs
-                        upsegs[outseg] += added_upsegs
-
-            # the above algorithm is recursive, so lower order streams get duplicated many times
-            # use a set to get unique upsegs
-            all_upsegs[per] = {u: list(set(upsegs[u])) for u in outsegs}
+            upsegs = self.get_routing(per).get_all_upstream()
+            all_upsegs[per] = {u: v.tolist() for u, v in upsegs.items()}
         return all_upsegs
 
     def renumber_segments(self):
@@ -859,38 +817,28 @@ class ModflowSfr2(Package):
         """
 
         # get renumbering info from per=0
-        nseg = self.segment_data[0].nseg
-        outseg = self.segment_data[0].outseg
-
-        def reassign_upsegs(r, nexts, upsegs):
-            nextupsegs = []
-            for u in upsegs:
-                r[u] = nexts if u > 0 else u # handle lakes
-                nexts -= 1
-                nextupsegs += list(nseg[outseg == u])
-            return r, nexts, nextupsegs
-
-        ns = len(nseg)
-
-        nexts = ns
-        r = {0: 0}
-        nextupsegs = nseg[outseg == 0]
-        for i in range(ns):
-            r, nexts, nextupsegs = reassign_upsegs(r, nexts, nextupsegs)
-            if len(nextupsegs) == 0:
-                break
+        r = self.get_routing(0).get_renumbering()
+        old = np.array(sorted(r.keys()))
+        new = np.array([r[s] for s in old])
+
+        def renumber(segments):
+            segments = np.asarray(segments)
+            pos = np.clip(np.searchsorted(old, segments), 0, len(old) - 1)
+            return np.where(old[pos] == segments, new[pos], segments)
 
         # renumber segments in all stress period data
         for per in self.segment_data.keys():
-            self.segment_data[per]['nseg'] = [r.get(s, s) for s in self.segment_data[per].nseg]
-            self.segment_data[per]['outseg'] = [r.get(s, s) for s in self.segment_data[per].outseg]
+            self.segment_data[per]['nseg'] = renumber(self.segment_data[per].nseg)
+            self.segment_data[per]['outseg'] = renumber(self.segment_data[per].outseg)
             self.segment_data[per].sort(order='nseg')
-            inds = (outseg > 0) & (nseg > outseg)
+            nseg = self.segment_data[per].nseg
+            outseg = self.segment_data[per].outseg
+            inds = (outseg > 0) & (outseg < 999999) & (nseg > outseg)
             assert not np.any(inds)
             assert len(self.segment_data[per]['nseg']) == self.segment_data[per]['nseg'].max()
 
         # renumber segments in reach_data
-        self.reach_data['iseg'] = [r.get(s, s) for s in self.reach_data.iseg]
+        self.reach_data['iseg'] = renumber(self.reach_data.iseg)
         self.reach_data.sort(order=['iseg', 'ireach'])
 
         # renumber segments in other datasets
@@ -900,7 +848,7 @@ class ModflowSfr2(Package):
                 for k, v in d.items():
                     d2[k] = {}
                     for s, vv in v.items():
-                        d2[k][r[s]] = vv
+                        d2[k][r.get(s, s)] = vv
             else:
                 d2 = None
             return d2
@@ -922,9 +870,7 @@ class ModflowSfr2(Package):
         headwaters : np.ndarray (1-D)
             One dimmensional array listing all headwater segments.
         """
-        upsegs = [self.segment_data[per].nseg[self.segment_data[per].outseg == s].tolist()
-                  for s in self.segment_data[0].nseg]
-        return self.segment_data[per].nseg[np.array([i for i, u in enumerate(upsegs) if len(u) == 0])]
+        return self.get_routing(per).get_headwaters()
 
     def _interpolate_to_reaches(self, segvar1, segvar2, per=0):
         """Interpolate values in datasets 6b and 6c to each reach in stream segment
@@ -956,25 +902,34 @@ class ModflowSfr2(Package):
         segment_data = self.segment_data[per]
         segment_data.sort(order='nseg')
         reach_data.sort(order=['iseg', 'ireach'])
-        reach_values = []
-        for seg in segment_data.nseg:
-            reaches = reach_data[reach_data.iseg == seg]
-            dist = np.cumsum(reaches.rchlen) - 0.5 * reaches.rchlen
-            icalc = segment_data.icalc[segment_data.nseg == seg]
-            if 'width' in segvar1 and icalc == 2:  # get width from channel cross section length
-                channel_geometry_data = self.channel_geometry_data[per]
-                reach_values += list(np.ones(len(reaches)) * channel_geometry_data[seg][0][-1])
-            elif 'width' in segvar1 and icalc == 3:  # assign arbitrary width since width is based on flow
-                reach_values += list(np.ones(len(reaches)) * 5)
-            elif 'width' in segvar1 and icalc == 4:  # assume width to be mean from streamflow width/flow table
-                channel_flow_data = self.channel_flow_data[per]
-                reach_values += list(np.ones(len(reaches)) * np.mean(channel_flow_data[seg][2]))
-            else:
-                fp = [segment_data[segment_data['nseg'] == seg][segvar1][0],
-                      segment_data[segment_data['nseg'] == seg][segvar2][0]]
-                xp = [dist[0], dist[-1]]
-                reach_values += np.interp(dist, xp, fp).tolist()
-        return np.array(reach_values)
+        reach_data = reach_data[np.in1d(reach_data.iseg, segment_data.nseg)]
+
+        # distance of each reach midpoint from the start of its segment
+        first, last = _get_segment_offsets(reach_data.iseg)
+        rchlen = reach_data.rchlen.astype(np.float64)
+        cumlen = np.cumsum(rchlen)
+        dist = cumlen - (cumlen[first] - rchlen[first]) - 0.5 * rchlen
+
+        # linear interpolation between the midpoints of the first and last reaches
+        seg = np.searchsorted(segment_data.nseg, reach_data.iseg)
+        fp1 = segment_data[segvar1][seg]
+        fp2 = segment_data[segvar2][seg]
+        xp1, xp2 = dist[first], dist[last]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reach_values = fp1 + (fp2 - fp1) / (xp2 - xp1) * (dist - xp1)
+        reach_values[dist >= xp2] = fp2[dist >= xp2]
+
+        if 'width' in segvar1:
+            icalc = segment_data.icalc
+            widths = np.zeros(len(segment_data))
+            for i in np.where(icalc == 2)[0]:  # get width from channel cross section length
+                widths[i] = self.channel_geometry_data[per][segment_data.nseg[i]][0][-1]
+            widths[icalc == 3] = 5  # assign arbitrary width since width is based on flow
+            for i in np.where(icalc == 4)[0]:  # assume width to be mean from streamflow width/flow table
+                widths[i] = np.mean(self.channel_flow_data[per][segment_data.nseg[i]][2])
+            has_width = np.in1d(icalc[seg], [2, 3, 4])
+            reach_values[has_width] = widths[seg][has_width]
+        return reach_values
 
     def _write_1c(self, f_sfr):
 
@@ -1309,20 +1264,16 @@ class check:
         txt = ''
         array = array.copy()
         if isinstance(col1, np.ndarray):
-            array = recfunctions.append_fields(array, names='tmp1', data=col1,
-                                               asrecarray=True)
+            array = _append_fields(array, names='tmp1', data=col1)
             col1 = 'tmp1'
         if isinstance(col2, np.ndarray):
-            array = recfunctions.append_fields(array, names='tmp2', data=col2,
-                                               asrecarray=True)
+            array = _append_fields(array, names='tmp2', data=col2)
             col2 = 'tmp2'
         if isinstance(col1, tuple):
-            array = recfunctions.append_fields(array, names=col1[0], data=col1[1],
-                                               asrecarray=True)
+            array = _append_fields(array, names=col1[0], data=col1[1])
             col1 = col1[0]
         if isinstance(col2, tuple):
-            array = recfunctions.append_fields(array, names=col2[0], data=col2[1],
-                                               asrecarray=True)
+            array = _append_fields(array, names=col2[0], data=col2[1])
             col2 = col2[0]
 
         failed = array[col1] > array[col2]
@@ -1336,10 +1287,9 @@ class check:
                         and 'tmp' not in c]
                 # currently failed_info[cols] results in a warning. Not sure
                 # how to do this properly with a recarray.
-                failed_info = recfunctions.append_fields(failed_info[cols].copy(),
-                                                         names='diff',
-                                                         data=diff,
-                                                         asrecarray=True)
+                failed_info = _append_fields(failed_info[cols].copy(),
+                                             names='diff',
+                                             data=diff)
                 failed_info.sort(order='diff', axis=0)
                 if not sort_ascending:
                     failed_info = failed_info[::-1]
@@ -1381,8 +1331,13 @@ class check:
                                   level=self.level,
                                   datatype='segment')
 
-        # check reach numbering
-        for segment in np.arange(1, self.sfr.nss + 1):
+        # check reach numbering; only list segments where reaches are not numbered 1, 2, 3...
+        order = np.argsort(self.reach_data.iseg, kind='mergesort')
+        iseg = self.reach_data.iseg[order]
+        ireach = self.reach_data.ireach[order]
+        first = np.searchsorted(iseg, iseg)
+        invalid = np.unique(iseg[ireach != np.arange(len(iseg)) - first + 1])
+        for segment in invalid[(invalid > 0) & (invalid <= self.sfr.nss)]:
             reaches = self.reach_data.ireach[self.reach_data.iseg == segment]
             t = _check_numbers(len(reaches),
                                reaches,
@@ -1413,7 +1368,7 @@ class check:
                     for ns, os in decreases:
                         t += '{} {} {}\n'.format(per, ns, os)
                     txt += t#'\n'.join(textwrap.wrap(t, width=10))
-        if len(t) == 0:
+        if len(txt) == 0:
                 passed = True
         self._txt_footer(headertxt, txt, 'segment numbering order', passed)
 
@@ -1426,6 +1381,19 @@ class check:
             print(headertxt.strip())
 
         txt += self.sfr.get_outlets(level=self.level, verbose=False)  # will print twice if verbose=True
+
+        # breaks in routing: outsegs that are not segments (lakes are < 0)
+        for per in range(self.sfr.nper):
+            if per > 0 > self.sfr.dataset_5[per][0]:  # skip stress periods where seg data not defined
+                continue
+            routing = self.sfr._routing[per]
+            broken = (routing.outseg > 0) & (routing.outseg < 999999) & (routing.downstream < 0)
+            if np.any(broken):
+                txt += '{} segments in stress period {} route to segments that do not exist:\n' \
+                    .format(broken.sum(), per)
+                if self.level == 1:
+                    txt += _print_rec_array(self.sfr.segment_data[per][['nseg', 'outseg']][broken],
+                                            delimiter='\t')
         self._txt_footer(headertxt, txt, 'circular routing', warning=False)
 
     def overlapping_conductance(self, tol=1e-6):
@@ -1441,11 +1409,9 @@ class check:
         # if no dis file was supplied, can't compute node numbers
         # make nodes based on unique row, col pairs
         if np.diff(reach_data.node).max() == 0:
-            uniquerc = {}
-            for i, (r, c) in enumerate(reach_data[['i', 'j']]):
-                if (r, c) not in uniquerc:
-                    uniquerc[(r, c)] = i + 1
-            reach_data['node'] = [uniquerc[(r, c)] for r, c in reach_data[['i', 'j']]]
+            rc = reach_data.i * (reach_data.j.max() + 1) + reach_data.j
+            rc, first, inverse = np.unique(rc, return_index=True, return_inverse=True)
+            reach_data['node'] = first[inverse] + 1
 
         K = reach_data.strhc1
         if K.max() == 0:
@@ -1459,18 +1425,18 @@ class check:
         # Calculate SFR conductance for each reach
         Cond = K * w * L / b
 
-        shared_cells = _get_duplicates(reach_data.node)
+        # minimum and maximum conductance of the collocated reaches in each cell
+        order = np.argsort(reach_data.node, kind='mergesort')
+        nodes = reach_data.node[order]
+        start = np.where(np.append(True, nodes[1:] != nodes[:-1]))[0]
+        count = np.diff(np.append(start, len(nodes)))
+        min_cond = np.minimum.reduceat(Cond[order], start)
+        max_cond = np.maximum.reduceat(Cond[order], start)
 
-        nodes_with_multiple_conductance = set()
-        for node in shared_cells:
-
-            # select the collocated reaches for this cell
-            conductances = Cond[reach_data.node == node].copy()
-            conductances.sort()
-
-            # list nodes with multiple non-zero SFR reach conductances
-            if conductances[0] / conductances[-1] > tol:
-                nodes_with_multiple_conductance.update({node})
+        # list nodes with multiple non-zero SFR reach conductances
+        with np.errstate(divide='ignore', invalid='ignore'):
+            multiple = (count > 1) & (min_cond / max_cond > tol)
+        nodes_with_multiple_conductance = nodes[start][multiple]
 
         if len(nodes_with_multiple_conductance) > 0:
             txt += '{} model cells with multiple non-zero SFR conductances found.\n' \
@@ -1485,13 +1451,10 @@ class check:
                 cols = [c for c in reach_data.dtype.names if c in \
                         ['node', 'k', 'i', 'j', 'iseg', 'ireach', 'rchlen', 'strthick', 'strhc1']]
 
-                reach_data = recfunctions.append_fields(reach_data,
-                                                        names=['width', 'conductance'],
-                                                        data=[w, Cond],
-                                                        usemask=False,
-                                                        asrecarray=True)
-                has_multiple = np.array([True if n in nodes_with_multiple_conductance
-                                         else False for n in reach_data.node])
+                reach_data = _append_fields(reach_data,
+                                            names=['width', 'conductance'],
+                                            data=[w, Cond])
+                has_multiple = np.in1d(reach_data.node, nodes_with_multiple_conductance)
                 reach_data = reach_data[has_multiple].copy()
                 reach_data = reach_data[cols].copy()
                 txt += _print_rec_array(reach_data, delimiter='\t')
@@ -1522,8 +1485,7 @@ class check:
 
                 # first check for segments where elevdn > elevup
                 d_elev = segment_data.elevdn - segment_data.elevup
-                segment_data = recfunctions.append_fields(segment_data, names='d_elev', data=d_elev,
-                                                          asrecarray=True)
+                segment_data = _append_fields(segment_data, names='d_elev', data=d_elev)
                 txt += self._boolean_compare(segment_data[['nseg', 'outseg', 'elevup', 'elevdn',
                                                            'd_elev']].copy(),
                                              col1='d_elev', col2=np.zeros(len(segment_data)),
@@ -1535,12 +1497,11 @@ class check:
                 # next check for rises between segments
                 non_outlets = segment_data.outseg > 0
                 non_outlets_seg_data = segment_data[non_outlets]  # lake outsegs are < 0
-                outseg_elevup = np.array([segment_data.elevup[o - 1] for o in segment_data.outseg if o > 0])
+                outseg_elevup = segment_data.elevup[segment_data.outseg[non_outlets] - 1]
                 d_elev2 = outseg_elevup - segment_data.elevdn[non_outlets]
-                non_outlets_seg_data = recfunctions.append_fields(non_outlets_seg_data,
-                                                                  names=['outseg_elevup', 'd_elev2'],
-                                                                  data=[outseg_elevup, d_elev2],
-                                                                  asrecarray=True)
+                non_outlets_seg_data = _append_fields(non_outlets_seg_data,
+                                                      names=['outseg_elevup', 'd_elev2'],
+                                                      data=[outseg_elevup, d_elev2])
 
                 txt += self._boolean_compare(non_outlets_seg_data[['nseg', 'outseg', 'elevdn',
                                                                    'outseg_elevup', 'd_elev2']].copy(),
@@ -1575,12 +1536,11 @@ class check:
 
             # use outreach values to get downstream elevations
             non_outlets = reach_data[reach_data.outreach != 0]
-            outreach_elevdn = np.array([reach_data.strtop[o - 1] for o in reach_data.outreach])
-            d_strtop = outreach_elevdn[reach_data.outreach != 0] - non_outlets.strtop
-            non_outlets = recfunctions.append_fields(non_outlets,
-                                                     names=['strtopdn', 'd_strtop'],
-                                                     data=[outreach_elevdn, d_strtop],
-                                                     asrecarray=True)
+            outreach_elevdn = reach_data.strtop[non_outlets.outreach - 1]
+            d_strtop = outreach_elevdn - non_outlets.strtop
+            non_outlets = _append_fields(non_outlets,
+                                         names=['strtopdn', 'd_strtop'],
+                                         data=[outreach_elevdn, d_strtop])
 
             txt += self._boolean_compare(non_outlets[['k', 'i', 'j', 'iseg', 'ireach',
                                                       'strtop', 'strtopdn', 'd_strtop', 'reachID']].copy(),
@@ -1614,10 +1574,9 @@ class check:
             # check streambed bottoms in relation to respective cell bottoms
             bots = self.sfr.parent.dis.botm.array[k, i, j]
             streambed_bots = reach_data.strtop - reach_data.strthick
-            reach_data = recfunctions.append_fields(reach_data,
-                                                    names=['layerbot', 'strbot'],
-                                                    data=[bots, streambed_bots],
-                                                    asrecarray=True)
+            reach_data = _append_fields(reach_data,
+                                        names=['layerbot', 'strbot'],
+                                        data=[bots, streambed_bots])
 
             txt += self._boolean_compare(reach_data[['k', 'i', 'j', 'iseg', 'ireach',
                                                      'strtop', 'strthick', 'strbot', 'layerbot',
@@ -1630,7 +1589,7 @@ class check:
                 warning = False # this constitutes an error (MODFLOW won't run)
             # check streambed elevations in relation to model top
             tops = self.sfr.parent.dis.top.array[i, j]
-            reach_data = recfunctions.append_fields(reach_data, names='modeltop', data=tops, asrecarray=True)
+            reach_data = _append_fields(reach_data, names='modeltop', data=tops)
 
             txt += self._boolean_compare(reach_data[['k', 'i', 'j', 'iseg', 'ireach',
                                                      'strtop', 'modeltop', 'strhc1', 'reachID']].copy(),
@@ -1675,10 +1634,9 @@ class check:
             i, j = segment_ends.i, segment_ends.j
             tops = self.sfr.parent.dis.top.array[i, j]
             diff = tops - segment_ends.strtop
-            segment_ends = recfunctions.append_fields(segment_ends,
-                                                      names=['modeltop', 'diff'],
-                                                      data=[tops, diff],
-                                                      asrecarray=True)
+            segment_ends = _append_fields(segment_ends,
+                                          names=['modeltop', 'diff'],
+                                          data=[tops, diff])
 
             txt += self._boolean_compare(segment_ends[['k', 'i', 'j', 'iseg',
                                                        'strtop', 'modeltop', 'diff', 'reachID']].copy(),
@@ -1818,13 +1776,46 @@ def _get_dataset(line, dataset):
     return dataset
 
 
-def _get_duplicates(a):
-    """Returns duplcate values in an array, similar to pandas .duplicated() method
-    http://stackoverflow.com/questions/11528078/determining-duplicate-values-in-an-array
+def _append_fields(array, names, data):
+    """Append fields to a record array; faster alternative to
+    numpy.lib.recfunctions.append_fields for large arrays without masks.
+    """
+    if isinstance(names, str):
+        names, data = [names], [data]
+    data = [np.asarray(d) for d in data]
+    dtype = [(n, array.dtype[n]) for n in array.dtype.names] + \
+            [(n, d.dtype) for n, d in zip(names, data)]
+    appended = np.empty(len(array), dtype=dtype).view(np.recarray)
+    for n in array.dtype.names:
+        appended[n] = array[n]
+    for n, d in zip(names, data):
+        appended[n] = d
+    return appended
+
+
+def _get_segment_offsets(iseg):
+    """Returns the index of the first and last reach in the segment of each reach,
+    for reaches sorted by segment.
+    """
+    n = len(iseg)
+    new_segment = np.append(True, iseg[1:] != iseg[:-1])
+    first = np.maximum.accumulate(np.where(new_segment, np.arange(n), 0))
+    last_in_segment = np.append(new_segment[1:], True)
+    last = np.minimum.accumulate(np.where(last_in_segment, np.arange(n), n)[::-1])[::-1]
+    return first, last
+
+
+def _lookup(keys, values, items, default=0):
+    """Returns the values for items in an array of unique keys, or default where an item
+    is not a key.
     """
-    s = np.sort(a, axis=None)
-    equal_to_previous_item = np.append(s[1:] == s[:-1], False)  # maintain same dimmension for boolean array
-    return np.unique(s[equal_to_previous_item])
+    items = np.asarray(items)
+    if len(keys) == 0:
+        return np.full(items.shape, default, dtype=np.asarray(values).dtype)
+    order = np.argsort(keys)
+    pos = np.clip(np.searchsorted(keys, items, sorter=order), 0, len(keys) - 1)
+    found = keys[order][pos] == items
+    return np.where(found, values[order][pos], default)
 
 
 def _get_item2_names(nstrm, reachinput, isfropt, structured=False):
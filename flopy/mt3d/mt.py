@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 import numpy as np
 from ..mbase import BaseModel
@@ -17,6 +18,38 @@ from .mtsft import Mt3dSft
 from .mtlkt import Mt3dLkt
 
 
+def _read_values(data, nval, nlines=1, fname=None):
+    """
+    Read records of nval numbers each, that span nlines lines, from a
+    string. Incomplete records at the end of the string are ignored.
+
+    Returns
+    -------
+    a : numpy.ndarray
+        Array of shape (nrec, nval)
+
+    """
+    nrec = len([l for l in data.splitlines() if l.strip()]) // max(nlines, 1)
+    # Fortran drops the E in numbers with three digit exponents, and double
+    # precision numbers can have a D exponent
+    data = re.sub(r'(?<=[0-9.])[dD](?=[+-]?[0-9])', 'E', data)
+    data = re.sub(r'(?<=[0-9.])([+-][0-9]{3})(?![0-9])', r'E\1', data)
+    a = np.fromstring(data, dtype=float, sep=' ')
+    # np.fromstring stops without an error at text that it can not read,
+    # which leaves too few values unless the text is in the last value, so
+    # the last value is converted again to check it
+    for value in data.rsplit(None, 1)[-1:]:
+        try:
+            float(value)
+        except ValueError:
+            a = a[:0]
+    if a.size < nrec * nval:
+        msg = 'Could not read the values in {}'.format(fname)
+        raise ValueError(msg)
+    nrec = a.size // nval
+    return a[:nrec * nval].reshape(nrec, nval)
+
+
 class Mt3dList(Package):
     """
     List package class
@@ -684,7 +717,13 @@ class Mt3dms(BaseModel):
                  ('fluid_storage', float),
                  ('total_mass', float), ('error_in-out', float),
                  ('error_alt', float)]
-        r = np.loadtxt(fname, skiprows=2, dtype=dtype)
+        with open(fname, 'r') as f:
+            for i in range(2):
+                f.readline()
+            a = _read_values(f.read(), len(dtype), fname=fname)
+        r = np.empty(a.shape[0], dtype=dtype)
+        for i, name in enumerate(r.dtype.names):
+            r[name] = a[:, i]
         r = r.view(np.recarray)
         return r
 
@@ -705,8 +744,9 @@ class Mt3dms(BaseModel):
         """
         firstline = 'STEP   TOTAL TIME             LOCATION OF OBSERVATION POINTS (K,I,J)'
         dtype = [('step', int), ('time', float)]
-        nobs = 0
         obs = []
+        # obs names already used, to make obs names unique
+        obsnames = set()
 
         if not os.path.isfile(fname):
             raise Exception('Could not find file: {}'.format(fname))
@@ -723,40 +763,27 @@ class Mt3dms(BaseModel):
             nlineperrec = 0
             while True:
                 line = f.readline()
-                if line[0:7].strip() == '1':
+                if not line or line[0:7].strip() == '1':
                     break
                 nlineperrec += 1
                 ll = line.strip().split()
-                while len(ll) > 0:
-                    k = int(ll.pop(0))
-                    i = int(ll.pop(0))
-                    j = int(ll.pop(0))
+                for n in range(0, len(ll), 3):
+                    k, i, j = [int(v) for v in ll[n:n + 3]]
                     obsnam = '({}, {}, {})'.format(k, i, j)
-                    if obsnam in obs:
+                    if obsnam in obsnames:
                         obsnam += str(len(obs) + 1)  # make obs name unique
                     obs.append(obsnam)
+                    obsnames.add(obsnam)
 
-            icount = 0
-            r = []
-            while True:
-                ll = []
-                for n in range(nlineperrec):
-                    icount += 1
-                    if icount > 1:
-                        line = f.readline()
-                    ll.extend(line.strip().split())
-
-                if not line:
-                    break
-
-                rec = [int(ll[0])]
-                for val in ll[1:]:
-                    rec.append(float(val))
-                r.append(tuple(rec))
+            # read the step, time and obs values of all records at once
+            a = _read_values(line + f.read(), len(obs) + 2,
+                             nlines=nlineperrec, fname=fname)
 
         # add obs names to dtype
         for nameob in obs:
             dtype.append((nameob, float))
-        r = np.array(r, dtype=dtype)
+        r = np.empty(a.shape[0], dtype=dtype)
+        for i, name in enumerate(r.dtype.names):
+            r[name] = a[:, i]
         r = r.view(np.recarray)
         return r
@@ -15,6 +15,8 @@ from numpy.lib.recfunctions import stack_arrays
 
 from .modflow.mfparbc import ModflowParBc as mfparbc
 from .utils import Util2d, Util3d, Transient2d, MfList, check
+from .utils.flopy_io import read_list_block
+from .utils.utils_def import get_content_hash
 
 
 class Package(object):
@@ -156,6 +158,16 @@ class Package(object):
 
         super(Package, self).__setattr__(key, value)
 
+    @property
+    def content_hash(self):
+        """
+        Hash of the package data. Used by BaseModel.write_input to skip
+        packages that have not changed since they were last written.
+
+        """
+        from .mbase import BaseModel
+        return get_content_hash(self, skip_types=(BaseModel,))
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.package_helper(f, self, **kwargs)
@@ -700,6 +712,9 @@ class Package(object):
         if nper is None:
             nrow, ncol, nlay, nper = model.get_nrow_ncol_nlay_nper()
 
+        dtype = pack_type.get_empty(0, aux_names=aux_names,
+                                    structured=model.structured).dtype
+
         # read data for every stress period
         bnd_output = None
         stress_period_data = {}
@@ -725,51 +740,44 @@ class Package(object):
                 current = pack_type.get_empty(itmp, aux_names=aux_names,
                                               structured=model.structured)
             elif itmp > 0:
-                current = pack_type.get_empty(itmp, aux_names=aux_names,
-                                              structured=model.structured)
-                for ibnd in range(itmp):
-                    line = f.readline()
-                    if "open/close" in line.lower():
-                        # need to strip out existing path seps and
-                        # replace current-system path seps
-                        raw = line.strip().split()
-                        fname = raw[1]
-                        if '/' in fname:
-                            raw = fname.split('/')
-                        elif '\\' in fname:
-                            raw = fname.split('\\')
-                        else:
-                            raw = [fname]
-                        fname = os.path.join(*raw)
-                        oc_filename = os.path.join(model.model_ws, fname)
-                        assert os.path.exists(
-                            oc_filename), "Package.load() error: open/close filename " + \
-                                          oc_filename + " not found"
-                        try:
-                            current = np.genfromtxt(oc_filename,
-                                                    dtype=current.dtype)
-                            current = current.view(np.recarray)
-                        except Exception as e:
-                            raise Exception(
-                                "Package.load() error loading open/close file " + oc_filename + \
-                                " :" + str(e))
-                        assert current.shape[
-                                   0] == itmp, "Package.load() error: open/close rec array from file " + \
-                                               oc_filename + " shape (" + str(
-                            current.shape) + \
-                                               ") does not match itmp: {0:d}".format(
-                                                   itmp)
-                        break
+                line = f.readline()
+                if "open/close" in line.lower():
+                    # need to strip out existing path seps and
+                    # replace current-system path seps
+                    raw = line.strip().split()
+                    fname = raw[1]
+                    if '/' in fname:
+                        raw = fname.split('/')
+                    elif '\\' in fname:
+                        raw = fname.split('\\')
+                    else:
+                        raw = [fname]
+                    fname = os.path.join(*raw)
+                    oc_filename = os.path.join(model.model_ws, fname)
+                    assert os.path.exists(
+                        oc_filename), "Package.load() error: open/close filename " + \
+                                      oc_filename + " not found"
                     try:
-                        t = line.strip().split()
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
-                    except:
-                        t = []
-                        for ivar in range(len(current.dtype.names)):
-                            istart = ivar * 10
-                            istop = istart + 10
-                            t.append(line[istart:istop])
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
+                        current = np.genfromtxt(oc_filename,
+                                                dtype=dtype)
+                        current = current.view(np.recarray)
+                    except Exception as e:
+                        raise Exception(
+                            "Package.load() error loading open/close file " + oc_filename + \
+                            " :" + str(e))
+                    assert current.shape[
+                               0] == itmp, "Package.load() error: open/close rec array from file " + \
+                                           oc_filename + " shape (" + str(
+                        current.shape) + \
+                                           ") does not match itmp: {0:d}".format(
+                                               itmp)
+                else:
+                    # read the itmp records as a block and convert them
+                    # in one pass
+                    lines = [line]
+                    for ibnd in range(1, itmp):
+                        lines.append(f.readline())
+                    current = read_list_block(lines, dtype)
 
                 # convert indices to zero-based
                 if model.structured:
@@ -778,9 +786,10 @@ class Package(object):
                     current['j'] -= 1
                 else:
                     current['node'] -= 1
-                bnd_output = np.recarray.copy(current)
+                bnd_output = current
             else:
-                bnd_output = np.recarray.copy(current)
+                # reuse the data from the last stress period
+                bnd_output = current
 
             for iparm in range(itmpp):
                 line = f.readline()
@@ -837,9 +846,6 @@ class Package(object):
             else:
                 stress_period_data[iper] = bnd_output
 
-        dtype = pack_type.get_empty(0, aux_names=aux_names,
-                                    structured=model.structured).dtype
-
         # set package unit number
         unitnumber = None
         filenames = [None, None]
@@ -166,44 +166,20 @@ class ModelCrossSection(object):
         self.layer0 = 0
         self.layer1 = self.dis.nlay + self.ncb + 1
         
-        zpts = []
-        for k in range(self.layer0, self.layer1):
-            zpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   self.elev[k, :, :]))
-        self.zpts = np.array(zpts)
-        
-        xcentergrid = []
-        zcentergrid = []
-        nz = 0
+        self.zpts = self._cell_values(self.elev[self.layer0:self.layer1])
+
+        # each cell along the cross-section has two points, where the line
+        # enters and leaves the cell
+        nx = self.xpts.shape[0] // 2
+        xcenter = 0.5 * (self.d[0:2 * nx:2] + self.d[1:2 * nx:2])
         if self.dis.nlay == 1:
-            for k in range(0, self.zpts.shape[0]):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    try:
-                        xp = 0.5 * (self.xpts[i][2] + self.xpts[i+1][2])
-                        zp = self.zpts[k, i]
-                        xcentergrid.append(xp)
-                        zcentergrid.append(zp)
-                        nx += 1
-                    except:
-                        break
+            zcentergrid = self.zpts[:, 0:2 * nx:2]
         else:
-            for k in range(0, self.zpts.shape[0]-1):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    try:
-                        xp = 0.5 * (self.xpts[i][2] + self.xpts[i+1][2])
-                        zp = 0.5 * (self.zpts[k, i] + self.zpts[k+1, i+1])
-                        xcentergrid.append(xp)
-                        zcentergrid.append(zp)
-                        nx += 1
-                    except:
-                        break
-        self.xcentergrid = np.array(xcentergrid).reshape((nz, nx))
-        self.zcentergrid = np.array(zcentergrid).reshape((nz, nx))
+            zcentergrid = 0.5 * (self.zpts[:-1, 0:2 * nx:2] +
+                                 self.zpts[1:, 1:2 * nx:2])
+        self.xcentergrid = np.repeat(xcenter[np.newaxis, :],
+                                     zcentergrid.shape[0], axis=0)
+        self.zcentergrid = zcentergrid
         
         # Create cross-section extent
         if extent is None:
@@ -244,18 +220,7 @@ class ModelCrossSection(object):
         else:
             ax = self.ax
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   a[k, :, :]))
-            if self.laycbd[k] > 0:
-                ta = np.empty((self.dis.nrow, self.dis.ncol), dtype=np.float)
-                ta[:, :] = -1e9
-                vpts.append(plotutil.cell_value_points(self.xpts,
-                                                       self.sr.xedge,
-                                                       self.sr.yedge, ta))
-        vpts = np.array(vpts)
+        vpts = self._layer_values(a, -1e9)
         if masked_values is not None:
             for mval in masked_values:
                 vpts = np.ma.masked_equal(vpts, mval)
@@ -301,7 +266,6 @@ class ModelCrossSection(object):
 
         plotarray = a
 
-        vpts = []
         if len(plotarray.shape) == 2:
             nlay = 1
             plotarray = np.reshape(plotarray, (1, plotarray.shape[0], plotarray.shape[1]))
@@ -309,12 +273,8 @@ class ModelCrossSection(object):
             nlay = plotarray.shape[0]
         else:
             raise Exception('plot_array array must be a 2D or 3D array')
-        for k in range(nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   plotarray[k, :, :]))
-        vpts = np.array(vpts)
-        
+        vpts = self._cell_values(plotarray)
+
         if masked_values is not None:
             for mval in masked_values:
                 vpts = np.ma.masked_equal(vpts, mval)
@@ -355,19 +315,7 @@ class ModelCrossSection(object):
 
         plotarray = a
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            #print('k', k, self.laycbd[k])
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   plotarray[k, :, :]))
-            if self.laycbd[k] > 0:
-                ta = np.empty((self.dis.nrow, self.dis.ncol), dtype=np.float)
-                ta[:, :] = self.dis.botm.array[k, :, :]
-                vpts.append(plotutil.cell_value_points(self.xpts,
-                                                       self.sr.xedge,
-                                                       self.sr.yedge, ta))
-
+        vpts = self._layer_values(plotarray, self.dis.botm.array)
         vpts = np.ma.array(vpts, mask=False)
 
         if isinstance(head, np.ndarray):
@@ -438,12 +386,7 @@ class ModelCrossSection(object):
         """
         plotarray = a
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   plotarray[k, :, :]))
-        vpts = np.array(vpts)
+        vpts = self._cell_values(plotarray[:self.dis.nlay])
         vpts = vpts[:, ::2]
         if self.dis.nlay == 1:
             vpts = np.vstack((vpts, vpts))
@@ -695,36 +638,20 @@ class ModelCrossSection(object):
             zcentergrid = self.zcentergrid
         
         if nlay == 1:
-            x = []
-            z = []
-            for k in range(nlay):
-                for i in range(self.xcentergrid.shape[1]):
-                    x.append(self.xcentergrid[k, i])
-                    z.append(0.5 * (zcentergrid[k, i] + zcentergrid[k+1, i]))
-            x = np.array(x).reshape((1, self.xcentergrid.shape[1]))
-            z = np.array(z).reshape((1, self.xcentergrid.shape[1]))
+            x = self.xcentergrid[0:1, :]
+            z = 0.5 * (zcentergrid[0:1, :] + zcentergrid[1:2, :])
         else:
-            x = self.xcentergrid
-            z = zcentergrid
-            
-        upts = []
-        u2pts = []
-        vpts = []
-        ibpts = []
-        for k in range(self.dis.nlay):
-            upts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, u[k, :, :]))
-            u2pts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                    self.sr.yedge, u2[k, :, :]))
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, v[k, :, :]))
-            ibpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                    self.sr.yedge, ib[k, :, :]))
-        # convert upts, u2pts, and vpts to numpy arrays
-        upts = np.array(upts)
-        u2pts = np.array(u2pts)
-        vpts = np.array(vpts)
-        ibpts = np.array(ibpts)
+            # cell centers of model layers (exclude confining beds)
+            layers = self.active == 1
+            x = self.xcentergrid[layers]
+            z = zcentergrid[layers]
+
+        # upts and vpts have a value for the left and right
+        # sides of a cell. Sample every other value for quiver
+        upts = self._cell_values(u)[:, ::2]
+        u2pts = self._cell_values(u2)[:, ::2]
+        vpts = self._cell_values(v)[:, ::2]
+        ibpts = self._cell_values(ib)[:, ::2]
 
         # Select correct slice and apply step
         x = x[::kstep, ::hstep]
@@ -745,18 +672,11 @@ class ModelCrossSection(object):
             u2pts[idx] /= vmag[idx]
             vpts[idx] /= vmag[idx]
 
-        # upts and vpts has a value for the left and right
-        # sides of a cell. Sample every other value for quiver
-        upts = upts[0, ::2]
-        vpts = vpts[0, ::2]
-        ibpts = ibpts[0, ::2]
-
         # mask discharge in inactive cells
         idx = (ibpts == 0)
         upts[idx] = np.nan
         vpts[idx] = np.nan
 
-
         # plot the vectors
         quiver = self.ax.quiver(x, z, upts, vpts, pivot=pivot, **kwargs)
 
@@ -783,9 +703,7 @@ class ModelCrossSection(object):
         patches : matplotlib.collections.PatchCollection
 
         """
-        from matplotlib.patches import Polygon
-        from matplotlib.collections import PatchCollection
-        rectcol = []
+        from matplotlib.collections import PolyCollection
 
         if 'vmin' in kwargs:
             vmin = kwargs.pop('vmin')
@@ -796,33 +714,17 @@ class ModelCrossSection(object):
         else:
             vmax = None
 
-        v = []
-        
-        colors = []
-        for k in range(zpts.shape[0]-1):
-            for idx in range(0, len(self.xpts)-1, 2):
-                try:
-                    ll = ((self.xpts[idx][2], zpts[k+1, idx]))
-                    try:
-                        dx = self.xpts[idx+2][2] - self.xpts[idx][2]
-                    except:
-                        dx = self.xpts[idx+1][2] - self.xpts[idx][2]
-                    dz = zpts[k, idx] - zpts[k+1, idx]
-                    pts = (ll, 
-                          (ll[0], ll[1]+dz), (ll[0]+dx, ll[1]+dz),
-                          (ll[0]+dx, ll[1])) #, ll) 
-                    if np.isnan(plotarray[k, idx]):
-                        continue
-                    if plotarray[k, idx] is np.ma.masked:
-                        continue
-                    rectcol.append(Polygon(pts, closed=True))
-                    colors.append(plotarray[k, idx])
-                except:
-                    pass
-
-        if len(rectcol) > 0:
-            patches = PatchCollection(rectcol, **kwargs)
-            patches.set_array(np.array(colors))
+        nlay = min(zpts.shape[0] - 1, plotarray.shape[0])
+        verts = self._get_cell_vertices(zpts[:nlay + 1])
+
+        # only include cells with unmasked values that are not nan
+        v = np.ma.getdata(plotarray)[:nlay, 0:2 * verts.shape[1]:2]
+        idx = ~np.ma.getmaskarray(plotarray)[:nlay, 0:2 * verts.shape[1]:2]
+        idx &= ~np.isnan(v.astype(np.float))
+
+        if np.any(idx):
+            patches = PolyCollection(verts[idx], closed=True, **kwargs)
+            patches.set_array(v[idx])
             patches.set_clim(vmin, vmax)
         else:
             patches = None
@@ -843,28 +745,18 @@ class ModelCrossSection(object):
         """
         from matplotlib.collections import LineCollection
 
-        linecol = []
-        for k in range(self.zpts.shape[0]-1):
-            for idx in range(0, len(self.xpts)-1, 2):
-                try:
-                    ll = ((self.xpts[idx][2], self.zpts[k+1, idx]))
-                    try:
-                        dx = self.xpts[idx+2][2] - self.xpts[idx][2]
-                    except:
-                        dx = self.xpts[idx+1][2] - self.xpts[idx][2]
-                    dz = self.zpts[k, idx] - self.zpts[k+1, idx]
-                    # horizontal lines
-                    linecol.append(((ll), (ll[0]+dx, ll[1])))
-                    linecol.append(((ll[0], ll[1]+dz), (ll[0]+dx, ll[1]+dz)))
-                    #vertical lines
-                    linecol.append(((ll), (ll[0], ll[1]+dz)))
-                    linecol.append(((ll[0]+dx, ll[1]), (ll[0]+dx, ll[1]+dz)))
-                except:
-                    pass
-
-        linecollection = LineCollection(linecol, **kwargs)
+        # lower left, upper left, upper right and lower right corners
+        verts = self._get_cell_vertices(self.zpts).reshape(-1, 4, 2)
+        ll, ul, ur, lr = verts[:, 0], verts[:, 1], verts[:, 2], verts[:, 3]
+        # bottom, top, left and right sides of each cell
+        linecol = np.stack([np.stack([ll, lr], axis=1),
+                            np.stack([ul, ur], axis=1),
+                            np.stack([ll, ul], axis=1),
+                            np.stack([lr, ur], axis=1)], axis=1)
+
+        linecollection = LineCollection(linecol.reshape(-1, 2, 2), **kwargs)
         return linecollection
-        
+
     def set_zpts(self, vs):
         """
         Get an array of z elevations based on minimum of cell elevation
@@ -880,16 +772,10 @@ class ModelCrossSection(object):
         zpts : numpy.ndarray
 
         """
-        zpts = []
-        for k in range(self.layer0, self.layer1):
-            e = self.elev[k, :, :]
-            if k < self.dis.nlay:
-                v = vs[k, :, :]
-                idx =  v < e
-                e[idx] = v[idx] 
-            zpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, e))
-        return np.array(zpts)
+        e = self.elev[self.layer0:self.layer1].copy()
+        nlay = self.dis.nlay - self.layer0
+        e[:nlay] = np.where(vs[:nlay] < e[:nlay], vs[:nlay], e[:nlay])
+        return self._cell_values(e)
         
     def set_zcentergrid(self, vs):
         """
@@ -906,43 +792,83 @@ class ModelCrossSection(object):
         zcentergrid : numpy.ndarray
 
         """
-        vpts = []
-        for k in range(self.layer0, self.layer1):
-            if k < self.dis.nlay:
-                e = vs[k, :, :]
-            else:
-                e = self.elev[k, :, :]
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, e))
-        vpts = np.array(vpts)
+        e = self.elev[self.layer0:self.layer1].copy()
+        nlay = self.dis.nlay - self.layer0
+        e[:nlay] = vs[:nlay]
+        vpts = self._cell_values(e)
 
-        zcentergrid = []
-        nz = 0
+        nx = self.xpts.shape[0] // 2
+        ep = np.minimum(vpts, self.zpts)
         if self.dis.nlay == 1:
-            for k in range(0, self.zpts.shape[0]):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    nx += 1
-                    vp = vpts[k, i]
-                    zp = self.zpts[k, i]
-                    if k == 0:
-                        if vp < zp:
-                            zp = vp
-                    zcentergrid.append(zp)
+            zcentergrid = self.zpts[:, 0:2 * nx:2].copy()
+            zcentergrid[0] = ep[0, 0:2 * nx:2]
         else:
-            for k in range(0, self.zpts.shape[0] - 1):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    nx += 1
-                    vp = vpts[k, i]
-                    ep = self.zpts[k, i]
-                    if vp < ep:
-                        ep = vp
-                    zp = 0.5 * (ep + self.zpts[k+1, i+1])
-                    zcentergrid.append(zp)
-        return np.array(zcentergrid).reshape((nz, nx)) 
+            zcentergrid = 0.5 * (ep[:-1, 0:2 * nx:2] +
+                                 self.zpts[1:, 1:2 * nx:2])
+        return zcentergrid
+
+    def _cell_values(self, a):
+        """
+        Get the values of a two- or three-dimensional array at the points
+        along the cross-section (self.xpts).
+
+        """
+        return plotutil.cell_value_points(self.xpts, self.sr.xedge,
+                                          self.sr.yedge, a)
+
+    def _layer_values(self, a, cbd_values):
+        """
+        Get the values of a three-dimensional array at the points along the
+        cross-section for each model layer and confining bed. cbd_values
+        is a value or a three-dimensional array (indexed by model layer)
+        with the values for the confining beds.
+
+        """
+        vpts = self._cell_values(a[:self.dis.nlay])
+        if self.ncb == 0:
+            return vpts
+        cbd_values = np.asarray(cbd_values)
+        if cbd_values.ndim == 3:
+            cbd = self._cell_values(cbd_values[self.laycbd[:self.dis.nlay] > 0])
+        else:
+            cbd = np.full((self.ncb, vpts.shape[1]), cbd_values, dtype=np.float)
+        values = np.empty((self.dis.nlay + self.ncb, vpts.shape[1]),
+                          dtype=np.result_type(vpts, cbd))
+        values[self.active == 1] = vpts
+        values[self.active == 0] = cbd
+        return values
+
+    def _get_cell_vertices(self, zpts):
+        """
+        Get the vertices (lower left, upper left, upper right, lower right)
+        of each cell along the cross-section from an array of z elevations
+        at the points along the cross-section (zpts).
+
+        Returns
+        -------
+        verts : numpy.ndarray
+            Array of shape (nz - 1, ncells, 4, 2)
+
+        """
+        npts = len(self.d)
+        idx = np.arange(0, npts - 1, 2)
+        # cells extend to the start of the next cell
+        dx = np.where(idx + 2 < npts, self.d[np.minimum(idx + 2, npts - 1)],
+                      self.d[idx + 1]) - self.d[idx]
+        x0 = np.broadcast_to(self.d[idx], (zpts.shape[0] - 1, len(idx)))
+        x1 = x0 + dx
+        zbot = zpts[1:, idx]
+        ztop = zbot + (zpts[:-1, idx] - zpts[1:, idx])
+        verts = np.empty(zbot.shape + (4, 2), dtype=np.float)
+        verts[..., 0, 0] = x0
+        verts[..., 0, 1] = zbot
+        verts[..., 1, 0] = x0
+        verts[..., 1, 1] = ztop
+        verts[..., 2, 0] = x1
+        verts[..., 2, 1] = ztop
+        verts[..., 3, 0] = x1
+        verts[..., 3, 1] = zbot
+        return verts
 
     def get_extent(self):
         """
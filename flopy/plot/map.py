@@ -609,7 +609,7 @@ class ModelMap(object):
 
         return quiver
 
-    def plot_pathline(self, pl, travel_time=None, **kwargs):
+    def plot_pathline(self, pl, travel_time=None, decimate=None, **kwargs):
         """
         Plot the MODPATH pathlines.
 
@@ -617,9 +617,12 @@ class ModelMap(object):
         ----------
         pl : list of rec arrays or a single rec array
             rec array or list of rec arrays is data returned from
-            modpathfile PathlineFile get_data() or get_alldata()
-            methods. Data in rec array is 'x', 'y', 'z', 'time',
-            'k', and 'particleid'.
+            modpathfile PathlineFile get_data(), get_alldata(), or
+            get_destination_pathline_data() methods. Data in rec array
+            is 'x', 'y', 'z', 'time', 'k', and 'particleid'. A single rec
+            array can contain the pathlines of many particles; the
+            pathlines are split on changes in particleid (the rec array is
+            sorted by particleid if necessary).
         travel_time: float or str
             travel_time is a travel time selection for the displayed
             pathlines. If a float is passed then pathlines with times
@@ -630,6 +633,10 @@ class ModelMap(object):
             >. For example, to select all pathlines less than 10000 days
             travel_time='< 10000' would be passed to plot_pathline.
             (default is None)
+        decimate : int
+            Plot every decimate-th point of each pathline (the last point
+            of each pathline is always plotted) to reduce the size of
+            plots with many pathlines. (default is None)
         kwargs : layer, ax, colors.  The remaining kwargs are passed
             into the LineCollection constructor. If layer='all',
             pathlines are output for all layers
@@ -640,9 +647,6 @@ class ModelMap(object):
 
         """
         from matplotlib.collections import LineCollection
-        # make sure pathlines is a list
-        if not isinstance(pl, list):
-            pl = [pl]
 
         if 'layer' in kwargs:
             kon = kwargs.pop('layer')
@@ -664,63 +668,89 @@ class ModelMap(object):
         if 'colors' not in kwargs:
             kwargs['colors'] = '0.5'
 
-        linecol = []
-        for p in pl:
-            if travel_time is None:
-                tp = p.copy()
-            else:
-                if isinstance(travel_time, str):
-                    if '<=' in travel_time:
-                        time = float(travel_time.replace('<=', ''))
-                        idx = (p['time'] <= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('<', ''))
-                        idx = (p['time'] < time)
-                    elif '>=' in travel_time:
-                        time = float(travel_time.replace('>=', ''))
-                        idx = (p['time'] >= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('>', ''))
-                        idx = (p['time'] > time)
-                    else:
-                        try:
-                            time = float(travel_time)
-                            idx = (p['time'] <= time)
-                        except:
-                            errmsg = 'flopy.map.plot_pathline travel_time ' + \
-                                     'variable cannot be parsed. ' + \
-                                     'Acceptable logical variables are , ' + \
-                                     '<=, <, >=, and >. ' + \
-                                     'You passed {}'.format(travel_time)
-                            raise Exception(errmsg)
-                else:
-                    time = float(travel_time)
+        # combine the pathlines in a single rec array and flag the first
+        # point of each pathline
+        if isinstance(pl, list):
+            if len(pl) == 0:
+                return None
+            n = np.cumsum([len(p) for p in pl])
+            p = np.concatenate(pl)
+            start = np.zeros(len(p), dtype=np.bool)
+            start[n[n < len(p)]] = True
+        else:
+            p = pl
+            if 'particleid' in p.dtype.names and \
+                    np.any(np.diff(p['particleid']) < 0):
+                p = p[np.argsort(p['particleid'], kind='mergesort')]
+            start = np.zeros(len(p), dtype=np.bool)
+        if len(p) == 0:
+            return None
+        start[0] = True
+        if 'particleid' in p.dtype.names:
+            pid = p['particleid']
+            start[1:] |= pid[1:] != pid[:-1]
+
+        # select points based on travel time and layer
+        idx = np.ones(len(p), dtype=np.bool)
+        if travel_time is not None:
+            if isinstance(travel_time, str):
+                if '<=' in travel_time:
+                    time = float(travel_time.replace('<=', ''))
                     idx = (p['time'] <= time)
-                tp = p[idx]
-
-            vlc = []
-            # rotate data
-            x0r, y0r = self.sr.rotate(tp['x'], tp['y'], self.sr.rotation, 0.,
-                                      self.sr.yedge[0])
-            x0r += self.sr.xul
-            y0r += self.sr.yul - self.sr.yedge[0]
-            # build polyline array
-            arr = np.vstack((x0r, y0r)).T
-            # select based on layer
-            if kon >= 0:
-                kk = p['k'].copy().reshape(p.shape[0], 1)
-                kk = np.repeat(kk, 2, axis=1)
-                arr = np.ma.masked_where((kk != kon), arr)
+                elif '<' in travel_time:
+                    time = float(travel_time.replace('<', ''))
+                    idx = (p['time'] < time)
+                elif '>=' in travel_time:
+                    time = float(travel_time.replace('>=', ''))
+                    idx = (p['time'] >= time)
+                elif '>' in travel_time:
+                    time = float(travel_time.replace('>', ''))
+                    idx = (p['time'] > time)
+                else:
+                    try:
+                        time = float(travel_time)
+                        idx = (p['time'] <= time)
+                    except:
+                        errmsg = 'flopy.map.plot_pathline travel_time ' + \
+                                 'variable cannot be parsed. ' + \
+                                 'Acceptable logical variables are , ' + \
+                                 '<=, <, >=, and >. ' + \
+                                 'You passed {}'.format(travel_time)
+                        raise Exception(errmsg)
             else:
-                arr = np.ma.asarray(arr)
-            # append line to linecol if there is some unmasked segment
-            if not arr.mask.all():
-                linecol.append(arr)
+                time = float(travel_time)
+                idx = (p['time'] <= time)
+        if kon >= 0:
+            idx = idx & (p['k'] == kon)
+
+        # a line starts at the first point of each pathline and at each
+        # selected point that follows a point that is not selected
+        start[1:] |= ~idx[:-1]
+        start = start[idx]
+        tp = p[idx]
+        if len(tp) == 0:
+            return None
+        i0 = np.where(start)[0]
+
+        if decimate is not None and decimate > 1:
+            n = np.diff(np.append(i0, len(tp)))
+            pos = np.arange(len(tp)) - np.repeat(i0, n)
+            keep = (pos % decimate == 0) | (pos == np.repeat(n - 1, n))
+            tp = tp[keep]
+            i0 = np.where(start[keep])[0]
+
+        # rotate data
+        x0r, y0r = self.sr.rotate(tp['x'], tp['y'], self.sr.rotation, 0.,
+                                  self.sr.yedge[0])
+        x0r += self.sr.xul
+        y0r += self.sr.yul - self.sr.yedge[0]
+        # build polyline array and split it into lines
+        arr = np.vstack((x0r, y0r)).T
+        linecol = np.split(arr, i0[1:])
+
         # create line collection
-        lc = None
-        if len(linecol) > 0:
-            lc = LineCollection(linecol, **kwargs)
-            ax.add_collection(lc)
+        lc = LineCollection(linecol, **kwargs)
+        ax.add_collection(lc)
         return lc
 
     def plot_endpoint(self, ep, direction='ending',
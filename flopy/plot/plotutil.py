@@ -1080,14 +1080,31 @@ def plot_cvfd(verts, iverts, ax=None, layer=0, cmap='Dark2',
     return pc
 
 
-def saturated_thickness(head, top, botm, laytyp, mask_values=None):
+def _time_chunks(shape, chunksize=None):
+    """
+    Slices of the first (time) dimension of a stacked
+    (ntimes, nlay, nrow, ncol) array. If chunksize is None, each chunk
+    has about 2 million values.
+
+    """
+    ntimes = shape[0]
+    if chunksize is None:
+        ncells = int(np.prod(shape[1:]))
+        chunksize = max(1, 2000000 // max(ncells, 1))
+    for t0 in range(0, ntimes, chunksize):
+        yield slice(t0, min(t0 + chunksize, ntimes))
+
+
+def saturated_thickness(head, top, botm, laytyp, mask_values=None,
+                        chunksize=None):
     """
     Calculate the saturated thickness.
 
     Parameters
     ----------
     head : numpy.ndarray
-        head array
+        head array of shape (nlay, nrow, ncol), or a stacked head array of
+        shape (ntimes, nlay, nrow, ncol) for several times
     top : numpy.ndarray
         top array of shape (nrow, ncol)
     botm : numpy.ndarray
@@ -1096,41 +1113,53 @@ def saturated_thickness(head, top, botm, laytyp, mask_values=None):
         confined (0) or convertible (1) of shape (nlay)
     mask_values : list of floats
         If head is one of these values, then set sat to top - bot
+    chunksize : int
+        Number of times processed at once for a stacked head array. If
+        None, times are processed in chunks of about 2 million values.
+        (default is None)
 
     Returns
     -------
     sat_thk : numpy.ndarray
-        Saturated thickness of shape (nlay, nrow, ncol).
+        Saturated thickness of the same shape as head.
 
     """
-    nlay, nrow, ncol = head.shape
+    if head.ndim == 4:
+        sat_thk = np.empty(head.shape, dtype=head.dtype)
+        for t in _time_chunks(head.shape, chunksize):
+            sat_thk[t] = _saturated_thickness(head[t], top, botm, laytyp,
+                                              mask_values)
+        return sat_thk
+    return _saturated_thickness(head, top, botm, laytyp, mask_values)
+
+
+def _saturated_thickness(head, top, botm, laytyp, mask_values=None):
+    nlay = head.shape[-3]
+    botm = np.asarray(botm)[:nlay]
+    tops = np.concatenate((np.asarray(top)[np.newaxis], botm[:-1]))
+    thk = tops - botm
     sat_thk = np.empty(head.shape, dtype=head.dtype)
-    for k in range(nlay):
-        if k == 0:
-            t = top
-        else:
-            t = botm[k-1, :, :]
-        sat_thk[k, :, :] = t - botm[k, :, :]
-    for k in range(nlay):
-        if laytyp[k] != 0:
-            dh = np.zeros((nrow, ncol), dtype=head.dtype)
-            s = sat_thk[k, :, :]
-
+    sat_thk[...] = thk
+
+    convertible = np.asarray(laytyp)[:nlay] != 0
+    if np.any(convertible):
+        h = head[..., convertible, :, :]
+        t = tops[convertible]
+        s = thk[convertible]
+        dh = np.where(h > t, t, h) - botm[convertible]
+        if mask_values is not None and len(mask_values) > 0:
+            # cells with a masked head are fully saturated
+            idx = np.zeros(h.shape, dtype=np.bool)
             for mv in mask_values:
-                idx = (head[k, :, :] == mv)
-                dh[idx] = s[idx]
-
-            if k == 0:
-                t = top
-            else:
-                t = botm[k-1, :, :]
-            t = np.where(head[k, :, :] > t, t, head[k, :, :])
-            dh = np.where(dh == 0, t - botm[k, :, :], dh)
-            sat_thk[k, :, :] = dh[:, :]
+                idx |= (h == mv)
+            idx &= (s != 0)
+            dh = np.where(idx, s, dh)
+        sat_thk[..., convertible, :, :] = dh
     return sat_thk
 
 
-def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
+def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk,
+                                chunksize=None):
     """
     Using the MODFLOW discharge, calculate the cell centered specific discharge
     by dividing by the flow width and then averaging to the cell center.
@@ -1151,6 +1180,10 @@ def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
         MODFLOW delc array
     sat_thk : numpy.ndarray
         Saturated thickness for each cell
+    chunksize : int
+        Number of times processed at once for stacked discharge arrays of
+        shape (ntimes, nlay, nrow, ncol). If None, times are processed in
+        chunks of about 2 million values. (default is None)
 
     Returns
     -------
@@ -1158,54 +1191,57 @@ def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
         Specific discharge arrays that have been interpolated to cell centers.
 
     """
+    Q = [Qx, Qy, Qz]
+    shape = [q.shape for q in Q if q is not None]
+    if len(shape) == 0 or len(shape[0]) != 4:
+        return _centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk)
+
+    q = [None if a is None else np.empty(a.shape, dtype=a.dtype) for a in Q]
+    for t in _time_chunks(shape[0], chunksize):
+        s = sat_thk[t] if sat_thk.ndim == 4 else sat_thk
+        qt = _centered_specific_discharge(*[None if a is None else a[t]
+                                            for a in Q],
+                                          delr=delr, delc=delc, sat_thk=s)
+        for a, b in zip(q, qt):
+            if a is not None:
+                a[t] = b
+    return tuple(q)
+
+
+def _centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
     qx = None
     qy = None
     qz = None
+    delr = np.asarray(delr)
+    delc = np.asarray(delc)
 
     if Qx is not None:
-
-        nlay, nrow, ncol = Qx.shape
         qx = np.zeros(Qx.shape, dtype=Qx.dtype)
-
-        for k in range(nlay):
-            for j in range(ncol-1):
-                area = delc[:] * 0.5 * (sat_thk[k, :, j] + sat_thk[k, :, j + 1])
-                idx = area > 0.
-                qx[k, idx, j] = Qx[k, idx, j] / area[idx]
-
-        qx[:, :, 1:] = 0.5 * (qx[:, :, 0:ncol-1] + qx[:, :, 1:ncol])
-        qx[:, :, 0] = 0.5 * qx[:, :, 0]
+        sat_thk = sat_thk[..., :Qx.shape[-3], :, :]
+        area = delc[:, np.newaxis] * 0.5 * (sat_thk[..., :-1] +
+                                            sat_thk[..., 1:])
+        np.divide(Qx[..., :-1], area, out=qx[..., :-1], where=area > 0.)
+        qx[..., 1:] = 0.5 * (qx[..., :-1] + qx[..., 1:])
+        qx[..., 0] = 0.5 * qx[..., 0]
 
     if Qy is not None:
-
-        nlay, nrow, ncol = Qy.shape
         qy = np.zeros(Qy.shape, dtype=Qy.dtype)
-
-        for k in range(nlay):
-            for i in range(nrow-1):
-                area = delr[:] * 0.5 * (sat_thk[k, i, :] + sat_thk[k, i + 1, :])
-                idx = area > 0.
-                qy[k, i, idx] = Qy[k, i, idx] / area[idx]
-
-        qy[:, 1:, :] = 0.5 * (qy[:, 0:nrow-1, :] + qy[:, 1:nrow, :])
-        qy[:, 0, :] = 0.5 * qy[:, 0, :]
+        sat_thk = sat_thk[..., :Qy.shape[-3], :, :]
+        area = delr * 0.5 * (sat_thk[..., :-1, :] + sat_thk[..., 1:, :])
+        np.divide(Qy[..., :-1, :], area, out=qy[..., :-1, :], where=area > 0.)
+        qy[..., 1:, :] = 0.5 * (qy[..., :-1, :] + qy[..., 1:, :])
+        qy[..., 0, :] = 0.5 * qy[..., 0, :]
         qy = -qy
 
-
     if Qz is not None:
+        area = delc[:, np.newaxis] * delr[np.newaxis, :]
         qz = np.zeros(Qz.shape, dtype=Qz.dtype)
-        dr = delr.reshape((1, delr.shape[0]))
-        dc = delc.reshape((delc.shape[0], 1))
-        area = dr * dc
-        for k in range(nlay):
-            qz[k, :, :] = Qz[k, :, :] / area[:, :]
-        qz[1:, :, :] = 0.5 * (qz[0:nlay-1, :, :] + qz[1:nlay, :, :])
-        qz[0, :, :] = 0.5 * qz[0, :, :]
+        qz[...] = Qz / area
+        qz[..., 1:, :, :] = 0.5 * (qz[..., :-1, :, :] + qz[..., 1:, :, :])
+        qz[..., 0, :, :] = 0.5 * qz[..., 0, :, :]
         qz = -qz
 
-
     return (qx, qy, qz)
-    
 
 
 def findrowcolumn(pt, xedge, yedge):
@@ -1412,14 +1448,17 @@ def cell_value_points(pts, xedge, yedge, vdata):
         numpy.ndarray.
     vdata : numpy.ndarray
         Data (i.e., head, hk, etc.) for a rectilinear MODFLOW model grid. The
-        shape of vdata is (NROW, NCOL). If vdata is not a numpy.ndarray it is
+        shape of vdata is (NROW, NCOL), or (NLAY, NROW, NCOL) to get the
+        values for all layers at once. If vdata is not a numpy.ndarray it is
         converted to a numpy.ndarray.
 
     Returns
     -------
     vcell : numpy.ndarray
         numpy.ndarray of of data values from the vdata numpy.ndarray at x- and
-        y-coordinate locations in pts.
+        y-coordinate locations in pts. Points outside of the grid are not
+        included. The shape of vcell is (npts) for two-dimensional vdata and
+        (NLAY, npts) for three-dimensional vdata.
 
     Examples
     --------
@@ -1435,19 +1474,30 @@ def cell_value_points(pts, xedge, yedge, vdata):
         yedge = np.array(yedge)
     if not isinstance(vdata, np.ndarray):
         vdata = np.array(vdata)
+    # values of masked cells are returned as zero
+    vdata = np.ma.filled(vdata, 0)
 
-    vcell = []
-    for idx, [xt, yt, dlen] in enumerate(pts):
-        # find the modflow cell containing point
-        irow, jcol = findrowcolumn((xt, yt), xedge, yedge)
-        if irow >= 0 and jcol >= 0:
-            if np.isnan(vdata[irow, jcol]):
-                vcell.append(np.nan)
-            else:
-                v = np.asarray(vdata[irow, jcol])
-                vcell.append(v) 
+    # find the modflow cells containing the points
+    pts = np.asarray(pts)
+    if len(pts) == 0:
+        return np.empty(vdata.shape[:-2] + (0,), dtype=vdata.dtype)
+    irow, jcol = _findrowcolumn_array(pts[:, 0], pts[:, 1], xedge, yedge)
+    idx = (irow >= 0) & (jcol >= 0)
+    return vdata[..., irow[idx], jcol[idx]]
+
+
+def _findrowcolumn_array(x, y, xedge, yedge):
+    """
+    Find the MODFLOW cells containing arrays of x- and y-points, with the
+    same conventions as findrowcolumn: the row or column is -100 if a point
+    is beyond the last grid edge, and -1 if it is before the first edge.
 
-    return np.array(vcell)
+    """
+    jcol = np.searchsorted(xedge, x, side='right') - 1
+    jcol[jcol == len(xedge) - 1] = -100
+    irow = np.searchsorted(-yedge, -np.asarray(y), side='right') - 1
+    irow[irow == len(yedge) - 1] = -100
+    return irow, jcol
 
 
 
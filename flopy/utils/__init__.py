@@ -23,7 +23,8 @@
 from .mfreadnam import parsenamefile
 from .util_array import Util3d, Util2d, Transient2d, Transient3d, read1d
 from .util_list import MfList
-from .binaryfile import BinaryHeader, HeadFile, UcnFile, CellBudgetFile
+from .binaryfile import BinaryHeader, HeadFile, UcnFile, UcnFileSet, \
+    CellBudgetFile
 from .formattedfile import FormattedHeadFile
 from .modpathfile import PathlineFile, EndpointFile
 from .swroutputfile import SwrStage, SwrBudget, SwrFlow, SwrExchange, \
@@ -37,5 +38,6 @@ from .utils_def import FlopyBinaryData, totim_to_datetime
 from .flopy_io import read_fixed_var, write_fixed_var
 from .zonbud import ZoneBudget, read_zbarray, write_zbarray
 from .mfgrdfile import MfGrdFile
+from .outputstore import OutputStore, write_output_store
 from .postprocessing import get_transmissivities
 from .sfroutputfile import SfrFile
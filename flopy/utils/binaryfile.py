@@ -4,14 +4,17 @@ important classes that can be accessed by the user.
 
 *  HeadFile (Binary head file.  Can also be used for drawdown)
 *  UcnFile (Binary concentration file from MT3DMS)
+*  UcnFileSet (Binary concentration files for all species from MT3DMS)
 *  CellBudgetFile (Binary cell-by-cell flow file)
 
 """
 from __future__ import print_function
+import os
 import numpy as np
 import warnings
 from collections import OrderedDict
-from ..utils.datafile import Header, LayerFile
+from ..utils.datafile import Header, LayerFile, RecordCache, \
+    FileHandlePool, _run_in_executor
 
 
 class BinaryHeader(Header):
@@ -365,6 +368,14 @@ class HeadFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_size : int
+        Maximum size in bytes of a least recently used cache of the records
+        that have been read (see RecordCache).  Default is None (records
+        are not cached).
+    thread_safe : bool
+        If True, each thread that reads data uses its own file handle, so
+        that the object can be used from more than one thread at the same
+        time.  Default is False.
 
     Attributes
     ----------
@@ -432,6 +443,14 @@ class UcnFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_size : int
+        Maximum size in bytes of a least recently used cache of the records
+        that have been read (see RecordCache).  Default is None (records
+        are not cached).
+    thread_safe : bool
+        If True, each thread that reads data uses its own file handle, so
+        that the object can be used from more than one thread at the same
+        time.  Default is False.
 
     Attributes
     ----------
@@ -480,6 +499,296 @@ class UcnFile(BinaryLayerFile):
         return
 
 
+class UcnFileSet(object):
+    """
+    UcnFileSet Class.
+
+    A set of MT3D concentration files, one for each species (component) of
+    a multi-species simulation, that share a single time index. The data
+    are accessed as a (ncomp, ntimes, nlay, nrow, ncol) array that is read
+    from the files only for the requested slices.
+
+    Parameters
+    ----------
+    filenames : list of strings
+        Names of the concentration files, in component order
+    text : string
+        Name of the text string in the ucn files.  Default is 'CONCENTRATION'
+    precision : string
+        'auto', 'single' or 'double'.  Default is 'auto'.
+    verbose : bool
+        Write information to the screen.  Default is False.
+
+    Attributes
+    ----------
+    ncomp : int
+        Number of components
+    shape : tuple of ints
+        (ncomp, ntimes, nlay, nrow, ncol)
+
+    Notes
+    -----
+    The headers of the first file are read to build the time index. The
+    other files share this index if they have the same size and the same
+    first and last record headers, which is the case for the files written
+    by MT3D for each component. The headers of other files are read
+    separately, and their times must be in the time index of the first file.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> mt = flopy.mt3d.Mt3dms.load('p7mt.nam')
+    >>> ucnset = flopy.utils.UcnFileSet.from_model(mt)
+    >>> conc = ucnset[:, -1]  # all components at the last time
+    >>> totals = [ucnset[icomp, -1].sum() for icomp in range(ucnset.ncomp)]
+
+    """
+
+    def __init__(self, filenames, text='concentration', precision='auto',
+                 verbose=False, **kwargs):
+        if len(filenames) == 0:
+            raise Exception('UcnFileSet error: no concentration files')
+        self.filenames = list(filenames)
+        self.ncomp = len(self.filenames)
+        self.verbose = verbose
+
+        # the time index of the first file is used for all files
+        ucn = UcnFile(self.filenames[0], text=text, precision=precision,
+                      verbose=verbose, **kwargs)
+        self.precision = ucn.precision
+        self.realtype = ucn.realtype
+        self.nlay, self.nrow, self.ncol = ucn.nlay, ucn.nrow, ucn.ncol
+        self.times = ucn.times
+        self.kstpkper = ucn.kstpkper
+        self.sr = ucn.sr
+        self._itime = dict((t, i) for i, t in enumerate(self.times))
+        self.shape = (self.ncomp, len(self.times), self.nlay, self.nrow,
+                      self.ncol)
+
+        self.files = [ucn.file]
+        self.iposarray = np.empty(self.shape[:3], dtype=np.int64)
+        self.iposarray[0] = self._get_positions(ucn)
+        for icomp, fname in enumerate(self.filenames[1:], 1):
+            f = open(fname, 'rb')
+            if self._has_records(f, ucn):
+                self.files.append(f)
+                self.iposarray[icomp] = self.iposarray[0]
+            else:
+                f.close()
+                if verbose:
+                    print('building a separate index for {}'.format(fname))
+                u = UcnFile(fname, text=text, precision=self.precision,
+                            verbose=verbose)
+                if (u.nrow, u.ncol) != (self.nrow, self.ncol) or \
+                        u.nlay > self.nlay:
+                    u.close()
+                    msg = 'UcnFileSet error: the grid of {} '.format(fname) + \
+                          'is different from the grid of ' + \
+                          '{}'.format(self.filenames[0])
+                    raise Exception(msg)
+                self.files.append(u.file)
+                self.iposarray[icomp] = self._get_positions(u)
+        return
+
+    @classmethod
+    def from_model(cls, model, sorbed=False, **kwargs):
+        """
+        Create a UcnFileSet from the concentration files (MT3D001.UCN,
+        MT3D002.UCN, ...) of all components of an Mt3dms model.
+
+        Parameters
+        ----------
+        model : flopy.mt3d.Mt3dms
+            MT3D model with a BTN package
+        sorbed : bool
+            If True, the files with the sorbed concentrations
+            (MT3D001S.UCN, ...) are used.  Default is False.
+        **kwargs : keyword arguments passed to UcnFileSet
+
+        Returns
+        -------
+        ucnset : UcnFileSet
+
+        """
+        btn = model.get_package('BTN')
+        ncomp = 1 if btn is None else btn.ncomp
+        suffix = 'S' if sorbed else ''
+        filenames = [os.path.join(model.model_ws,
+                                  'MT3D{:03d}{}.UCN'.format(i + 1, suffix))
+                     for i in range(ncomp)]
+        return cls(filenames, **kwargs)
+
+    def _get_positions(self, ucn):
+        """
+        Byte positions of the data of each time and layer in a UcnFile,
+        -1 for records that are not in the file.
+
+        """
+        totim = ucn.recordarray['totim'][:len(ucn.iposarray)]
+        ilay = ucn.recordarray['ilay'][:len(ucn.iposarray)] - 1
+        itime = np.array([self._itime.get(t, -1) for t in totim],
+                         dtype=np.int)
+        if np.any(itime < 0):
+            msg = 'UcnFileSet error: times in {} '.format(ucn.filename) + \
+                  'are not in {}'.format(self.filenames[0])
+            raise Exception(msg)
+        ipos = np.full((len(self.times), self.nlay), -1, dtype=np.int64)
+        ipos[itime, ilay] = ucn.iposarray
+        return ipos
+
+    def _has_records(self, f, ucn):
+        """
+        Check if an open file has the same size and first and last record
+        headers as a UcnFile.
+
+        """
+        f.seek(0, 2)
+        if f.tell() != ucn.totalbytes or len(ucn.iposarray) == 0:
+            return False
+        names = ['kstp', 'kper', 'totim', 'ncol', 'nrow', 'ilay']
+        hbytes = ucn.header_dtype.itemsize
+        for irec in [0, len(ucn.iposarray) - 1]:
+            f.seek(ucn.iposarray[irec] - hbytes, 0)
+            header = binaryread(f, ucn.header_dtype, (1,))
+            if len(header) == 0:
+                return False
+            for name in names:
+                if header[0][name] != ucn.recordarray[irec][name]:
+                    return False
+        return True
+
+    def __getitem__(self, key):
+        """
+        Read a slice of the (ncomp, ntimes, nlay, nrow, ncol) concentration
+        array. Only the layers that are in the slice are read. Layers that
+        are not in a file are nan.
+
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 5:
+            raise IndexError('too many indices for UcnFileSet')
+        key = key + (slice(None),) * (5 - len(key))
+        idx = []
+        squeeze = []
+        for axis, (k, n) in enumerate(zip(key, self.shape)):
+            i = np.arange(n)[k]
+            if np.ndim(i) == 0:
+                squeeze.append(axis)
+            idx.append(np.atleast_1d(i))
+        icomps, itimes, ilays, irows, icols = idx
+        data = np.empty((len(icomps), len(itimes), len(ilays), len(irows),
+                         len(icols)), dtype=self.realtype)
+        data[:] = np.nan
+        rc = np.ix_(irows, icols)
+        nval = self.nrow * self.ncol
+        for n, icomp in enumerate(icomps):
+            f = self.files[icomp]
+            for m, itime in enumerate(itimes):
+                for l, ilay in enumerate(ilays):
+                    ipos = self.iposarray[icomp, itime, ilay]
+                    if ipos < 0:
+                        continue
+                    if self.verbose:
+                        print('Byte position in file: {0}'.format(ipos))
+                    f.seek(ipos, 0)
+                    a = np.fromfile(f, self.realtype, nval)
+                    data[n, m, l] = a.reshape(self.nrow, self.ncol)[rc]
+        if squeeze:
+            data = np.squeeze(data, axis=tuple(squeeze))
+        return data
+
+    def get_times(self):
+        """
+        Get a list of unique times in the files
+
+        Returns
+        ----------
+        out : list of floats
+            List contains unique simulation times (totim) in binary files.
+
+        """
+        return self.times
+
+    def get_kstpkper(self):
+        """
+        Get a list of unique stress periods and time steps in the files
+
+        Returns
+        ----------
+        out : list of (kstp, kper) tuples
+            List of unique kstp, kper combinations in binary files.  kstp and
+            kper values are zero-based.
+
+        """
+        return [(kstp - 1, kper - 1) for kstp, kper in self.kstpkper]
+
+    def get_data(self, kstpkper=None, idx=None, totim=None, mflay=None,
+                 icomp=None):
+        """
+        Get the concentrations of all components for the specified
+        conditions.
+
+        Parameters
+        ----------
+        kstpkper : tuple of ints
+            A tuple containing the time step and stress period (kstp, kper).
+            These are zero-based kstp and kper values.
+        idx : int
+            The zero-based time index.
+        totim : float
+            The simulation time.
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        icomp : integer
+           Zero-based component number to return.  If None, then all
+           components will be included. (Default is None.)
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (ncomp, nlay, nrow, ncol), without the ncomp
+            dimension if icomp is specified and without the nlay dimension
+            if mflay is specified.
+
+        Notes
+        -----
+        if kstpkper, idx and totim are None, will return the last time
+
+        """
+        if kstpkper is not None:
+            kstpkper1 = (kstpkper[0] + 1, kstpkper[1] + 1)
+            if kstpkper1 not in self.kstpkper:
+                raise Exception('get_data() error: kstpkper not found:' +
+                                '{0}'.format(kstpkper))
+            itime = self.kstpkper.index(kstpkper1)
+        elif totim is not None:
+            if totim not in self._itime:
+                msg = 'totim value ({}) not found in file...'.format(totim)
+                raise Exception(msg)
+            itime = self._itime[totim]
+        elif idx is not None:
+            itime = idx
+        else:
+            itime = len(self.times) - 1
+        if icomp is None:
+            icomp = slice(None)
+        if mflay is None:
+            mflay = slice(None)
+        return self[icomp, itime, mflay]
+
+    def close(self):
+        """
+        Close the file handles.
+
+        """
+        for f in self.files:
+            f.close()
+        return
+
+
 class CellBudgetFile(object):
     """
     CellBudgetFile Class.
@@ -492,6 +801,14 @@ class CellBudgetFile(object):
         'single' or 'double'.  Default is 'single'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_size : int
+        Maximum size in bytes of a least recently used cache of the records
+        that have been read (see RecordCache).  Default is None (records
+        are not cached).
+    thread_safe : bool
+        If True, each thread that reads data uses its own file handle, so
+        that the object can be used from more than one thread at the same
+        time.  Default is False.
 
     Attributes
     ----------
@@ -560,6 +877,11 @@ class CellBudgetFile(object):
             self.sr = self.dis.parent.sr
         if 'sr' in kwargs.keys():
             self.sr = kwargs.pop('sr')
+        self.cache = None
+        if 'cache_size' in kwargs.keys():
+            self.set_cache(kwargs.pop('cache_size'))
+        self._handles = None
+        thread_safe = kwargs.pop('thread_safe', False)
         if len(kwargs.keys()) > 0:
             args = ','.join(kwargs.keys())
             raise Exception('LayerFile error: unrecognized kwargs: ' + args)
@@ -572,6 +894,7 @@ class CellBudgetFile(object):
 
         # read through the file and build the pointer index
         self._build_index()
+        self.set_thread_safe(thread_safe)
 
         # allocate the value array
         # self.value = np.empty((self.nlay, self.nrow, self.ncol),
@@ -821,6 +1144,59 @@ class CellBudgetFile(object):
             print(rec)
         return
 
+    @property
+    def file(self):
+        """
+        The file handle, or the file handle of the current thread if the
+        file is read in thread safe mode.
+
+        """
+        handles = getattr(self, '_handles', None)
+        if handles is not None:
+            return handles.get()
+        return self._file
+
+    @file.setter
+    def file(self, f):
+        self._file = f
+
+    def set_thread_safe(self, thread_safe=True):
+        """
+        Read the file with a separate file handle for each thread, so that
+        more than one thread can get data at the same time.
+
+        Parameters
+        ----------
+        thread_safe : bool
+            If True, each thread opens and uses its own file handle.  If
+            False, all threads share one file handle.  (Default is True.)
+
+        """
+        if self._handles is not None:
+            self._handles.close()
+            self._handles = None
+        if thread_safe:
+            self._handles = FileHandlePool(self.filename)
+        return
+
+    def set_cache(self, cache_size):
+        """
+        Cache the records that are read from the file.
+
+        Parameters
+        ----------
+        cache_size : int
+            Maximum size in bytes of the cache of the records that have been
+            read.  The least recently used records are removed from the
+            cache first.  If None, the records are not cached.
+
+        """
+        if cache_size is None:
+            self.cache = None
+        else:
+            self.cache = RecordCache(cache_size)
+        return
+
     def list_unique_records(self):
         """
         Print a list of unique record names
@@ -916,7 +1292,7 @@ class CellBudgetFile(object):
         return select_indices
 
     def get_data(self, idx=None, kstpkper=None, totim=None, text=None,
-                 paknam=None, full3D=False):
+                 paknam=None, full3D=False, out=None):
         """
         get data from the budget file.
 
@@ -936,6 +1312,12 @@ class CellBudgetFile(object):
             If true, then return the record as a three dimensional numpy
             array, even for those list-style records writen as part of a
             'COMPACT BUDGET' MODFLOW budget file.  (Default is False.)
+        out : numpy array or masked array
+            Preallocated array of shape (nlay, nrow, ncol) that list-style
+            records (imeth 2, 3 and 5) are converted into if full3D is
+            True, so that repeated conversions do not allocate new arrays.
+            Only one record can be selected if out is passed.
+            (Default is None.)
 
         Returns
         ----------
@@ -1035,14 +1417,211 @@ class CellBudgetFile(object):
         # build and return the record list
         if isinstance(select_indices, tuple):
             select_indices = select_indices[0]
+        if out is not None and len(select_indices) > 1:
+            raise ValueError('out can only be used if one record is ' +
+                             'selected, {} records '.format(
+                                 len(select_indices)) + 'were selected')
         recordlist = []
         for idx in select_indices:
-            rec = self.get_record(idx, full3D=full3D)
+            rec = self.get_record(idx, full3D=full3D, out=out)
             recordlist.append(rec)
 
         return recordlist
 
-    def get_record(self, idx, full3D=False):
+    def get_ts(self, idx, text=None, times=None):
+        """
+        Get a time series of a budget term for selected cells from the
+        budget file.
+
+        Parameters
+        ----------
+        idx : tuple of ints, or a list of a tuple of ints
+            idx can be (layer, row, column) or it can be a list in the form
+            [(layer, row, column), (layer, row, column), ...].  The layer,
+            row, and column values must be zero based.
+        text : str
+            The text identifier for the record.  Examples include
+            'RIVER LEAKAGE', 'STORAGE', 'FLOW RIGHT FACE', etc.
+        times : iterable of floats
+            List of times to get the time series for.  (Default is None,
+            which returns all of the times with the record.)
+
+        Returns
+        ----------
+        out : numpy array
+            Array has size (ntimes, ncells + 1), with a row for each time
+            step with the record.  The first column in the data array will
+            contain time (totim).
+
+        See Also
+        --------
+
+        Notes
+        -----
+
+        Values are read directly from the cell positions of full grid
+        records (imeth 0, 1, 3 and 4), without reading the whole record.
+        For list records (imeth 2, 5, 6 and 7), the values of the selected
+        cells are summed and cells that are not in the list are zero.
+
+        The layer, row, and column values must be zero-based, and must be
+        within the following ranges: 0 <= k < nlay; 0 <= i < nrow; 0 <= j < ncol
+
+        Examples
+        --------
+        >>> import flopy.utils.binaryfile as bf
+        >>> cbb = bf.CellBudgetFile('mymodel.cbb')
+        >>> ts = cbb.get_ts(idx=[(0, 4, 5), (1, 4, 5)],
+        ...                 text='RIVER LEAKAGE')
+
+        """
+        if text is None:
+            raise Exception('text keyword must be provided to ' +
+                            'CellBudgetFile get_ts() method.')
+        text16 = self._find_text(text)
+
+        if isinstance(idx, list):
+            kijlist = idx
+        elif isinstance(idx, tuple):
+            kijlist = [idx]
+        for k, i, j in kijlist:
+            if not (0 <= k < self.nlay and 0 <= i < self.nrow and
+                    0 <= j < self.ncol):
+                errmsg = 'Invalid cell index. Cell ' + str((k, i, j)) + \
+                         ' not within model grid: ' + \
+                         str((self.nlay, self.nrow, self.ncol))
+                raise Exception(errmsg)
+        kij = np.array(kijlist, dtype=np.int64).reshape(-1, 3)
+        ncpl = self.nrow * self.ncol
+        nodes = kij[:, 0] * ncpl + kij[:, 1] * self.ncol + kij[:, 2]
+        # node -> position lookup for the selected cells
+        unodes, inv = np.unique(nodes, return_inverse=True)
+        ulay = unodes // ncpl
+        ucell = unodes % ncpl
+
+        select = self.recordarray['text'] == text16
+        if times is not None:
+            select &= np.in1d(self.recordarray['totim'], list(times))
+        select_indices = np.where(select)[0]
+
+        # one row for each time step
+        rowdict = OrderedDict()
+        for irec in select_indices:
+            header = self.recordarray[irec]
+            key = (header['kstp'], header['kper'])
+            if key not in rowdict:
+                rowdict[key] = len(rowdict)
+
+        result = np.zeros((len(rowdict), len(unodes)), dtype=self.realtype)
+        totim = np.zeros(len(rowdict), dtype=self.realtype)
+        realbytes = self.realtype(1).nbytes
+        intbytes = np.int32(1).nbytes
+        for irec in select_indices:
+            header = self.recordarray[irec]
+            irow = rowdict[(header['kstp'], header['kper'])]
+            totim[irow] = header['totim']
+            imeth = header['imeth']
+            ipos = np.long(self.iposarray[irec])
+            nrow = header['nrow']
+            ncol = header['ncol']
+            if imeth == 0 or imeth == 1:
+                # seek to each cell in the full 3D array
+                for n, node in enumerate(unodes):
+                    self.file.seek(ipos + np.long(node) * realbytes, 0)
+                    result[irow, n] += binaryread(self.file,
+                                                  self.realtype)[0]
+            elif imeth == 3:
+                # layer indicator array followed by a 2D array
+                for n in range(len(unodes)):
+                    self.file.seek(ipos + np.long(ucell[n]) * intbytes, 0)
+                    ilayer = binaryread(self.file, np.int32)[0]
+                    if ilayer - 1 != ulay[n]:
+                        continue
+                    self.file.seek(ipos + np.long(nrow * ncol) * intbytes +
+                                   np.long(ucell[n]) * realbytes, 0)
+                    result[irow, n] += binaryread(self.file,
+                                                  self.realtype)[0]
+            elif imeth == 4:
+                # 2D array of layer 1
+                for n in np.where(ulay == 0)[0]:
+                    self.file.seek(ipos + np.long(ucell[n]) * realbytes, 0)
+                    result[irow, n] += binaryread(self.file,
+                                                  self.realtype)[0]
+            else:
+                # list of nodes and values
+                data = self.get_record(irec)
+                recnodes = data['node'] - 1
+                pos = np.searchsorted(unodes, recnodes)
+                pos[pos == len(unodes)] = 0
+                match = unodes[pos] == recnodes
+                np.add.at(result[irow], pos[match], data['q'][match])
+
+        out = np.empty((len(rowdict), len(nodes) + 1), dtype=self.realtype)
+        out[:, 0] = totim
+        out[:, 1:] = result[:, inv]
+        return out
+
+    def aget_data(self, idx=None, kstpkper=None, totim=None, text=None,
+                  paknam=None, full3D=False, executor=None):
+        """
+        Get data from the budget file without blocking the asyncio event
+        loop.  The records are read by get_data() in an executor, with the
+        file in thread safe mode, so that many records can be read at the
+        same time.
+
+        Parameters
+        ----------
+        idx, kstpkper, totim, text, paknam, full3D :
+            See get_data().
+        executor : concurrent.futures.ThreadPoolExecutor
+            Executor for the reads.  (Default is None, which uses the
+            default executor of the event loop.)
+
+        Returns
+        ----------
+        future : asyncio.Future
+            Future for the list of records returned by get_data().
+
+        Examples
+        --------
+
+        >>> import asyncio
+        >>> import flopy
+        >>> cbb = flopy.utils.CellBudgetFile('mymodel.cbb')
+        >>> futures = [cbb.aget_data(kstpkper=kk, text='RIVER LEAKAGE')
+        ...            for kk in cbb.get_kstpkper()]
+        >>> loop = asyncio.get_event_loop()
+        >>> recs = loop.run_until_complete(asyncio.gather(*futures))
+
+        """
+        return _run_in_executor(self, self.get_data, executor, idx=idx,
+                                kstpkper=kstpkper, totim=totim, text=text,
+                                paknam=paknam, full3D=full3D)
+
+    def aget_ts(self, idx, text=None, times=None, executor=None):
+        """
+        Get a time series of a budget term without blocking the asyncio
+        event loop.  The time series is read by get_ts() in an executor,
+        with the file in thread safe mode.
+
+        Parameters
+        ----------
+        idx, text, times :
+            See get_ts().
+        executor : concurrent.futures.ThreadPoolExecutor
+            Executor for the reads.  (Default is None, which uses the
+            default executor of the event loop.)
+
+        Returns
+        ----------
+        future : asyncio.Future
+            Future for the array returned by get_ts().
+
+        """
+        return _run_in_executor(self, self.get_ts, executor, idx, text=text,
+                                times=times)
+
+    def get_record(self, idx, full3D=False, out=None):
         """
         Get a single data record from the budget file.
 
@@ -1054,6 +1633,10 @@ class CellBudgetFile(object):
             If true, then return the record as a three dimensional numpy
             array, even for those list-style records writen as part of a
             'COMPACT BUDGET' MODFLOW budget file.  (Default is False.)
+        out : numpy array or masked array
+            Preallocated array of shape (nlay, nrow, ncol) that list-style
+            records (imeth 2, 3 and 5) are converted into if full3D is
+            True. (Default is None.)
 
         Returns
         ----------
@@ -1080,8 +1663,6 @@ class CellBudgetFile(object):
             idx = np.array([idx])
 
         header = self.recordarray[idx]
-        ipos = np.long(self.iposarray[idx])
-        self.file.seek(ipos, 0)
         imeth = header['imeth'][0]
 
         t = header['text'][0]
@@ -1093,43 +1674,34 @@ class CellBudgetFile(object):
         nrow = header['nrow'][0]
         ncol = header['ncol'][0]
 
-        # default method
-        if imeth == 0:
-            if self.verbose:
-                s += 'an array of shape ' + str((nlay, nrow, ncol))
-                print(s)
-            return binaryread(self.file, self.realtype(1),
-                              shape=(nlay, nrow, ncol))
-        # imeth 1
-        elif imeth == 1:
+        data = self._read_record(int(idx[0]))
+
+        # default method and imeth 1
+        if imeth == 0 or imeth == 1:
             if self.verbose:
                 s += 'an array of shape ' + str((nlay, nrow, ncol))
                 print(s)
-            return binaryread(self.file, self.realtype(1),
-                              shape=(nlay, nrow, ncol))
+            return data
 
-        # imeth 2
-        elif imeth == 2:
-            nlist = binaryread(self.file, np.int32)[0]
-            dtype = np.dtype([('node', np.int32), ('q', self.realtype)])
+        # imeth 2 and 5
+        elif imeth == 2 or imeth == 5:
             if self.verbose:
                 if full3D:
                     s += 'a numpy masked array of size ({},{},{})'.format(nlay,
                                                                           nrow,
                                                                           ncol)
                 else:
-                    s += 'a numpy recarray of size (' + str(nlist) + ', 2)'
+                    s += 'a numpy recarray of size (' + str(len(data)) + \
+                         ', {})'.format(len(data.dtype.names))
                 print(s)
-            data = binaryread(self.file, dtype, shape=(nlist,))
             if full3D:
-                return self.create3D(data, nlay, nrow, ncol)
+                return self.create3D(data, nlay, nrow, ncol, out=out)
             else:
-                return data.view(np.recarray)
+                return data
 
         # imeth 3
         elif imeth == 3:
-            ilayer = binaryread(self.file, np.int32, shape=(nrow, ncol))
-            data = binaryread(self.file, self.realtype(1), shape=(nrow, ncol))
+            ilayer, data = data
             if self.verbose:
                 if full3D:
                     s += 'a numpy masked array of size ({},{},{})'.format(nlay,
@@ -1143,10 +1715,13 @@ class CellBudgetFile(object):
                          str((nrow, ncol))
                 print(s)
             if full3D:
-                out = np.ma.zeros((nlay, nrow, ncol), dtype=np.float32)
-                out.mask = True
-                vertical_layer = ilayer[0] - 1  # This is always the top layer
-                out[vertical_layer, :, :] = data
+                out, flat, mask = self._get_full3D_out(out, nlay, nrow, ncol)
+                # values of each column in the layer of the layer array
+                idx = (ilayer.ravel() - 1) * nrow * ncol + \
+                      np.arange(nrow * ncol)
+                flat[idx] = data.ravel()
+                if mask is not None:
+                    mask[idx] = False
                 return out
             else:
                 return [ilayer, data]
@@ -1156,67 +1731,62 @@ class CellBudgetFile(object):
             if self.verbose:
                 s += 'a 2d numpy array of size ({},{})'.format(nrow, ncol)
                 print(s)
-            return binaryread(self.file, self.realtype(1), shape=(nrow, ncol))
-
-        # imeth 5
-        elif imeth == 5:
-            nauxp1 = binaryread(self.file, np.int32)[0]
-            naux = nauxp1 - 1
-            l = [('node', np.int32), ('q', self.realtype)]
-            for i in range(naux):
-                auxname = binaryread(self.file, str, charlen=16)
-                if not isinstance(auxname, str):
-                    auxname = auxname.decode()
-                l.append((auxname, self.realtype))
-            dtype = np.dtype(l)
-            nlist = binaryread(self.file, np.int32)[0]
-            data = binaryread(self.file, dtype, shape=(nlist,))
-            if full3D:
-                if self.verbose:
-                    s += 'a list array of shape ({},{},{})'.format(nlay,
-                                                                   nrow,
-                                                                   ncol)
-                    print(s)
-                return self.create3D(data, nlay, nrow, ncol)
-            else:
-                if self.verbose:
-                    s += 'a numpy recarray of size (' + \
-                         str(nlist) + ', {})'.format(2 + naux)
-                    print(s)
-                return data.view(np.recarray)
+            return data
 
-        # imeth 6
-        elif imeth == 6:
-            # read rest of list data
-            nauxp1 = binaryread(self.file, np.int32)[0]
-            naux = nauxp1 - 1
-            l = [('node', np.int32), ('q', self.realtype)]
-            for i in range(naux):
-                auxname = binaryread(self.file, str, charlen=16)
-                if not isinstance(auxname, str):
-                    auxname = auxname.decode()
-                l.append((auxname, self.realtype))
-            dtype = np.dtype(l)
-            nlist = binaryread(self.file, np.int32)[0]
-            data = binaryread(self.file, dtype, shape=(nlist,))
+        # imeth 6 and 7
+        else:
             if self.verbose:
                 if full3D:
                     s += 'full 3D arrays not supported for ' + \
                          'imeth = {}'.format(imeth)
                 else:
-                    s += 'a numpy recarray of size (' + str(nlist) + ', 2)'
+                    s += 'a numpy recarray of size (' + str(len(data)) + \
+                         ', 2)'
                 print(s)
             if full3D:
                 raise ValueError(s)
             else:
-                return data.view(np.recarray)
+                return data
 
-        # imeth 7
-        elif imeth == 7:
-            # read rest of list data
+    def _read_record(self, idx):
+        """
+        Read the data of a record from the file, or get a copy of it from
+        the cache.  Records are returned as they are stored in the file:
+        arrays for imeth 0, 1 and 4, a list of the layer and data arrays for
+        imeth 3, and recarrays for the list records.
+
+        """
+        if self.cache is not None:
+            data = self.cache.get(idx)
+            if data is not None:
+                return self._copy_record(data)
+
+        header = self.recordarray[idx]
+        self.file.seek(np.long(self.iposarray[idx]), 0)
+        imeth = header['imeth']
+        nlay = abs(header['nlay'])
+        nrow = header['nrow']
+        ncol = header['ncol']
+        if imeth == 0 or imeth == 1:
+            data = binaryread(self.file, self.realtype(1),
+                              shape=(nlay, nrow, ncol))
+        elif imeth == 2:
+            nlist = binaryread(self.file, np.int32)[0]
+            dtype = np.dtype([('node', np.int32), ('q', self.realtype)])
+            data = binaryread(self.file, dtype, shape=(nlist,))
+            data = data.view(np.recarray)
+        elif imeth == 3:
+            ilayer = binaryread(self.file, np.int32, shape=(nrow, ncol))
+            data = binaryread(self.file, self.realtype(1), shape=(nrow, ncol))
+            data = [ilayer, data]
+        elif imeth == 4:
+            data = binaryread(self.file, self.realtype(1), shape=(nrow, ncol))
+        elif imeth == 5 or imeth == 6 or imeth == 7:
             nauxp1 = binaryread(self.file, np.int32)[0]
             naux = nauxp1 - 1
-            l = [('node', np.int32), ('node2', np.int32), ('q', self.realtype)]
+            l = [('node', np.int32), ('q', self.realtype)]
+            if imeth == 7:
+                l.insert(1, ('node2', np.int32))
             for i in range(naux):
                 auxname = binaryread(self.file, str, charlen=16)
                 if not isinstance(auxname, str):
@@ -1225,24 +1795,23 @@ class CellBudgetFile(object):
             dtype = np.dtype(l)
             nlist = binaryread(self.file, np.int32)[0]
             data = binaryread(self.file, dtype, shape=(nlist,))
-            if self.verbose:
-                if full3D:
-                    s += 'full 3D arrays not supported for ' + \
-                         'imeth = {}'.format(imeth)
-                else:
-                    s += 'a numpy recarray of size (' + str(nlist) + ', 2)'
-                print(s)
-            if full3D:
-                raise ValueError(s)
-            else:
-                return data.view(np.recarray)
+            data = data.view(np.recarray)
         else:
             raise ValueError('invalid imeth value - {}'.format(imeth))
 
-        # should not reach this point
-        return
+        if self.cache is not None:
+            self.cache.put(idx, data)
+            data = self._copy_record(data)
+        return data
+
+    @staticmethod
+    def _copy_record(data):
+        """copy a cached record, so that the cache is not modified"""
+        if isinstance(data, list):
+            return [a.copy() for a in data]
+        return data.copy()
 
-    def create3D(self, data, nlay, nrow, ncol):
+    def create3D(self, data, nlay, nrow, ncol, out=None):
         """
         Convert a dictionary of {node: q, ...} into a numpy masked array.
         In most cases this should not be called directly by the user unless
@@ -1257,19 +1826,50 @@ class CellBudgetFile(object):
         nlay, nrow, ncol : int
             Number of layers, rows, and columns of the model grid.
 
+        out : numpy array or masked array
+            Preallocated array of shape (nlay, nrow, ncol) for the result.
+            The flows of a masked array are masked for cells that are not
+            in data; the flows of other arrays are zero for these cells.
+            (Default is None, which creates a new float32 masked array.)
+
         Returns
         ----------
         out : numpy masked array
-            List contains unique simulation times (totim) in binary file.
+            Flows of the cells, summed for cells that are listed more than
+            once.
+
+        """
+        out, flat, mask = self._get_full3D_out(out, nlay, nrow, ncol)
+        idx = np.asarray(data['node']) - 1
+        np.add.at(flat, idx, data['q'])
+        if mask is not None:
+            mask[idx] = False
+        return out
+
+    @staticmethod
+    def _get_full3D_out(out, nlay, nrow, ncol):
+        """
+        Reset or create the array for a full3D record and return it with
+        flat views of its values and mask (None for unmasked arrays).
 
         """
-        out = np.ma.zeros((nlay * nrow * ncol), dtype=np.float32)
-        out.mask = True
-        for [node, q] in zip(data['node'], data['q']):
-            idx = node - 1
-            out.data[idx] += q
-            out.mask[idx] = False
-        return np.ma.reshape(out, (nlay, nrow, ncol))
+        shape = (nlay, nrow, ncol)
+        if out is None:
+            out = np.ma.zeros(shape, dtype=np.float32)
+        elif out.shape != shape:
+            raise ValueError('out must have shape {}, not {}'.format(
+                shape, out.shape))
+        elif not out.flags['C_CONTIGUOUS']:
+            raise ValueError('out must be C contiguous')
+        mask = None
+        if isinstance(out, np.ma.MaskedArray):
+            out.mask = True
+            mask = out.mask.reshape(-1)
+            flat = out.data.reshape(-1)
+        else:
+            flat = out.reshape(-1)
+        flat[:] = 0.
+        return out, flat, mask
 
     def get_times(self):
         """
@@ -1300,5 +1900,7 @@ class CellBudgetFile(object):
         """
         Close the file handle
         """
-        self.file.close()
+        self._file.close()
+        if self._handles is not None:
+            self._handles.close()
         return
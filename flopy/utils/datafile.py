@@ -5,6 +5,8 @@ abstract classes that should not be directly accessed.
 """
 from __future__ import print_function
 import os
+import threading
+from collections import OrderedDict
 import numpy as np
 import flopy.utils
 
@@ -78,6 +80,178 @@ class Header(object):
             return self.header[0]
 
 
+class RecordCache(object):
+    """
+    Bounded least recently used (LRU) cache of the records that have been
+    read from an output file, keyed by record index.  The least recently
+    used records are removed when the total size of the cached records is
+    larger than maxbytes.
+
+    Parameters
+    ----------
+    maxbytes : int
+        Maximum total size in bytes of the cached records.
+
+    Attributes
+    ----------
+    nbytes : int
+        Total size in bytes of the cached records.
+    hits : int
+        Number of records that were found in the cache.
+    misses : int
+        Number of records that were not found in the cache.
+    evictions : int
+        Number of records that were removed from the cache.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> hdobj = flopy.utils.HeadFile('model.hds', cache_size=100e6)
+    >>> h = hdobj.get_data(totim=100.)
+    >>> h = hdobj.get_data(totim=100.)
+    >>> hdobj.cache.get_stats()
+
+    """
+
+    def __init__(self, maxbytes):
+        self.maxbytes = int(maxbytes)
+        self._records = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def get(self, key):
+        """
+        Get a cached record, or None if the record is not in the cache.
+
+        """
+        with self._lock:
+            try:
+                value, nbytes = self._records.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            # most recently used records are at the end
+            self._records[key] = (value, nbytes)
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Add a record (an array or a list of arrays) to the cache.  Records
+        that are larger than maxbytes are not cached.
+
+        """
+        if isinstance(value, (list, tuple)):
+            nbytes = sum(v.nbytes for v in value)
+        else:
+            nbytes = value.nbytes
+        with self._lock:
+            if key in self._records:
+                self.nbytes -= self._records.pop(key)[1]
+            if nbytes > self.maxbytes:
+                return
+            self._records[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.maxbytes:
+                value, nbytes = self._records.popitem(last=False)[1]
+                self.nbytes -= nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all of the records from the cache.
+
+        """
+        with self._lock:
+            self._records.clear()
+            self.nbytes = 0
+
+    def get_stats(self):
+        """
+        Get the cache statistics.
+
+        Returns
+        ----------
+        out : dict
+            Dictionary with the number of records (nrecords), their size
+            (nbytes), maxbytes, and the hits, misses and evictions.
+
+        """
+        return {'nrecords': len(self._records), 'nbytes': self.nbytes,
+                'maxbytes': self.maxbytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+class FileHandlePool(object):
+    """
+    Binary file handles for each thread that reads a file.  A file is
+    opened the first time that it is read by a thread, and the handle is
+    reused for later reads of the thread.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file.
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._files = []
+
+    def get(self):
+        """
+        Get the file handle of the current thread.
+
+        """
+        f = getattr(self._local, 'file', None)
+        if f is None or f.closed:
+            f = open(self.filename, 'rb')
+            self._local.file = f
+            with self._lock:
+                self._files.append(f)
+        return f
+
+    def close(self):
+        """
+        Close the file handles of all of the threads.
+
+        """
+        with self._lock:
+            for f in self._files:
+                f.close()
+            self._files = []
+        return
+
+
+def _run_in_executor(reader, func, executor, *args, **kwargs):
+    """
+    Call a method of a file reader in an executor, with the reader in
+    thread safe mode, and return an asyncio future for the result.
+
+    """
+    import asyncio
+    import functools
+    if reader._handles is None:
+        # the threads of the executor need their own file handles
+        reader.set_thread_safe(True)
+    loop = asyncio.get_event_loop()
+    return loop.run_in_executor(executor,
+                                functools.partial(func, *args, **kwargs))
+
+
 class LayerFile(object):
     """
     The LayerFile class is the abstract base class from which specific derived
@@ -119,12 +293,18 @@ class LayerFile(object):
             self.sr = self.dis.parent.sr
         if 'sr' in kwargs.keys():
             self.sr = kwargs.pop('sr')
+        self.cache = None
+        if 'cache_size' in kwargs.keys():
+            self.set_cache(kwargs.pop('cache_size'))
+        self._handles = None
+        thread_safe = kwargs.pop('thread_safe', False)
         if len(kwargs.keys()) > 0:
             args = ','.join(kwargs.keys())
             raise Exception('LayerFile error: unrecognized kwargs: ' + args)
 
         # read through the file and build the pointer index
         self._build_index()
+        self.set_thread_safe(thread_safe)
 
         # now that we read the data and know nrow and ncol,
         # we can make a generic sr if needed
@@ -298,6 +478,41 @@ class LayerFile(object):
         raise Exception(
             'Abstract method _build_index called in LayerFile.  This method needs to be overridden.')
 
+    @property
+    def file(self):
+        """
+        The file handle, or the file handle of the current thread if the
+        file is read in thread safe mode.
+
+        """
+        handles = getattr(self, '_handles', None)
+        if handles is not None:
+            return handles.get()
+        return self._file
+
+    @file.setter
+    def file(self, f):
+        self._file = f
+
+    def set_thread_safe(self, thread_safe=True):
+        """
+        Read the file with a separate file handle for each thread, so that
+        more than one thread can get data at the same time.
+
+        Parameters
+        ----------
+        thread_safe : bool
+            If True, each thread opens and uses its own file handle.  If
+            False, all threads share one file handle.  (Default is True.)
+
+        """
+        if self._handles is not None:
+            self._handles.close()
+            self._handles = None
+        if thread_safe:
+            self._handles = FileHandlePool(self.filename)
+        return
+
     def list_records(self):
         """
         Print a list of all of the records in the file
@@ -308,6 +523,24 @@ class LayerFile(object):
             print(header)
         return
 
+    def set_cache(self, cache_size):
+        """
+        Cache the records that are read from the file.
+
+        Parameters
+        ----------
+        cache_size : int
+            Maximum size in bytes of the cache of the records that have been
+            read.  The least recently used records are removed from the
+            cache first.  If None, the records are not cached.
+
+        """
+        if cache_size is None:
+            self.cache = None
+        else:
+            self.cache = RecordCache(cache_size)
+        return
+
     def _get_data_array(self, totim=0):
         """
         Get the three dimensional data array for the
@@ -328,12 +561,26 @@ class LayerFile(object):
                         dtype=self.realtype)
         data[:, :, :] = np.nan
         for idx in keyindices:
-            ipos = self.iposarray[idx]
             ilay = self.recordarray['ilay'][idx]
-            if self.verbose:
-                print('Byte position in file: {0}'.format(ipos))
-            self.file.seek(ipos, 0)
-            data[ilay - 1, :, :] = self._read_data()
+            data[ilay - 1, :, :] = self._read_record(idx)
+        return data
+
+    def _read_record(self, idx):
+        """
+        Read the 2-D data array of a record, or get it from the cache.
+
+        """
+        if self.cache is not None:
+            data = self.cache.get(idx)
+            if data is not None:
+                return data
+        ipos = self.iposarray[idx]
+        if self.verbose:
+            print('Byte position in file: {0}'.format(ipos))
+        self.file.seek(ipos, 0)
+        data = self._read_data()
+        if self.cache is not None:
+            self.cache.put(idx, data)
         return data
 
     def get_times(self):
@@ -421,6 +668,64 @@ class LayerFile(object):
         else:
             return data[mflay, :, :]
 
+    def aget_data(self, kstpkper=None, idx=None, totim=None, mflay=None,
+                  executor=None):
+        """
+        Get data from the file without blocking the asyncio event loop.
+        The data are read by get_data() in an executor, with the file in
+        thread safe mode, so that many records can be read at the same
+        time.
+
+        Parameters
+        ----------
+        kstpkper, idx, totim, mflay :
+            See get_data().
+        executor : concurrent.futures.ThreadPoolExecutor
+            Executor for the reads.  (Default is None, which uses the
+            default executor of the event loop.)
+
+        Returns
+        ----------
+        future : asyncio.Future
+            Future for the array returned by get_data().
+
+        Examples
+        --------
+
+        >>> import asyncio
+        >>> import flopy
+        >>> hdobj = flopy.utils.HeadFile('model.hds')
+        >>> futures = [hdobj.aget_data(totim=t) for t in hdobj.get_times()]
+        >>> loop = asyncio.get_event_loop()
+        >>> heads = loop.run_until_complete(asyncio.gather(*futures))
+
+        """
+        return _run_in_executor(self, self.get_data, executor,
+                                kstpkper=kstpkper, idx=idx, totim=totim,
+                                mflay=mflay)
+
+    def aget_ts(self, idx, executor=None):
+        """
+        Get a time series from the file without blocking the asyncio event
+        loop.  The time series is read by get_ts() in an executor, with the
+        file in thread safe mode.
+
+        Parameters
+        ----------
+        idx : tuple of ints, or a list of a tuple of ints
+            See get_ts().
+        executor : concurrent.futures.ThreadPoolExecutor
+            Executor for the reads.  (Default is None, which uses the
+            default executor of the event loop.)
+
+        Returns
+        ----------
+        future : asyncio.Future
+            Future for the array returned by get_ts().
+
+        """
+        return _run_in_executor(self, self.get_ts, executor, idx)
+
     def get_alldata(self, mflay=None, nodata=-9999):
         """
         Get all of the data from the file.
@@ -509,5 +814,7 @@ class LayerFile(object):
         Close the file handle.
 
         """
-        self.file.close()
+        self._file.close()
+        if self._handles is not None:
+            self._handles.close()
         return
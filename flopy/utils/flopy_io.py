@@ -168,6 +168,82 @@ def read_fixed_var(line, ncol=1, length=10, ipos=None, free=False):
             istart = istop
     return out
 
+def read_list_block(lines, dtype, length=10):
+    """
+    Convert a block of MODFLOW list input lines (for example, the itmp
+    records of a stress period) to a numpy recarray.
+
+    Each line is read as free format if all of its values can be
+    converted, and as fixed format, with columns of width length,
+    otherwise. Blocks where every line is free format, or every line is
+    too short to be free format, are converted with a single numpy call;
+    other blocks are parsed line by line.
+
+    Parameters
+    ----------
+    lines : list of str
+        lines of text containing one list record per line. Values past
+        the number of fields in dtype are ignored.
+    dtype : np.dtype
+        dtype of the recarray to return.
+    length : int
+        length of each column for fixed format lines. (default is 10)
+
+    Returns
+    -------
+    ra : np.recarray
+        recarray of length len(lines) with the parsed records.
+
+    """
+    dtype = np.dtype(dtype)
+    names = dtype.names
+    ncol = len(names)
+    nrec = len(lines)
+    ra = np.recarray(nrec, dtype=dtype)
+    if nrec == 0:
+        return ra
+
+    tokens = [line.split() for line in lines]
+    nvalues = np.array([len(t) for t in tokens])
+    values = None
+    # non-numeric fields can not be converted in bulk
+    if all(dtype[name].kind in 'iuf' for name in names):
+        try:
+            if nvalues.min() >= ncol:
+                values = _list_block_free(tokens, ncol)
+            elif nvalues.max() < ncol:
+                values = _list_block_fixed(lines, ncol, length)
+        except ValueError:
+            values = None
+
+    if values is None:
+        for irec, (line, t) in enumerate(zip(lines, tokens)):
+            try:
+                ra[irec] = tuple(t[:ncol])
+            except ValueError:
+                t = read_fixed_var(line, ncol=ncol, length=length)
+                ra[irec] = tuple(t[:ncol])
+        return ra
+    for icol, name in enumerate(names):
+        ra[name] = values[:, icol]
+    return ra
+
+def _list_block_free(tokens, ncol):
+    """convert the first ncol values of each line to a 2-D float array."""
+    # values past ncol (auxiliary data, comments, etc.) are stripped;
+    # unlike np.fromstring, astype raises for values that can not be
+    # converted (1.0D+02, fixed format values that run together, etc.)
+    return np.array([t[:ncol] for t in tokens]).astype(np.float64)
+
+def _list_block_fixed(lines, ncol, length):
+    """parse a block of fixed format list lines to a 2-D float array."""
+    fields = np.array([[line[i * length:(i + 1) * length]
+                        for i in range(ncol)] for line in lines])
+    fields = np.char.strip(fields)
+    # blank fixed format fields are zero
+    fields[fields == ''] = '0'
+    return fields.astype(np.float64)
+
 def flux_to_wel(cbc_file,text,precision="single",model=None,verbose=False):
     """
     Convert flux in a binary cell budget file to a wel instance
@@ -191,39 +267,42 @@ def flux_to_wel(cbc_file,text,precision="single",model=None,verbose=False):
     from ..modflow import Modflow, ModflowWel
     cbf = CBF(cbc_file,precision=precision,verbose=verbose)
 
-    # create a empty numpy array of shape (time,layer,row,col)
-    m4d = np.zeros((cbf.nper,cbf.nlay,cbf.nrow,cbf.ncol),dtype=np.float32)
-    m4d[:] = np.NaN
-
-    # process the records in the cell budget file
-    iper = -1
-    for kstpkper in cbf.kstpkper:
-
-        kstpkper = (kstpkper[0]-1,kstpkper[1]-1)
+    # sparse (node, flux) data of the first time step of each stress
+    # period, stress periods without records have no wells
+    sparse = {}
+    for kper in range(cbf.nper):
+        sparse[kper] = (np.zeros(0, dtype=np.int),
+                        {"flux": np.zeros(0, dtype=np.float32)})
+    visited = set()
+    for kstpkper in cbf.get_kstpkper():
         kper = kstpkper[1]
-        #if we haven't visited this kper yet
-        if kper != iper:
-            arr = cbf.get_data(kstpkper=kstpkper,text=text,full3D=True)
-            if len(arr) > 0:
-                arr = arr[0]
-                print(arr.max(),arr.min(),arr.sum())
-                # masked where zero
-                arr[np.where(arr==0.0)] = np.NaN
-                m4d[iper+1] = arr
-            iper += 1
-
-
+        if kper in visited:
+            continue
+        visited.add(kper)
+        recs = cbf.get_data(kstpkper=kstpkper, text=text)
+        if len(recs) == 0:
+            continue
+        rec = recs[0]
+        if isinstance(rec, np.recarray) and "node" in rec.dtype.names:
+            # compact budget list (one-based node, q), summed for cells
+            # that are listed more than once
+            node, inv = np.unique(rec["node"] - 1, return_inverse=True)
+            q = np.bincount(inv, weights=rec["q"])
+        else:
+            arr = cbf.get_data(kstpkper=kstpkper, text=text, full3D=True)[0]
+            q = np.ma.filled(arr, 0.).ravel()
+            node = np.arange(q.shape[0])
+        # cells without flux are skipped
+        keep = (q != 0.) & ~np.isnan(q)
+        sparse[kper] = (node[keep], {"flux": q[keep]})
 
     # model wasn't passed, then create a generic model
     if model is None:
         model = Modflow("test")
-    # if model doesn't have a wel package, then make a generic one...
-    # need this for the from_m4d method
-    if model.wel is None:
-        ModflowWel(model)
 
     # get the stress_period_data dict {kper:np recarray}
-    sp_data = MfList.from_4d(model,"WEL",{"flux":m4d})
+    sp_data = MfList.sparse_to_stress_period_data(
+        ModflowWel.get_default_dtype(), sparse, cbf.nrow, cbf.ncol)
 
     wel = ModflowWel(model,stress_period_data=sp_data)
     return wel
@@ -6,6 +6,8 @@ important classes that can be accessed by the user.
 
 """
 
+import re
+from collections import OrderedDict
 import numpy as np
 from ..utils.datafile import Header, LayerFile
 
@@ -26,6 +28,21 @@ def is_float(s):
         return False
 
 
+def _fortran_format(format_string):
+    """
+    Get the number of values on each line and the field width of a Fortran
+    real format, for example (10, 10) for (10F10.3) or (10, 12) for
+    (1P10E12.5).  None is returned for formats that are not recognized.
+
+    """
+    m = re.match(r'\(\s*(?:\d*P\s*,?)?\s*(\d*)\s*[EFGD][SN]?(\d+)',
+                 format_string.upper())
+    if m is None:
+        return None
+    nval = int(m.group(1)) if m.group(1) else 1
+    return nval, int(m.group(2))
+
+
 class FormattedHeader(Header):
     """
     The TextHeader class is a class to read in headers from MODFLOW
@@ -171,60 +188,50 @@ class FormattedLayerFile(LayerFile):
         Read 2-D data from file
 
         """
+        result = self._read_values(self._data_size, self.nrow * self.ncol)
+        return result.reshape(self.nrow, self.ncol)
 
-        current_row = 0
-        current_col = 0
-        result = np.empty((self.nrow, self.ncol), self.realtype)
-        # Loop until all data retreived or eof
-        while (
-                current_row < self.nrow or current_col < self.ncol) and self.file.tell() != self.totalbytes:
-            line = self.file.readline()
-
-            # Read data into 2-D array
-            arrline = line.split()
-            for val in arrline:
-                if not is_float(val):
-                    raise Exception(
-                        'Invalid data encountered while reading data file.' +
-                        ' Unable to convert data to float.')
-                result[current_row, current_col] = float(val)
-                current_col += 1
-                if current_col >= self.ncol:
-                    current_row += 1
-                    if current_row < self.nrow:
-                        current_col = 0
-
-        if current_row < self.nrow - 1 or current_col < self.ncol - 1:
-            raise Exception('Unexpected end of file while reading data.')
-
-        return result
-
-    def _read_val(self, i):
+    def _read_values(self, nbytes, nval):
         """
-        Read ith data value from file
+        Read a block of nval values that takes nbytes in the file, starting
+        at the current file position, with one vectorized conversion.
 
         """
-        current_col = 0
-        result = None
-        # Loop until data retreived or eof
-        while (
-                current_col < self.ncol - 1 or self.file.tell() == self.totalbytes) and current_col <= i:
-            line = self.file.readline()
-            arrline = line.split()
-            for val in arrline:
-                if not is_float(val):
-                    raise Exception(
-                        'Invalid data encountered while reading data file.' +
-                        ' Unable to convert data to float.')
-                result = float(val)
-                current_col = current_col + 1
-                if current_col > i:
-                    break
-
-        if (current_col < self.ncol - 1) and (current_col < i):
+        block = self.file.read(nbytes)
+        result = np.fromstring(block, dtype=self.realtype, sep=' ')
+        # np.fromstring stops without an error at text that it can not
+        # read, which leaves too few values unless the text is in the last
+        # value, so the last value is converted again to check it
+        if result.shape[0] < nval or \
+                not is_float(block.rsplit(None, 1)[-1]):
+            # values that are not separated by spaces, D exponents, etc.
+            result = self._read_fixed_width(block)
+        if result.shape[0] < nval:
             raise Exception('Unexpected end of file while reading data.')
+        return result[:nval]
 
-        return result
+    def _read_fixed_width(self, block):
+        """
+        Read the values of a block with the field width of the Fortran
+        format in the header
+
+        """
+        errmsg = 'Invalid data encountered while reading data file.' + \
+                 ' Unable to convert data to float.'
+        fmt = _fortran_format(self.header.format_string)
+        if fmt is None:
+            raise Exception(errmsg)
+        width = fmt[1]
+        fields = []
+        for line in block.splitlines():
+            line = line.rstrip()
+            fields += [line[i:i + width].replace(b'D', b'E')
+                       for i in range(0, len(line), width)]
+        try:
+            result = np.array(fields, dtype=np.float64)
+        except ValueError:
+            raise Exception(errmsg)
+        return result.astype(self.realtype)
 
     def get_ts(self, idx):
         """
@@ -262,35 +269,31 @@ class FormattedLayerFile(LayerFile):
         # Initialize result array and put times in first column
         result = self._init_result(nstation)
 
-        istat = 1
-        for k, i, j in kijlist:
-            recordlist = []
-            ioffset_col = (i * self._col_data_size)
-            for irec, header in enumerate(self.recordarray):
-                ilay = header[
-                           'ilay'] - 1  # change ilay from header to zero-based
-                if ilay != k:
+        # time index of each record
+        itims = [np.where(result[:, 0] == totim)[0]
+                 for totim in self.recordarray['totim']]
+        ilays = self.recordarray['ilay'] - 1
+
+        # stations in each model row, so that each row of a record is read
+        # only once
+        rows = OrderedDict()
+        for istat, (k, i, j) in enumerate(kijlist):
+            rows.setdefault((k, i), []).append((istat + 1, j))
+
+        for (k, i), stations in rows.items():
+            istat = [s[0] for s in stations]
+            jj = [s[1] for s in stations]
+            ioffset_col = i * self._col_data_size
+            for irec in np.where(ilays == k)[0]:
+                if len(itims[irec]) == 0:
                     continue
-                ipos = self.iposarray[irec]
-
-                # Calculate offset necessary to reach intended column
-                self.file.seek(ipos + ioffset_col, 0)
-
-                # Find the time index and then put value into result in the
-                # correct location.
-                itim = np.where(result[:, 0] == header['totim'])[0]
-                result[itim, istat] = self._read_val(j)
-            istat += 1
+                # Calculate offset necessary to reach intended row
+                self.file.seek(self.iposarray[irec] + ioffset_col, 0)
+                values = self._read_values(self._col_data_size, self.ncol)
+                for itim in itims[irec]:
+                    result[itim, istat] = values[jj]
         return result
 
-    def close(self):
-        """
-        Close the file handle.
-
-        """
-        self.file.close()
-        return
-
 
 class FormattedHeadFile(FormattedLayerFile):
     """
@@ -306,6 +309,14 @@ class FormattedHeadFile(FormattedLayerFile):
         'single' or 'double'.  Default is 'single'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_size : int
+        Maximum size in bytes of a least recently used cache of the records
+        that have been read (see RecordCache).  Default is None (records
+        are not cached).
+    thread_safe : bool
+        If True, each thread that reads data uses its own file handle, so
+        that the object can be used from more than one thread at the same
+        time.  Default is False.
 
     Attributes
     ----------
@@ -364,17 +375,24 @@ class FormattedHeadFile(FormattedLayerFile):
 
         """
         start_pos = self.file.tell()
-        data_count = 0
-        # Loop through data until at end of column
-        while data_count < header['ncol']:
-            column_data = self.file.readline()
-            arr_column_data = column_data.split()
-            data_count += len(arr_column_data)
-
-        if data_count != header['ncol']:
-            raise Exception(
-                'Unexpected data formatting in head file.  Expected %d columns, but found %d.' %
-                header['ncol'], data_count)
+        fmt = _fortran_format(self.header.format_string)
+        if fmt is not None:
+            # lines of each model row from the format, which also works for
+            # values that are not separated by spaces
+            for i in range(-(-header['ncol'] // fmt[0])):
+                self.file.readline()
+        else:
+            data_count = 0
+            # Loop through data until at end of column
+            while data_count < header['ncol']:
+                column_data = self.file.readline()
+                arr_column_data = column_data.split()
+                data_count += len(arr_column_data)
+
+            if data_count != header['ncol']:
+                raise Exception(
+                    'Unexpected data formatting in head file.  Expected %d columns, but found %d.' %
+                    (header['ncol'], data_count))
 
         # Calculate seek distance based on data size
         stop_pos = self.file.tell()
@@ -8,6 +8,7 @@ from ..modflow.mfdisu import ModflowDisU
 from .util_array import read1d, Util2d
 from ..export.shapefile_utils import shp2recarray
 from ..mbase import which
+from .gridintersect import GridIntersect
 
 try:
     import shapefile
@@ -121,6 +122,7 @@ class Gridgen(object):
         self.nja = 0
         self.nodelay = np.zeros((dis.nlay), dtype=np.int)
         self._vertdict = {}
+        self._intersectors = {}
         self.dis = dis
         self.model_ws = model_ws
         exe_name = which(exe_name)
@@ -343,6 +345,7 @@ class Gridgen(object):
 
         # Create a dictionary that relates nodenumber to vertices
         self._mkvertdict()
+        self._intersectors = {}
 
         # read and save nodelay array to self
         fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
@@ -916,7 +919,7 @@ class Gridgen(object):
         f.close()
         return
 
-    def intersect(self, features, featuretype, layer):
+    def intersect(self, features, featuretype, layer, use_gridgen=False):
         """
         Parameters
         ----------
@@ -927,6 +930,11 @@ class Gridgen(object):
             Must be either 'point', 'line', or 'polygon'
         layer : int
             Layer (zero based) to intersect with.  Zero based.
+        use_gridgen : bool
+            If True, the intersection is calculated by the gridgen program.
+            If False, the intersection is calculated in python using
+            flopy.utils.gridintersect.GridIntersect, which is much faster
+            when many intersections are calculated. (default is False)
 
         Returns
         -------
@@ -934,6 +942,12 @@ class Gridgen(object):
             Recarray of the intersection properties.
 
         """
+        if not use_gridgen:
+            if isinstance(features, str):
+                features = os.path.join(self.model_ws, features)
+            return self.get_intersector(layer).intersect(features,
+                                                         featuretype)
+
         ifname = 'intersect_feature'
         if isinstance(features, list):
             ifname_w_path = os.path.join(self.model_ws, ifname)
@@ -987,6 +1001,30 @@ class Gridgen(object):
         result['nodenumber'] -= 1
         return result
 
+    def get_intersector(self, layer):
+        """
+        Return a GridIntersect instance for the cells in a layer of the
+        quadtree grid. The instance is created the first time it is needed
+        and then reused until the grid is built again.
+
+        Parameters
+        ----------
+        layer : int
+            Layer (zero based)
+
+        Returns
+        -------
+        intersector : flopy.utils.gridintersect.GridIntersect
+
+        """
+        if layer not in self._intersectors:
+            istart = self.nodelay[:layer].sum()
+            nodes = np.arange(istart, istart + self.nodelay[layer])
+            polygons = [self.get_vertices(n) for n in nodes]
+            self._intersectors[layer] = GridIntersect(polygons,
+                                                      nodenumbers=nodes)
+        return self._intersectors[layer]
+
     def _intersection_block(self, shapefile, featuretype, layer):
         s = ''
         s += 'BEGIN GRID_INTERSECTION intersect' + '\n'
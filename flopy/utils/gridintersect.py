@@ -0,0 +1,904 @@
+"""
+Module for intersecting point, line, and polygon features with model grids.
+
+The intersections are calculated in python, without the gridgen program,
+using a spatial index of the cell bounding boxes. Structured grids
+(SpatialReference), unstructured grids (SpatialReferenceUnstructured), and
+lists of cell polygons (for example, the cells of a gridgen quadtree grid)
+are supported.
+
+"""
+import os
+import numpy as np
+
+
+class CellIndex(object):
+    """
+    Spatial index of the cells of a model grid.
+
+    The bounding boxes of the cells are assigned to the buckets of a
+    uniform grid that covers the model, so that the cells near a point or a
+    bounding box can be found without testing every cell.
+
+    Parameters
+    ----------
+    xv : ndarray
+        Two-dimensional array of shape (ncells, nv) with the x coordinates of
+        the vertices of each cell. The vertices of each cell must form a
+        closed ring (first vertex repeated at the end); short rings are
+        padded by repeating the last vertex.
+    yv : ndarray
+        Two-dimensional array of shape (ncells, nv) with the y coordinates of
+        the vertices of each cell.
+
+    xc : ndarray
+        x coordinates of the cell centers, used to find the nearest cell.
+        The default is the center of the bounding box of each cell.
+    yc : ndarray
+        y coordinates of the cell centers, used to find the nearest cell.
+        The default is the center of the bounding box of each cell.
+
+    Attributes
+    ----------
+    ncells : int
+        Number of cells in the index
+    bounds : ndarray
+        Array of shape (ncells, 4) with xmin, xmax, ymin, ymax for each cell
+    tol : float
+        Distance within which a point is on the edge of a cell. The
+        tolerance is relative to the size and the coordinates of the grid.
+
+    """
+
+    def __init__(self, xv, yv, xc=None, yc=None):
+        self.xv = np.asarray(xv, dtype=np.float64)
+        self.yv = np.asarray(yv, dtype=np.float64)
+        self.ncells = self.xv.shape[0]
+        self.bounds = np.column_stack((self.xv.min(axis=1),
+                                       self.xv.max(axis=1),
+                                       self.yv.min(axis=1),
+                                       self.yv.max(axis=1)))
+        if xc is None:
+            xc = 0.5 * (self.bounds[:, 0] + self.bounds[:, 1])
+        if yc is None:
+            yc = 0.5 * (self.bounds[:, 2] + self.bounds[:, 3])
+        self.xc = np.asarray(xc, dtype=np.float64)
+        self.yc = np.asarray(yc, dtype=np.float64)
+        extent = max(self.bounds[:, 1].max() - self.bounds[:, 0].min(),
+                     self.bounds[:, 3].max() - self.bounds[:, 2].min())
+        self.tol = 1e-9 * max(extent, np.abs(self.bounds).max(), 1.)
+        self._center_ptr = None
+        self._build_buckets()
+
+    @classmethod
+    def from_polygons(cls, polygons):
+        """
+        Create an index from a list of cell polygons.
+
+        Parameters
+        ----------
+        polygons : list
+            List with a sequence of (x, y) vertices for each cell.
+
+        """
+        rings = []
+        for polygon in polygons:
+            ring = np.asarray(polygon, dtype=np.float64)[:, :2]
+            if not np.array_equal(ring[0], ring[-1]):
+                ring = np.vstack((ring, ring[:1]))
+            rings.append(ring)
+        nv = max(ring.shape[0] for ring in rings)
+        xv = np.empty((len(rings), nv), dtype=np.float64)
+        yv = np.empty((len(rings), nv), dtype=np.float64)
+        for icell, ring in enumerate(rings):
+            n = ring.shape[0]
+            xv[icell, :n] = ring[:, 0]
+            yv[icell, :n] = ring[:, 1]
+            xv[icell, n:] = ring[-1, 0]
+            yv[icell, n:] = ring[-1, 1]
+        return cls(xv, yv)
+
+    @classmethod
+    def from_iverts(cls, verts, iverts, xc=None, yc=None):
+        """
+        Create an index from a vertex array and lists of vertex numbers.
+
+        Parameters
+        ----------
+        verts : ndarray
+            Two-dimensional array of x and y vertex coordinates.
+        iverts : list of lists
+            List of (zero-based) vertex numbers for each cell.
+        xc, yc : ndarray
+            Cell center coordinates (optional)
+
+        """
+        verts = np.asarray(verts, dtype=np.float64)
+        nv = np.array([len(iv) for iv in iverts], dtype=np.int)
+        # close the rings that do not repeat the first vertex
+        closed = np.array([iv[0] == iv[-1] for iv in iverts], dtype=bool)
+        nv += ~closed
+        idx = np.empty((len(iverts), nv.max()), dtype=np.int)
+        for icell, iv in enumerate(iverts):
+            n = len(iv)
+            idx[icell, :n] = iv
+            idx[icell, n:] = iv[0]
+        return cls(verts[idx, 0], verts[idx, 1], xc=xc, yc=yc)
+
+    @classmethod
+    def from_spatialreference(cls, sr):
+        """
+        Create an index of the cells of a structured grid. Cells are
+        numbered by row (node = row * ncol + column).
+
+        Parameters
+        ----------
+        sr : flopy.utils.reference.SpatialReference
+
+        """
+        xg, yg = sr.xgrid, sr.ygrid
+        xv = np.stack((xg[:-1, :-1], xg[:-1, 1:], xg[1:, 1:], xg[1:, :-1],
+                       xg[:-1, :-1]), axis=-1).reshape(-1, 5)
+        yv = np.stack((yg[:-1, :-1], yg[:-1, 1:], yg[1:, 1:], yg[1:, :-1],
+                       yg[:-1, :-1]), axis=-1).reshape(-1, 5)
+        return cls(xv, yv)
+
+    def _build_buckets(self):
+        xmin, xmax = self.bounds[:, 0].min(), self.bounds[:, 1].max()
+        ymin, ymax = self.bounds[:, 2].min(), self.bounds[:, 3].max()
+        width = max(xmax - xmin, 1e-10)
+        height = max(ymax - ymin, 1e-10)
+        # about one bucket per cell
+        nbx = int(np.clip(np.sqrt(self.ncells * width / height), 1,
+                          self.ncells))
+        nby = int(np.clip(self.ncells // nbx, 1, self.ncells))
+        self._origin = (xmin, ymin)
+        self._bsize = (width / nbx, height / nby)
+        self._nb = (nbx, nby)
+
+        # cells are also assigned to the buckets within tol of the cell, so
+        # that points on an edge are tested with all of the cells that share
+        # the edge
+        ix0, iy0 = self._bucket_xy(self.bounds[:, 0] - self.tol,
+                                   self.bounds[:, 2] - self.tol)
+        ix1, iy1 = self._bucket_xy(self.bounds[:, 1] + self.tol,
+                                   self.bounds[:, 3] + self.tol)
+        nx = ix1 - ix0 + 1
+        count = nx * (iy1 - iy0 + 1)
+        cells = np.repeat(np.arange(self.ncells), count)
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count,
+                                               count)
+        bucket = (iy0[cells] + k // nx[cells]) * nbx + ix0[cells] + \
+                 k % nx[cells]
+        # a stable sort keeps the cells of each bucket in node order
+        order = np.argsort(bucket, kind='mergesort')
+        self._bucket_cells = cells[order]
+        self._bucket_ptr = np.zeros(nbx * nby + 1, dtype=np.int)
+        np.cumsum(np.bincount(bucket, minlength=nbx * nby),
+                  out=self._bucket_ptr[1:])
+
+    def _bucket_xy(self, x, y):
+        nbx, nby = self._nb
+        ix = np.floor((x - self._origin[0]) / self._bsize[0])
+        iy = np.floor((y - self._origin[1]) / self._bsize[1])
+        ix = np.clip(ix, 0, nbx - 1).astype(np.int)
+        iy = np.clip(iy, 0, nby - 1).astype(np.int)
+        return ix, iy
+
+    def _point_candidates(self, x, y):
+        """
+        Return pairs of point and cell numbers for the cells whose bucket
+        contains each point.
+
+        """
+        tol = self.tol
+        xmin, xmax = self.bounds[:, 0].min(), self.bounds[:, 1].max()
+        ymin, ymax = self.bounds[:, 2].min(), self.bounds[:, 3].max()
+        ipts = np.where((x >= xmin - tol) & (x <= xmax + tol) &
+                        (y >= ymin - tol) & (y <= ymax + tol))[0]
+        ix, iy = self._bucket_xy(x[ipts], y[ipts])
+        bucket = iy * self._nb[0] + ix
+        start = self._bucket_ptr[bucket]
+        count = self._bucket_ptr[bucket + 1] - start
+        ipt = np.repeat(ipts, count)
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count,
+                                               count)
+        icell = self._bucket_cells[np.repeat(start, count) + k]
+        return ipt, icell
+
+    def contains(self, x, y, cells, chunksize=2 ** 18):
+        """
+        Test if points are inside of cells, using the crossing number
+        (even-odd) rule. Points that are on an edge of a cell (within tol)
+        are inside of the cell.
+
+        Parameters
+        ----------
+        x : ndarray
+            x coordinates of the points
+        y : ndarray
+            y coordinates of the points
+        cells : ndarray
+            cell number to test for each point
+        chunksize : int
+            maximum number of points that are tested at once
+
+        Returns
+        -------
+        inside : ndarray
+            Boolean array that is True for the points that are inside of
+            the corresponding cell.
+
+        """
+        inside, onedge = self._classify(x, y, cells, chunksize)
+        return inside | onedge
+
+    def _classify(self, x, y, cells, chunksize=2 ** 18):
+        """
+        Return arrays that are True for the points that are inside of the
+        corresponding cell by the crossing number rule, and for the points
+        that are on an edge of the cell.
+
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        cells = np.asarray(cells, dtype=np.int)
+        inside = np.zeros(x.shape, dtype=bool)
+        onedge = np.zeros(x.shape, dtype=bool)
+        for i0 in range(0, x.shape[0], chunksize):
+            sl = slice(i0, i0 + chunksize)
+            inside[sl], onedge[sl] = self._contains(x[sl], y[sl], cells[sl])
+        return inside, onedge
+
+    def _contains(self, x, y, cells):
+        xv, yv = self.xv[cells], self.yv[cells]
+        x0, y0 = xv[:, :-1], yv[:, :-1]
+        x1, y1 = xv[:, 1:], yv[:, 1:]
+        px, py = x[:, np.newaxis], y[:, np.newaxis]
+        crosses = (y0 > py) != (y1 > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xint = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+        crosses &= px < xint
+        inside = crosses.sum(axis=1) % 2 == 1
+
+        # distance from the points to the closest point of each edge
+        ex, ey = x1 - x0, y1 - y0
+        l2 = ex ** 2 + ey ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = ((px - x0) * ex + (py - y0) * ey) / l2
+        s = np.clip(np.where(l2 > 0., s, 0.), 0., 1.)
+        d2 = (x0 + s * ex - px) ** 2 + (y0 + s * ey - py) ** 2
+        onedge = (d2 <= self.tol ** 2).any(axis=1)
+        return inside, onedge
+
+    def locate(self, x, y):
+        """
+        Find the cell that contains each point.
+
+        Parameters
+        ----------
+        x : scalar or sequence of x coordinates
+        y : scalar or sequence of y coordinates
+
+        Returns
+        -------
+        cells : ndarray
+            Zero-based cell number for each point. -1 for points that are
+            not in a cell. Points on a shared edge (within tol), including
+            the outer edges of the grid, are assigned to the lowest cell
+            number.
+
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        ipt, icell = self._point_candidates(x, y)
+        inside = self.contains(x[ipt], y[ipt], icell)
+        cells = np.full(x.shape, self.ncells, dtype=np.int)
+        np.minimum.at(cells, ipt[inside], icell[inside])
+        cells[cells == self.ncells] = -1
+        return cells
+
+    def nearest(self, x, y, chunksize=2 ** 16):
+        """
+        Find the cell with the nearest cell center for each point.
+
+        The buckets around each point are searched in rings of increasing
+        size until no bucket that has not been searched can contain a
+        closer cell center.
+
+        Parameters
+        ----------
+        x : scalar or sequence of x coordinates
+        y : scalar or sequence of y coordinates
+        chunksize : int
+            maximum number of points that are searched at once
+
+        Returns
+        -------
+        cells : ndarray
+            Zero-based cell number for each point. Ties are assigned to the
+            lowest cell number.
+
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        if self._center_ptr is None:
+            self._build_center_buckets()
+        cells = np.empty(x.shape, dtype=np.int)
+        for i0 in range(0, x.shape[0], chunksize):
+            sl = slice(i0, i0 + chunksize)
+            cells[sl] = self._nearest(x[sl], y[sl])
+        return cells
+
+    def _build_center_buckets(self):
+        ix, iy = self._bucket_xy(self.xc, self.yc)
+        bucket = iy * self._nb[0] + ix
+        order = np.argsort(bucket, kind='mergesort')
+        self._center_cells = order
+        self._center_ptr = np.zeros(self._nb[0] * self._nb[1] + 1,
+                                    dtype=np.int)
+        np.cumsum(np.bincount(bucket, minlength=self._nb[0] * self._nb[1]),
+                  out=self._center_ptr[1:])
+
+    def _nearest(self, x, y):
+        nbx, nby = self._nb
+        bw, bh = self._bsize
+        x0, y0 = self._origin
+        ix, iy = self._bucket_xy(x, y)
+        best = np.full(x.shape, -1, dtype=np.int)
+        bestd = np.full(x.shape, np.inf)
+        active = np.arange(x.shape[0])
+        r = 0
+        while active.shape[0] > 0:
+            # bucket offsets of ring r
+            if r == 0:
+                dx, dy = np.zeros(1, dtype=np.int), np.zeros(1, dtype=np.int)
+            else:
+                side = np.arange(-r, r + 1)
+                inner = np.arange(-r + 1, r)
+                dx = np.concatenate((side, side, -r + 0 * inner,
+                                     r + 0 * inner))
+                dy = np.concatenate((-r + 0 * side, r + 0 * side, inner,
+                                     inner))
+            bx = ix[active, np.newaxis] + dx
+            by = iy[active, np.newaxis] + dy
+            valid = (bx >= 0) & (bx < nbx) & (by >= 0) & (by < nby)
+            ipt = np.repeat(active, dx.shape[0]).reshape(bx.shape)[valid]
+            bucket = by[valid] * nbx + bx[valid]
+            start = self._center_ptr[bucket]
+            count = self._center_ptr[bucket + 1] - start
+            ipt = np.repeat(ipt, count)
+            k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count,
+                                                   count)
+            icell = self._center_cells[np.repeat(start, count) + k]
+            if icell.shape[0] > 0:
+                d = (x[ipt] - self.xc[icell]) ** 2 + \
+                    (y[ipt] - self.yc[icell]) ** 2
+                d = np.concatenate((d, bestd[active]))
+                ipt = np.concatenate((ipt, active))
+                icell = np.concatenate((icell, best[active]))
+                # closest cell for each point, lowest cell number for ties
+                icell_key = np.where(icell < 0, self.ncells, icell)
+                order = np.lexsort((icell_key, d, ipt))
+                first = np.ones(order.shape, dtype=bool)
+                first[1:] = ipt[order][1:] != ipt[order][:-1]
+                order = order[first]
+                best[ipt[order]] = icell[order]
+                bestd[ipt[order]] = d[order]
+            # distance from each point to the buckets outside of ring r;
+            # sides that are at the edge of the bucket grid are ignored
+            xa, ya = x[active], y[active]
+            ia, ja = ix[active], iy[active]
+            lower = np.full(active.shape, np.inf)
+            lower = np.where(ia - r > 0,
+                             np.minimum(lower, xa - (x0 + (ia - r) * bw)),
+                             lower)
+            lower = np.where(ia + r < nbx - 1,
+                             np.minimum(lower,
+                                        x0 + (ia + r + 1) * bw - xa),
+                             lower)
+            lower = np.where(ja - r > 0,
+                             np.minimum(lower, ya - (y0 + (ja - r) * bh)),
+                             lower)
+            lower = np.where(ja + r < nby - 1,
+                             np.minimum(lower,
+                                        y0 + (ja + r + 1) * bh - ya),
+                             lower)
+            done = np.isinf(lower) | \
+                   ((best[active] >= 0) &
+                    (bestd[active] <= np.maximum(lower, 0.) ** 2))
+            active = active[~done]
+            r += 1
+        return best
+
+    def query_bbox(self, xmin, xmax, ymin, ymax):
+        """
+        Find the cells whose bounding box overlaps a bounding box.
+
+        Returns
+        -------
+        cells : ndarray
+            Sorted array of cell numbers.
+
+        """
+        ix0, iy0 = self._bucket_xy(xmin, ymin)
+        ix1, iy1 = self._bucket_xy(xmax, ymax)
+        ix, iy = np.meshgrid(np.arange(ix0, ix1 + 1),
+                             np.arange(iy0, iy1 + 1))
+        cells = self._get_bucket_cells(iy.ravel() * self._nb[0] + ix.ravel())
+        b = self.bounds[cells]
+        tol = self.tol
+        overlaps = (b[:, 0] <= xmax + tol) & (b[:, 1] >= xmin - tol) & \
+                   (b[:, 2] <= ymax + tol) & (b[:, 3] >= ymin - tol)
+        return cells[overlaps]
+
+    def query_segment(self, xa, ya, xb, yb):
+        """
+        Find the cells whose bounding box overlaps the bounding box of a
+        line segment and that are in the buckets along the segment. This
+        limits the cells that are returned for long diagonal segments.
+
+        Returns
+        -------
+        cells : ndarray
+            Sorted array of cell numbers.
+
+        """
+        bw, bh = self._bsize
+        # sample the segment at half the bucket size and include the
+        # neighboring buckets so that no bucket along the segment is missed
+        n = int(np.ceil(2. * np.hypot((xb - xa) / bw, (yb - ya) / bh))) + 1
+        t = np.linspace(0., 1., n + 1)
+        ix, iy = self._bucket_xy(xa + t * (xb - xa), ya + t * (yb - ya))
+        nbx, nby = self._nb
+        offsets = np.array([-1, 0, 1])
+        ix = np.clip(ix[:, np.newaxis, np.newaxis] + offsets[:, np.newaxis],
+                     0, nbx - 1)
+        iy = np.clip(iy[:, np.newaxis, np.newaxis] + offsets, 0, nby - 1)
+        cells = self._get_bucket_cells(np.unique(iy * nbx + ix))
+        b = self.bounds[cells]
+        tol = self.tol
+        overlaps = (b[:, 0] <= max(xa, xb) + tol) & \
+                   (b[:, 1] >= min(xa, xb) - tol) & \
+                   (b[:, 2] <= max(ya, yb) + tol) & \
+                   (b[:, 3] >= min(ya, yb) - tol)
+        return cells[overlaps]
+
+    def _get_bucket_cells(self, buckets):
+        """return the sorted unique cells in a set of buckets"""
+        start = self._bucket_ptr[buckets]
+        count = self._bucket_ptr[buckets + 1] - start
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count,
+                                               count)
+        return np.unique(self._bucket_cells[np.repeat(start, count) + k])
+
+    def get_areas(self, cells=None):
+        """
+        Return the area of cells.
+
+        """
+        if cells is None:
+            cells = slice(None)
+        xv, yv = self.xv[cells], self.yv[cells]
+        a = xv[..., :-1] * yv[..., 1:] - xv[..., 1:] * yv[..., :-1]
+        return np.abs(0.5 * a.sum(axis=-1))
+
+    def segment_intersections(self, xa, ya, xb, yb, cells):
+        """
+        Intersect a line segment with cells.
+
+        Parameters
+        ----------
+        xa, ya : float
+            Coordinates of the start of the segment
+        xb, yb : float
+            Coordinates of the end of the segment
+        cells : ndarray
+            Cells to intersect with the segment
+
+        Returns
+        -------
+        cells : ndarray
+            Cells that contain part of the segment
+        fraction : ndarray
+            Fraction of the segment length in each cell
+        tstart, tend : ndarray
+            Fraction of the segment length where the segment enters and
+            last leaves each cell
+
+        """
+        xv, yv = self.xv[cells], self.yv[cells]
+        ex0, ey0 = xv[:, :-1], yv[:, :-1]
+        ex, ey = xv[:, 1:] - ex0, yv[:, 1:] - ey0
+        dx, dy = xb - xa, yb - ya
+        denom = dx * ey - dy * ex
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = ((ex0 - xa) * ey - (ey0 - ya) * ex) / denom
+            u = ((ex0 - xa) * dy - (ey0 - ya) * dx) / denom
+            # crossings at the ends of an edge (within tol) are included,
+            # so that a segment through a cell corner is split there
+            utol = self.tol / np.hypot(ex, ey)
+        valid = (denom != 0) & (t > 0) & (t < 1) & (u >= -utol) & \
+                (u <= 1 + utol)
+        t[~valid] = np.nan
+        n = len(cells)
+        # nan sorts to the end of each row
+        t = np.sort(np.column_stack((np.zeros(n), t, np.ones(n))), axis=1)
+        t0, t1 = t[:, :-1], t[:, 1:]
+        tmid = 0.5 * (t0 + t1)
+        with np.errstate(invalid='ignore'):
+            piece = t1 > t0
+        inside = np.zeros(piece.shape, dtype=bool)
+        icell = np.repeat(cells, t0.shape[1]).reshape(t0.shape)
+        xm, ym = xa + tmid[piece] * dx, ya + tmid[piece] * dy
+        isin, onedge = self._classify(xm, ym, icell[piece])
+        # pieces along an edge are in the cell if the whole piece is on the
+        # edge, and pieces along a shared edge are only in the lowest cell
+        # number that contains them, so that they are not counted twice
+        isin &= ~onedge
+        if onedge.any():
+            ie = np.where(onedge)[0]
+            c = icell[piece][ie]
+            tp0, tp1 = t0[piece][ie], t1[piece][ie]
+            along = self.locate(xm[ie], ym[ie]) == c
+            for q in [0.25, 0.75]:
+                tq = tp0 + q * (tp1 - tp0)
+                along &= self.contains(xa + tq * dx, ya + tq * dy, c)
+            isin[ie] = along
+        inside[piece] = isin
+        fraction = np.where(inside, t1 - t0, 0.).sum(axis=1)
+        tstart = np.where(inside, t0, np.inf).min(axis=1)
+        tend = np.where(inside, t1, -np.inf).max(axis=1)
+        idx = fraction > 0
+        return cells[idx], fraction[idx], tstart[idx], tend[idx]
+
+
+def _polygon_area(x, y):
+    """signed area of an open or closed ring, positive for ccw rings"""
+    return 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+
+
+def _clip_ring(px, py, cx, cy):
+    """
+    Clip an open ring (px, py) by a convex closed ring (cx, cy) with the
+    Sutherland-Hodgman algorithm.
+
+    """
+    sign = 1. if _polygon_area(cx[:-1], cy[:-1]) >= 0. else -1.
+    for k in range(len(cx) - 1):
+        ax, ay, bx, by = cx[k], cy[k], cx[k + 1], cy[k + 1]
+        if ax == bx and ay == by:
+            continue
+        side = sign * ((bx - ax) * (py - ay) - (by - ay) * (px - ax))
+        inside = side >= 0.
+        if inside.all():
+            continue
+        if not inside.any():
+            return px[:0], py[:0]
+        side1 = np.roll(side, -1)
+        crosses = inside != np.roll(inside, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = side / (side - side1)
+            qx = px + s * (np.roll(px, -1) - px)
+            qy = py + s * (np.roll(py, -1) - py)
+        # vertex i (if inside) followed by the crossing on edge i
+        keep = np.column_stack((inside, crosses)).ravel()
+        px = np.column_stack((px, qx)).ravel()[keep]
+        py = np.column_stack((py, qy)).ravel()[keep]
+    return px, py
+
+
+def _parts(feature):
+    """return the parts of a line or polygon feature"""
+    feature = list(feature)
+    if len(feature) > 0 and np.isscalar(feature[0][0]):
+        return [feature]
+    return feature
+
+
+def _read_shapefile(shapefile, featuretype):
+    import shapefile as sf
+    if not os.path.splitext(shapefile)[1]:
+        shapefile += '.shp'
+    reader = sf.Reader(shapefile)
+    shapes = reader.shapes()
+    names = [field[0] for field in reader.fields[1:]]
+    if 'SHAPEID' in names:
+        idx = names.index('SHAPEID')
+        shapeids = [int(rec[idx]) for rec in reader.records()]
+    else:
+        shapeids = list(range(len(shapes)))
+    features = []
+    for shape in shapes:
+        if featuretype == 'point':
+            features.append(shape.points[0])
+        else:
+            i = list(shape.parts) + [len(shape.points)]
+            features.append([shape.points[i0:i1]
+                             for i0, i1 in zip(i[:-1], i[1:])])
+    return features, shapeids
+
+
+class GridIntersect(object):
+    """
+    Class to intersect point, line, and polygon features with a model grid.
+
+    Parameters
+    ----------
+    grid : SpatialReference, SpatialReferenceUnstructured, CellIndex, or list
+        Grid to intersect with. A list must contain a sequence of (x, y)
+        vertices for each cell.
+    nodenumbers : ndarray
+        Node number to report for each cell of the grid. The default is the
+        zero-based cell number. For structured grids cells are numbered by
+        row (node = row * ncol + column).
+
+    Notes
+    -----
+    Polygon features are intersected with the cells by clipping, so the
+    cells must be convex for polygon intersections. Polygon features may be
+    concave and the parts of a polygon with the opposite orientation of the
+    first part are treated as holes.
+
+    The returned recarrays have the same fields as the intersections
+    calculated by gridgen (flopy.utils.gridgen.Gridgen.intersect).
+
+    Examples
+    --------
+    >>> import flopy
+    >>> from flopy.utils.gridintersect import GridIntersect
+    >>> ml = flopy.modflow.Modflow.load('test.nam')
+    >>> ix = GridIntersect(ml.sr)
+    >>> wells = ix.intersect([(100., 250.), (300., 450.)], 'point')
+
+    """
+
+    def __init__(self, grid, nodenumbers=None):
+        from .reference import SpatialReference, SpatialReferenceUnstructured
+        if isinstance(grid, CellIndex):
+            self.index = grid
+        elif isinstance(grid, SpatialReferenceUnstructured):
+            self.index = grid.cell_index
+        elif isinstance(grid, SpatialReference):
+            self.index = CellIndex.from_spatialreference(grid)
+        else:
+            self.index = CellIndex.from_polygons(grid)
+        if nodenumbers is None:
+            nodenumbers = np.arange(self.index.ncells)
+        self.nodenumbers = np.asarray(nodenumbers, dtype=np.int)
+
+    def intersect(self, features, featuretype):
+        """
+        Intersect features with the grid.
+
+        Parameters
+        ----------
+        features : str or list
+            features can be either a string containing the name of a
+            shapefile or it can be a list of points, lines, or polygons
+        featuretype : str
+            Must be either 'point', 'line', or 'polygon'
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray of the intersection properties.
+
+        """
+        featuretype = featuretype.lower()
+        if featuretype not in ['point', 'line', 'polygon']:
+            raise Exception('Unrecognized feature type: {}'.format(
+                featuretype))
+        if isinstance(features, str):
+            features, shapeids = _read_shapefile(features, featuretype)
+        else:
+            shapeids = None
+        if featuretype == 'point':
+            return self.intersect_points(features, shapeids)
+        elif featuretype == 'line':
+            return self.intersect_lines(features, shapeids)
+        return self.intersect_polygons(features, shapeids)
+
+    def intersect_points(self, points, shapeids=None):
+        """
+        Intersect points with the grid. Points outside of the grid are not
+        included in the result.
+
+        Parameters
+        ----------
+        points : list
+            list of (x, y) points
+        shapeids : list
+            SHAPEID of each point (default is the point number)
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray with nodenumber, pointid, and SHAPEID fields
+
+        """
+        xy = np.array([p[:2] for p in points], dtype=np.float64)
+        xy = xy.reshape(-1, 2)
+        cells = self.index.locate(xy[:, 0], xy[:, 1])
+        pointid = np.where(cells >= 0)[0]
+        dtype = [('nodenumber', np.int), ('pointid', np.int),
+                 ('SHAPEID', np.int)]
+        result = np.recarray(pointid.shape[0], dtype=dtype)
+        result['nodenumber'] = self.nodenumbers[cells[pointid]]
+        result['pointid'] = pointid
+        result['SHAPEID'] = self._shapeids(shapeids, len(xy))[pointid]
+        return result
+
+    def intersect_lines(self, lines, shapeids=None):
+        """
+        Intersect lines with the grid.
+
+        Parameters
+        ----------
+        lines : list
+            list of lines. Each line is a sequence of (x, y) vertices or a
+            list of parts that are sequences of (x, y) vertices.
+        shapeids : list
+            SHAPEID of each line (default is the line number)
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray with nodenumber, arcid, length, starting_distance,
+            ending_distance, and SHAPEID fields. There is one record for
+            each cell that a line crosses, in the order that the line
+            enters the cells.
+
+        """
+        shapeids = self._shapeids(shapeids, len(lines))
+        records = []
+        for arcid, line in enumerate(lines):
+            cells, lengths, starts, ends = [], [], [], []
+            distance = 0.
+            for part in _parts(line):
+                xy = np.asarray(part, dtype=np.float64)[:, :2]
+                for (xa, ya), (xb, yb) in zip(xy[:-1], xy[1:]):
+                    seglen = np.hypot(xb - xa, yb - ya)
+                    if seglen == 0.:
+                        continue
+                    candidates = self.index.query_segment(xa, ya, xb, yb)
+                    if len(candidates) > 0:
+                        c, f, t0, t1 = self.index.segment_intersections(
+                            xa, ya, xb, yb, candidates)
+                        cells.append(c)
+                        lengths.append(f * seglen)
+                        starts.append(distance + t0 * seglen)
+                        ends.append(distance + t1 * seglen)
+                    distance += seglen
+            if not cells:
+                continue
+            cells = np.concatenate(cells)
+            lengths = np.concatenate(lengths)
+            starts = np.concatenate(starts)
+            ends = np.concatenate(ends)
+            # combine the pieces of the line in each cell
+            ucells, inv = np.unique(cells, return_inverse=True)
+            length = np.bincount(inv, weights=lengths)
+            start = np.full(ucells.shape, np.inf)
+            np.minimum.at(start, inv, starts)
+            end = np.full(ucells.shape, -np.inf)
+            np.maximum.at(end, inv, ends)
+            i = np.argsort(start, kind='mergesort')
+            records.append((self.nodenumbers[ucells[i]],
+                            np.full(i.shape, arcid, dtype=np.int),
+                            length[i], start[i], end[i],
+                            np.full(i.shape, shapeids[arcid], dtype=np.int)))
+        dtype = [('nodenumber', np.int), ('arcid', np.int),
+                 ('length', np.float64), ('starting_distance', np.float64),
+                 ('ending_distance', np.float64), ('SHAPEID', np.int)]
+        return self._to_recarray(records, dtype)
+
+    def intersect_polygons(self, polygons, shapeids=None):
+        """
+        Intersect polygons with the grid.
+
+        Parameters
+        ----------
+        polygons : list
+            list of polygons. Each polygon is a sequence of (x, y) vertices
+            or a list of parts that are sequences of (x, y) vertices.
+        shapeids : list
+            SHAPEID of each polygon (default is the polygon number)
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray with nodenumber, polyid, totalarea, and SHAPEID fields.
+            totalarea is the area of the polygon in the cell.
+
+        """
+        index = self.index
+        shapeids = self._shapeids(shapeids, len(polygons))
+        records = []
+        for polyid, polygon in enumerate(polygons):
+            rings = []
+            for part in _parts(polygon):
+                ring = np.asarray(part, dtype=np.float64)[:, :2]
+                if np.array_equal(ring[0], ring[-1]):
+                    ring = ring[:-1]
+                if ring.shape[0] > 2:
+                    rings.append(ring)
+            if not rings:
+                continue
+            allverts = np.vstack(rings)
+            candidates = index.query_bbox(allverts[:, 0].min(),
+                                          allverts[:, 0].max(),
+                                          allverts[:, 1].min(),
+                                          allverts[:, 1].max())
+            if len(candidates) == 0:
+                continue
+            # cells near the edges of the polygon are clipped, the other
+            # cells are either completely inside or outside
+            edge_cells = []
+            for ring in rings:
+                x0, y0 = ring[:, 0], ring[:, 1]
+                x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+                for e in zip(x0, y0, x1, y1):
+                    edge_cells.append(index.query_segment(*e))
+            edge_cells = np.unique(np.concatenate(edge_cells))
+            interior = np.setdiff1d(candidates, edge_cells)
+            xc = index.xv[interior, :-1].mean(axis=1)
+            yc = index.yv[interior, :-1].mean(axis=1)
+            inside = np.zeros(interior.shape, dtype=bool)
+            for ring in rings:
+                inside ^= _ring_contains(ring, xc, yc)
+            interior = interior[inside]
+
+            sign = 1. if _polygon_area(rings[0][:, 0],
+                                       rings[0][:, 1]) >= 0. else -1.
+            area = np.zeros(edge_cells.shape)
+            for i, icell in enumerate(edge_cells):
+                cx, cy = index.xv[icell], index.yv[icell]
+                for ring in rings:
+                    px, py = _clip_ring(ring[:, 0], ring[:, 1], cx, cy)
+                    if px.shape[0] > 2:
+                        area[i] += sign * _polygon_area(px, py)
+            cells = np.concatenate((interior, edge_cells))
+            area = np.concatenate((index.get_areas(interior), area))
+            idx = area > 0.
+            cells, area = cells[idx], area[idx]
+            i = np.argsort(cells)
+            records.append((self.nodenumbers[cells[i]],
+                            np.full(i.shape, polyid, dtype=np.int), area[i],
+                            np.full(i.shape, shapeids[polyid], dtype=np.int)))
+        dtype = [('nodenumber', np.int), ('polyid', np.int),
+                 ('totalarea', np.float64), ('SHAPEID', np.int)]
+        return self._to_recarray(records, dtype)
+
+    @staticmethod
+    def _shapeids(shapeids, n):
+        if shapeids is None:
+            return np.arange(n)
+        return np.asarray(shapeids, dtype=np.int)
+
+    @staticmethod
+    def _to_recarray(records, dtype):
+        """combine lists of column arrays into a recarray"""
+        result = np.recarray(sum(len(r[0]) for r in records), dtype=dtype)
+        for icol, name in enumerate(result.dtype.names):
+            if records:
+                result[name] = np.concatenate([r[icol] for r in records])
+        return result
+
+
+def _ring_contains(ring, x, y):
+    """crossing number test of points against a single open ring"""
+    x0, y0 = ring[:, 0], ring[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    inside = np.zeros(x.shape, dtype=bool)
+    if x.shape[0] == 0:
+        return inside
+    for xa, ya, xb, yb in zip(x0, y0, x1, y1):
+        if (ya > y.max() and yb > y.max()) or (ya <= y.min() and
+                                               yb <= y.min()):
+            continue
+        crosses = (ya > y) != (yb > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xint = xa + (y - ya) * (xb - xa) / (yb - ya)
+        inside ^= crosses & (x < xint)
+    return inside
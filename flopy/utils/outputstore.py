@@ -0,0 +1,792 @@
+"""
+Module to convert MODFLOW and MT3D output files to a chunked, compressed
+array store on disk, and to read the arrays from the store.  The module
+contains the following classes and functions that can be accessed by the
+user.
+
+*  OutputStore (a store with the arrays of a model run)
+*  StoreVariable (one array of a store, for example heads)
+*  write_output_store (convert head, concentration, cell by cell budget
+   and list files to a store)
+
+A store is a directory with a store.json file, which describes the
+arrays in the store, and a directory for each array.  The (ntimes, nlay,
+nrow, ncol) arrays are split into chunks of a few times, one layer and a
+block of rows and columns.  Each chunk is compressed with zlib and written
+to a file named after the chunk indices (for example 0.2.0.0 for the first
+times of the third layer), so that a map for one time and a time series
+for one cell only read the chunks that contain them.
+
+"""
+
+import os
+import re
+import json
+import shutil
+import zlib
+from collections import OrderedDict
+import numpy as np
+from .datafile import RecordCache
+
+STORE_FILE = 'store.json'
+STORE_FORMAT = 'flopy output store'
+STORE_VERSION = 1
+
+
+def _variable_path(name):
+    """
+    Directory name of a variable, for example flow_right_face for
+    FLOW RIGHT FACE.
+
+    """
+    return re.sub(r'\W+', '_', name.strip()).strip('_').lower()
+
+
+def _remove_store(path):
+    """
+    Remove the files of an output store: store.json, the directories of the
+    arrays and the budget tables.  Other files in path are not removed.
+
+    """
+    fname = os.path.join(path, STORE_FILE)
+    with open(fname) as f:
+        meta = json.load(f)
+    for v in meta.get('variables', {}).values():
+        dirname = os.path.join(path, v['path'])
+        if os.path.isdir(dirname):
+            shutil.rmtree(dirname)
+    for files in meta.get('tables', {}).values():
+        for table in files.values():
+            if os.path.isfile(os.path.join(path, table)):
+                os.remove(os.path.join(path, table))
+    os.remove(fname)
+
+
+def _default_chunks(shape, itemsize, maxbytes=4e6):
+    """
+    Default chunk shape of an array: one layer of up to 128 rows and 128
+    columns, and as many times (up to 16) as fit in maxbytes.
+
+    """
+    ntimes, nlay, nrow, ncol = shape
+    nr, nc = min(nrow, 128), min(ncol, 128)
+    nt = int(maxbytes // (nr * nc * itemsize))
+    return [max(1, min(ntimes, 16, nt)), 1, nr, nc]
+
+
+class StoreVariable(object):
+    """
+    One (ntimes, nlay, nrow, ncol) array of an output store, for example
+    the heads of a model run.  StoreVariable objects are returned by
+    OutputStore.get_variable() and should not be created directly.
+
+    StoreVariable has the get_data(), get_ts() and get_alldata() methods
+    of HeadFile, so that it can be used in place of the output file.
+
+    Parameters
+    ----------
+    path : string
+        Directory of the variable.
+    meta : dict
+        Description of the variable in the store.json file.
+    cache : RecordCache
+        Cache of the decompressed chunks.  If None, chunks are not cached.
+
+    Attributes
+    ----------
+    name : string
+        Name of the variable.
+    nlay, nrow, ncol : int
+        Shape of the arrays for each time.
+    chunks : list of ints
+        Number of times, layers, rows and columns in each chunk.
+
+    """
+
+    def __init__(self, path, meta, cache=None):
+        self.path = path
+        self.name = meta['name']
+        self.text = meta.get('text', self.name)
+        self.dtype = np.dtype(meta['dtype'])
+        self.ntimes, self.nlay, self.nrow, self.ncol = meta['shape']
+        self.chunks = meta['chunks']
+        self.times = list(meta['times'])
+        self.kstpkper = [tuple(kk) for kk in meta['kstpkper']]
+        self.cache = cache
+        self._nchunks = [-(-n // c) for n, c in zip(meta['shape'],
+                                                    self.chunks)]
+
+    def __repr__(self):
+        return 'StoreVariable {} ({} x {} x {} x {})'.format(
+            self.name, self.ntimes, self.nlay, self.nrow, self.ncol)
+
+    def get_times(self):
+        """
+        Get a list of the times of the variable
+
+        Returns
+        ----------
+        out : list of floats
+            List contains the simulation times (totim).
+
+        """
+        return self.times
+
+    def get_kstpkper(self):
+        """
+        Get a list of the time steps and stress periods of the variable
+
+        Returns
+        ----------
+        out : list of (kstp, kper) tuples
+            List of kstp, kper combinations.  kstp and kper values are
+            zero-based.
+
+        """
+        return self.kstpkper
+
+    def _chunk_slice(self, axis, ic):
+        n0 = ic * self.chunks[axis]
+        n1 = min(n0 + self.chunks[axis], [self.ntimes, self.nlay, self.nrow,
+                                          self.ncol][axis])
+        return n0, n1
+
+    def _read_chunk(self, it, ik, ii, ij):
+        """
+        Read and decompress a chunk, or get it from the cache.
+
+        """
+        key = (it, ik, ii, ij)
+        if self.cache is not None:
+            data = self.cache.get((self.name, key))
+            if data is not None:
+                return data
+        shape = [n1 - n0 for n0, n1 in [self._chunk_slice(axis, ic)
+                                        for axis, ic in enumerate(key)]]
+        fname = os.path.join(self.path, '{}.{}.{}.{}'.format(*key))
+        with open(fname, 'rb') as f:
+            buf = zlib.decompress(f.read())
+        data = np.frombuffer(buf, dtype=self.dtype).reshape(shape)
+        if self.cache is not None:
+            self.cache.put((self.name, key), data)
+        return data
+
+    def _get_time_index(self, kstpkper=None, idx=None, totim=None):
+        if kstpkper is not None:
+            kstpkper = tuple(kstpkper)
+            if kstpkper not in self.kstpkper:
+                raise Exception('get_data() error: kstpkper not found:'
+                                '{0}'.format(kstpkper))
+            return self.kstpkper.index(kstpkper)
+        elif totim is not None:
+            itim = np.where(np.array(self.times) == totim)[0]
+            if len(itim) == 0:
+                msg = 'totim value ({}) not found in file...'.format(totim)
+                raise Exception(msg)
+            return itim[0]
+        elif idx is not None:
+            return idx
+        return self.ntimes - 1
+
+    def get_data(self, kstpkper=None, idx=None, totim=None, mflay=None):
+        """
+        Get the data for the specified time.  Only the chunks of the time
+        (and of mflay) are read.
+
+        Parameters
+        ----------
+        idx : int
+            The zero-based time index.
+        kstpkper : tuple of ints
+            A tuple containing the time step and stress period (kstp, kper).
+            These are zero-based kstp and kper values.
+        totim : float
+            The simulation time.
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mlay is specified.
+
+        Notes
+        -----
+        if kstpkper, idx and totim are None, will return the last time
+
+        """
+        itim = self._get_time_index(kstpkper, idx, totim)
+        it, t = divmod(itim, self.chunks[0])
+        if mflay is None:
+            layers = range(self.nlay)
+        else:
+            layers = [mflay]
+        data = np.empty((len(layers), self.nrow, self.ncol), self.dtype)
+        for l, k in enumerate(layers):
+            ik, kc = divmod(k, self.chunks[1])
+            for ii in range(self._nchunks[2]):
+                i0, i1 = self._chunk_slice(2, ii)
+                for ij in range(self._nchunks[3]):
+                    j0, j1 = self._chunk_slice(3, ij)
+                    chunk = self._read_chunk(it, ik, ii, ij)
+                    data[l, i0:i1, j0:j1] = chunk[t, kc]
+        if mflay is None:
+            return data
+        return data[0]
+
+    def get_ts(self, idx):
+        """
+        Get a time series for one or more cells.  Only the chunks that
+        contain the cells are read.
+
+        Parameters
+        ----------
+        idx : tuple of ints, or a list of a tuple of ints
+            idx can be (layer, row, column) or it can be a list in the form
+            [(layer, row, column), (layer, row, column), ...].  The layer,
+            row, and column values must be zero based.
+
+        Returns
+        ----------
+        out : numpy array
+            Array has size (ntimes, ncells + 1).  The first column in the
+            data array will contain time (totim).
+
+        """
+        if isinstance(idx, tuple):
+            kijlist = [idx]
+        else:
+            kijlist = list(idx)
+        for k, i, j in kijlist:
+            if not (0 <= k < self.nlay and 0 <= i < self.nrow and
+                    0 <= j < self.ncol):
+                raise Exception('Invalid cell index. Cell ' + str(
+                    (k, i, j)) + ' not within model grid: ' +
+                                str((self.nlay, self.nrow, self.ncol)))
+        result = np.empty((self.ntimes, len(kijlist) + 1), self.dtype)
+        result[:, 0] = self.times
+
+        # cells in each spatial chunk
+        groups = OrderedDict()
+        for istat, (k, i, j) in enumerate(kijlist):
+            key = (k // self.chunks[1], i // self.chunks[2],
+                   j // self.chunks[3])
+            groups.setdefault(key, []).append((istat + 1, k % self.chunks[1],
+                                               i % self.chunks[2],
+                                               j % self.chunks[3]))
+        for (ik, ii, ij), cells in groups.items():
+            istat, kc, ic, jc = [list(v) for v in zip(*cells)]
+            for it in range(self._nchunks[0]):
+                t0, t1 = self._chunk_slice(0, it)
+                chunk = self._read_chunk(it, ik, ii, ij)
+                result[t0:t1, istat] = chunk[:, kc, ic, jc]
+        return result
+
+    def get_alldata(self, mflay=None, nodata=-9999):
+        """
+        Get all of the data of the variable.  Each chunk is read once.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+
+        nodata : float
+           The nodata value in the data array.  All array values that have the
+           nodata value will be assigned np.nan.
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (ntimes, nlay, nrow, ncol) if mflay is None or it
+            has size (ntimes, nrow, ncol) if mlay is specified.
+
+        """
+        if mflay is None:
+            layers = range(self.nlay)
+        else:
+            layers = [mflay]
+        rv = np.empty((self.ntimes, len(layers), self.nrow, self.ncol),
+                      self.dtype)
+        for l, k in enumerate(layers):
+            ik, kc = divmod(k, self.chunks[1])
+            for it in range(self._nchunks[0]):
+                t0, t1 = self._chunk_slice(0, it)
+                for ii in range(self._nchunks[2]):
+                    i0, i1 = self._chunk_slice(2, ii)
+                    for ij in range(self._nchunks[3]):
+                        j0, j1 = self._chunk_slice(3, ij)
+                        chunk = self._read_chunk(it, ik, ii, ij)
+                        rv[t0:t1, l, i0:i1, j0:j1] = chunk[:, kc]
+        if mflay is not None:
+            rv = rv[:, 0]
+        if rv.dtype.kind == 'f':
+            rv[rv == nodata] = np.nan
+        return rv
+
+
+class OutputStore(object):
+    """
+    Chunked, compressed store of the output arrays of a model run.
+
+    Parameters
+    ----------
+    path : string
+        Directory of the store.
+    mode : string
+        'r' to read an existing store, 'a' to add arrays to an existing
+        store, or 'w' to create a new store.  If mode is 'w', the files of
+        an existing store in path are removed, and other files in path are
+        kept.  path must be empty if it is not a store.  Default is 'r'.
+    cache_size : int
+        Maximum size in bytes of a least recently used cache of the
+        decompressed chunks (see RecordCache).  If None, chunks are not
+        cached.  Default is 50e6.
+    complevel : int
+        zlib compression level (1 to 9) of the chunks that are written.
+        Default is 4.
+
+    Attributes
+    ----------
+    cache : RecordCache
+        Cache of the decompressed chunks.
+
+    Methods
+    -------
+    get_variable : returns a StoreVariable with the get_data(), get_ts()
+        and get_alldata() methods of HeadFile
+
+    See Also
+    --------
+    write_output_store
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> flopy.utils.write_output_store('model_store', hds='model.hds',
+    ...                                cbc='model.cbc', lst='model.list')
+    >>> store = flopy.utils.OutputStore('model_store')
+    >>> hds = store.get_variable('head')
+    >>> h = hds.get_data(totim=100.)
+    >>> ts = hds.get_ts([(0, 10, 10), (1, 10, 10)])
+    >>> frf = store.get_variable('FLOW RIGHT FACE').get_data(kstpkper=(0, 0))
+    >>> inc = store.get_incremental()
+
+    """
+
+    def __init__(self, path, mode='r', cache_size=50e6, complevel=4):
+        if mode not in ('r', 'a', 'w'):
+            raise ValueError("mode must be 'r', 'a' or 'w'")
+        self.path = path
+        self.mode = mode
+        self.complevel = complevel
+        fname = os.path.join(path, STORE_FILE)
+        if mode == 'w':
+            if os.path.isfile(fname):
+                _remove_store(path)
+            elif os.path.isdir(path) and len(os.listdir(path)) > 0:
+                raise Exception('{} is not empty and is not an output '
+                                'store'.format(path))
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            self.meta = {'format': STORE_FORMAT, 'version': STORE_VERSION,
+                         'compression': 'zlib', 'variables': OrderedDict(),
+                         'tables': OrderedDict()}
+            self._write_meta()
+        else:
+            if not os.path.isfile(fname):
+                raise Exception('{} is not an output store'.format(path))
+            with open(fname) as f:
+                self.meta = json.load(f, object_pairs_hook=OrderedDict)
+            if self.meta.get('format') != STORE_FORMAT:
+                raise Exception('{} is not an output store'.format(path))
+        self.set_cache(cache_size)
+
+    def __repr__(self):
+        return 'OutputStore {} ({})'.format(
+            self.path, ', '.join(self.get_variable_names()))
+
+    def set_cache(self, cache_size):
+        """
+        Cache the chunks that are read from the store.
+
+        Parameters
+        ----------
+        cache_size : int
+            Maximum size in bytes of the cache of the decompressed chunks.
+            If None, the chunks are not cached.
+
+        """
+        if cache_size is None:
+            self.cache = None
+        else:
+            self.cache = RecordCache(cache_size)
+        return
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, STORE_FILE), 'w') as f:
+            json.dump(self.meta, f, indent=1)
+
+    def _check_writable(self):
+        if self.mode == 'r':
+            raise Exception('output store {} was opened read only'.format(
+                self.path))
+
+    def get_variable_names(self):
+        """
+        Get a list of the names of the arrays in the store
+
+        Returns
+        ----------
+        out : list of strings
+
+        """
+        return list(self.meta['variables'].keys())
+
+    def get_variable(self, name):
+        """
+        Get an array of the store.
+
+        Parameters
+        ----------
+        name : string
+            Name of the array, for example 'head' or 'FLOW RIGHT FACE'.
+            The case and the leading and trailing spaces of the name are
+            ignored.
+
+        Returns
+        ----------
+        out : StoreVariable
+
+        """
+        if isinstance(name, bytes):
+            name = name.decode()
+        for key, meta in self.meta['variables'].items():
+            if key.upper() == name.strip().upper():
+                return StoreVariable(os.path.join(self.path, meta['path']),
+                                     meta, self.cache)
+        raise Exception('{} not found in output store. Arrays in the store '
+                        'are: {}'.format(name, self.get_variable_names()))
+
+    def __getitem__(self, name):
+        return self.get_variable(name)
+
+    def add_array(self, name, shape, times, kstpkper, get_data,
+                  dtype=np.float32, chunks=None, text=None, source=None):
+        """
+        Write an array to the store, one block of times at a time.
+
+        Parameters
+        ----------
+        name : string
+            Name of the array.
+        shape : tuple of ints
+            (ntimes, nlay, nrow, ncol)
+        times : list of floats
+            Simulation time (totim) of each time.
+        kstpkper : list of tuples of ints
+            Zero-based (kstp, kper) of each time.
+        get_data : function
+            Function that returns the (nlay, nrow, ncol) array for a
+            zero-based time index.
+        dtype : numpy dtype
+            Data type of the array.  Default is np.float32.
+        chunks : list of ints
+            Number of times, layers, rows and columns in each chunk.  If
+            None, chunks have one layer of up to 128 rows and 128 columns,
+            and up to 16 times.  (Default is None.)
+        text : string
+            Text of the records in the output file.
+        source : string
+            Name of the class of the output file.
+
+        """
+        self._check_writable()
+        dtype = np.dtype(dtype)
+        shape = [int(n) for n in shape]
+        if chunks is None:
+            chunks = _default_chunks(shape, dtype.itemsize)
+        chunks = [int(max(1, min(c, n))) for c, n in zip(chunks, shape)]
+        vpath = _variable_path(name)
+        dirname = os.path.join(self.path, vpath)
+        if os.path.isdir(dirname):
+            # only the directories of arrays in the store are replaced
+            paths = [v['path'] for v in self.meta['variables'].values()]
+            if vpath not in paths:
+                raise Exception('{} is not an array of output store '
+                                '{}'.format(dirname, self.path))
+            shutil.rmtree(dirname)
+        os.makedirs(dirname)
+        ntimes, nlay, nrow, ncol = shape
+        for it, t0 in enumerate(range(0, ntimes, chunks[0])):
+            t1 = min(t0 + chunks[0], ntimes)
+            block = np.empty((t1 - t0, nlay, nrow, ncol), dtype)
+            for t in range(t0, t1):
+                block[t - t0] = get_data(t)
+            for ik, k0 in enumerate(range(0, nlay, chunks[1])):
+                for ii, i0 in enumerate(range(0, nrow, chunks[2])):
+                    for ij, j0 in enumerate(range(0, ncol, chunks[3])):
+                        chunk = block[:, k0:k0 + chunks[1],
+                                      i0:i0 + chunks[2], j0:j0 + chunks[3]]
+                        fname = os.path.join(dirname, '{}.{}.{}.{}'.format(
+                            it, ik, ii, ij))
+                        with open(fname, 'wb') as f:
+                            f.write(zlib.compress(
+                                np.ascontiguousarray(chunk).tostring(),
+                                self.complevel))
+        self.meta['variables'][name] = OrderedDict([
+            ('name', name), ('path', vpath), ('text', text or name),
+            ('source', source), ('dtype', dtype.str), ('shape', shape),
+            ('chunks', chunks), ('times', [float(t) for t in times]),
+            ('kstpkper', [[int(kstp), int(kper)] for kstp, kper in kstpkper])])
+        self._write_meta()
+        if self.cache is not None:
+            self.cache.clear()
+        return
+
+    def add_layerfile(self, layerfile, name=None, chunks=None):
+        """
+        Write the arrays of a layer file (HeadFile, UcnFile or
+        FormattedHeadFile) to the store.
+
+        Parameters
+        ----------
+        layerfile : LayerFile
+            The output file.
+        name : string
+            Name of the array in the store.  If None, the text of the
+            output file (for example head or concentration) is used.
+        chunks : list of ints
+            Number of times, layers, rows and columns in each chunk.  See
+            add_array().
+
+        """
+        if name is None:
+            name = layerfile.text
+            if isinstance(name, bytes):
+                name = name.decode()
+            name = name.strip().lower()
+        times = list(layerfile.get_times())
+        rec = layerfile.recordarray
+        kstpkper = []
+        for totim in times:
+            irec = np.where(rec['totim'] == totim)[0][0]
+            kstpkper.append((rec['kstp'][irec] - 1, rec['kper'][irec] - 1))
+        shape = (len(times), layerfile.nlay, layerfile.nrow, layerfile.ncol)
+        self.add_array(name, shape, times, kstpkper,
+                       lambda t: layerfile.get_data(totim=times[t]),
+                       dtype=layerfile.realtype, chunks=chunks,
+                       source=type(layerfile).__name__)
+        return
+
+    def add_budgetfile(self, cbcfile, text=None, chunks=None):
+        """
+        Write the budget terms of a cell by cell budget file to the store,
+        as one (ntimes, nlay, nrow, ncol) array for each term.  Records of
+        a term with the same time step are summed, and cells without a
+        value are zero.
+
+        Parameters
+        ----------
+        cbcfile : CellBudgetFile
+            The cell by cell budget file.
+        text : string or list of strings
+            Budget terms to write.  If None, all of the terms are written.
+            (Default is None.)
+        chunks : list of ints
+            Number of times, layers, rows and columns in each chunk.  See
+            add_array().
+
+        """
+        if text is None:
+            texts = cbcfile.get_unique_record_names()
+        elif isinstance(text, (list, tuple)):
+            texts = text
+        else:
+            texts = [text]
+        rec = cbcfile.recordarray
+        for text in texts:
+            indices = cbcfile.get_indices(text)
+            text16 = rec['text'][indices[0]]
+            kstpkper, times = [], []
+            for irec in indices:
+                kk = (rec['kstp'][irec] - 1, rec['kper'][irec] - 1)
+                if kk not in kstpkper:
+                    kstpkper.append(kk)
+                    times.append(rec['totim'][irec])
+            # budget terms without layers (imeth 4) have one layer
+            nlay = cbcfile.nlay
+            if rec['imeth'][indices[0]] == 4:
+                nlay = 1
+
+            def get_data(t):
+                data = np.zeros((nlay, cbcfile.nrow, cbcfile.ncol),
+                                cbcfile.realtype)
+                for a in cbcfile.get_data(kstpkper=kstpkper[t], text=text16,
+                                          full3D=True):
+                    if isinstance(a, np.ma.MaskedArray):
+                        a = a.filled(0.)
+                    data += a.reshape(data.shape)
+                return data
+
+            name = text16.decode().strip()
+            self.add_array(name, (len(times), nlay, cbcfile.nrow,
+                                  cbcfile.ncol), times, kstpkper, get_data,
+                           dtype=cbcfile.realtype, chunks=chunks,
+                           text=text16.decode(), source='CellBudgetFile')
+        return
+
+    def add_listbudget(self, listbudget, name='listbudget'):
+        """
+        Write the incremental and cumulative budgets of a list file to the
+        store.
+
+        Parameters
+        ----------
+        listbudget : ListBudget
+            The list file budget (for example MfListBudget).
+        name : string
+            Name of the budget tables in the store.  Default is
+            'listbudget'.
+
+        """
+        self._check_writable()
+        files = OrderedDict()
+        for key, data in [('incremental', listbudget.get_incremental()),
+                          ('cumulative', listbudget.get_cumulative())]:
+            if data is None:
+                raise Exception('the list file budget is not valid')
+            files[key] = '{}_{}.npy'.format(_variable_path(name), key)
+            np.save(os.path.join(self.path, files[key]),
+                    np.asarray(data).view(np.ndarray))
+        self.meta['tables'][name] = files
+        self._write_meta()
+        return
+
+    def _get_table(self, key, names, name):
+        if name not in self.meta['tables']:
+            raise Exception('{} not found in output store'.format(name))
+        data = np.load(os.path.join(self.path,
+                                    self.meta['tables'][name][key]))
+        data = data.view(np.recarray)
+        if names is None:
+            return data
+        if not isinstance(names, list):
+            names = [names]
+        names = ['totim', 'time_step', 'stress_period'] + names
+        return data[names].view(np.recarray)
+
+    def get_incremental(self, names=None, name='listbudget'):
+        """
+        Get a recarray with the incremental water budget items of a list
+        file in the store.  See ListBudget.get_incremental().
+
+        Parameters
+        ----------
+        names : str or list of strings
+            Selection of column names to return.  If names is not None then
+            totim, time_step, stress_period, and selection(s) will be returned.
+            (default is None).
+        name : string
+            Name of the budget tables in the store.  Default is
+            'listbudget'.
+
+        Returns
+        -------
+        out : recarray
+
+        """
+        return self._get_table('incremental', names, name)
+
+    def get_cumulative(self, names=None, name='listbudget'):
+        """
+        Get a recarray with the cumulative water budget items of a list
+        file in the store.  See ListBudget.get_cumulative().
+
+        Parameters
+        ----------
+        names : str or list of strings
+            Selection of column names to return.  If names is not None then
+            totim, time_step, stress_period, and selection(s) will be returned.
+            (default is None).
+        name : string
+            Name of the budget tables in the store.  Default is
+            'listbudget'.
+
+        Returns
+        -------
+        out : recarray
+
+        """
+        return self._get_table('cumulative', names, name)
+
+
+def write_output_store(path, hds=None, ucn=None, cbc=None, lst=None,
+                       chunks=None, complevel=4):
+    """
+    Convert the output files of a model run to a chunked, compressed
+    output store.
+
+    Parameters
+    ----------
+    path : string
+        Directory of the store.  An existing store in path is replaced,
+        and other files in path are kept.  path must be empty if it is not
+        a store.
+    hds : string or HeadFile
+        Binary head file, or a HeadFile or FormattedHeadFile.  The heads are
+        written as the 'head' array.
+    ucn : string or UcnFile
+        MT3D concentration file, or a UcnFile.  The concentrations are
+        written as the 'concentration' array.
+    cbc : string or CellBudgetFile
+        Cell by cell budget file, or a CellBudgetFile.  Each budget term is
+        written as an array named after the term (for example
+        'FLOW RIGHT FACE').
+    lst : string or ListBudget
+        MODFLOW list file, or a ListBudget.  The budget tables are written
+        as 'listbudget'.
+    chunks : list of ints
+        Number of times, layers, rows and columns in each chunk.  If None,
+        chunks have one layer of up to 128 rows and 128 columns, and up to
+        16 times.  (Default is None.)
+    complevel : int
+        zlib compression level (1 to 9).  Default is 4.
+
+    Returns
+    -------
+    store : OutputStore
+        The store, opened for reading.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> store = flopy.utils.write_output_store('model_store',
+    ...                                        hds='model.hds',
+    ...                                        cbc='model.cbc')
+    >>> store.get_variable('head').get_ts((0, 10, 10))
+
+    """
+    from .binaryfile import HeadFile, UcnFile, CellBudgetFile
+    from .mflistfile import MfListBudget
+    store = OutputStore(path, mode='w', complevel=complevel)
+    for obj, cls in [(hds, HeadFile), (ucn, UcnFile)]:
+        if obj is None:
+            continue
+        if not hasattr(obj, 'get_data'):
+            obj = cls(obj)
+        store.add_layerfile(obj, chunks=chunks)
+    if cbc is not None:
+        if not hasattr(cbc, 'get_data'):
+            cbc = CellBudgetFile(cbc)
+        store.add_budgetfile(cbc, chunks=chunks)
+    if lst is not None:
+        if not hasattr(lst, 'get_incremental'):
+            lst = MfListBudget(lst)
+        store.add_listbudget(lst)
+    return OutputStore(path)
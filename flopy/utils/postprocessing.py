@@ -39,6 +39,8 @@ def get_transmissivities(heads, m,
     elif x is not None and y is not None:
         # get row, col for observation locations
         r, c = m.sr.get_rc(x, y)
+        if np.any(np.atleast_1d(r) < 0):
+            raise ValueError('x, y locations must be inside of the model grid.')
     else:
         raise ValueError('Must specify row, column or x, y locations.')
 
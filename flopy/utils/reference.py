@@ -522,11 +522,15 @@ class SpatialReference(object):
                                                          (y - yorigin)
         return xrot, yrot
 
-    def transform(self, x, y):
+    def transform(self, x, y, inverse=False):
         """
         Given x and y array-like values, apply rotation, scale and offset,
         to convert them from model coordinates to real-world coordinates.
+        If inverse is True, real-world coordinates are converted to model
+        coordinates instead.
         """
+        if inverse:
+            return self._inverse_transform(x, y)
         x, y = x.copy(), y.copy()
         # reset origin in case attributes were modified
         self.set_origin(xul=self.xul, yul=self.yul, xll=self.xll, yll=self.yll)
@@ -538,6 +542,19 @@ class SpatialReference(object):
                                        xorigin=self.xll, yorigin=self.yll)
         return x, y
 
+    def _inverse_transform(self, x, y):
+        x = np.array(x, dtype=np.float64)
+        y = np.array(y, dtype=np.float64)
+        # reset origin in case attributes were modified
+        self.set_origin(xul=self.xul, yul=self.yul, xll=self.xll, yll=self.yll)
+        x, y = SpatialReference.rotate(x, y, theta=-self.rotation,
+                                       xorigin=self.xll, yorigin=self.yll)
+        x -= self.xll
+        y -= self.yll
+        x /= self.length_multiplier
+        y /= self.length_multiplier
+        return x, y
+
     def get_extent(self):
         """
         Get the extent of the rotated and offset grid
@@ -691,6 +708,10 @@ class SpatialReference(object):
         """Return the row and column of a point or sequence of points
         in real-world coordinates.
 
+        Points are rotated and scaled to model coordinates and located
+        with a binary search of the cell edges, so the grid rotation is
+        accounted for and large numbers of points can be located quickly.
+
         Parameters
         ----------
         x : scalar or sequence of x coordinates
@@ -698,18 +719,51 @@ class SpatialReference(object):
 
         Returns
         -------
+        r : row or sequence of rows (zero-based). -1 for points that are
+            outside of the grid.
+        c : column or sequence of columns (zero-based). -1 for points that
+            are outside of the grid.
+        """
+        scalar = np.isscalar(x) and np.isscalar(y)
+        xl, yl = self.transform(x, y, inverse=True)
+        xl, yl = np.atleast_1d(xl), np.atleast_1d(yl)
+        xedge, yedge = self.xedge, self.yedge
+        # yedge decreases with row number, so search the negated edges
+        c = np.searchsorted(xedge, xl, side='right') - 1
+        r = np.searchsorted(-yedge, -yl, side='right') - 1
+        # points on the outer edges of the grid (to round-off) are inside
+        tol = 1e-9 * max(xedge[-1], yedge[0])
+        c = np.clip(c, 0, self.ncol - 1)
+        r = np.clip(r, 0, self.nrow - 1)
+        outside = (xl < xedge[0] - tol) | (xl > xedge[-1] + tol) | \
+                  (yl < yedge[-1] - tol) | (yl > yedge[0] + tol)
+        r[outside] = -1
+        c[outside] = -1
+        if scalar:
+            return int(r[0]), int(c[0])
+        return r, c
+
+    def get_xy(self, r, c):
+        """Return the real-world coordinates of the center of a cell or
+        sequence of cells. This is the inverse of get_rc.
+
+        Parameters
+        ----------
         r : row or sequence of rows (zero-based)
         c : column or sequence of columns (zero-based)
+
+        Returns
+        -------
+        x : scalar or sequence of x coordinates
+        y : scalar or sequence of y coordinates
         """
-        if np.isscalar(x):
-            c = (np.abs(self.xcentergrid[0] - x)).argmin()
-            r = (np.abs(self.ycentergrid[:, 0] - y)).argmin()
-        else:
-            xcp = np.array([self.xcentergrid[0]] * (len(x)))
-            ycp = np.array([self.ycentergrid[:, 0]] * (len(x)))
-            c = (np.abs(xcp.transpose() - x)).argmin(axis=0)
-            r = (np.abs(ycp.transpose() - y)).argmin(axis=0)
-        return r, c
+        scalar = np.isscalar(r) and np.isscalar(c)
+        x = self.xcenter[np.atleast_1d(c)]
+        y = self.ycenter[np.atleast_1d(r)]
+        x, y = self.transform(x, y)
+        if scalar:
+            return x[0], y[0]
+        return x, y
 
     def get_grid_map_plotter(self):
         """
@@ -1034,8 +1088,66 @@ class SpatialReferenceUnstructured(SpatialReference):
 
     def __setattr__(self, key, value):
         super(SpatialReference, self).__setattr__(key, value)
+        if key in ['xc', 'yc', 'verts', 'iverts']:
+            # the spatial index has to be rebuilt
+            super(SpatialReference, self).__setattr__('_cell_index', None)
         return
 
+    @property
+    def cell_index(self):
+        """
+        Spatial index of the cells (flopy.utils.gridintersect.CellIndex).
+        The index is built the first time it is needed and reused until
+        xc, yc, verts, or iverts are changed.
+
+        """
+        if getattr(self, '_cell_index', None) is None:
+            from .gridintersect import CellIndex
+            self._cell_index = CellIndex.from_iverts(self.verts, self.iverts,
+                                                     xc=self.xc, yc=self.yc)
+        return self._cell_index
+
+    def get_node(self, x, y):
+        """
+        Return the cell that contains a point or sequence of points.
+
+        Parameters
+        ----------
+        x : scalar or sequence of x coordinates
+        y : scalar or sequence of y coordinates
+
+        Returns
+        -------
+        node : cell number or array of cell numbers (zero-based) in the
+            order of iverts. -1 for points that are not in a cell. If the
+            grid is not layered, the cell in the uppermost layer is
+            returned.
+        """
+        node = self.cell_index.locate(x, y)
+        if np.isscalar(x) and np.isscalar(y):
+            return int(node[0])
+        return node
+
+    def get_nearest_node(self, x, y):
+        """
+        Return the cell with the cell center (xc, yc) that is closest to a
+        point or sequence of points.
+
+        Parameters
+        ----------
+        x : scalar or sequence of x coordinates
+        y : scalar or sequence of y coordinates
+
+        Returns
+        -------
+        node : cell number or array of cell numbers (zero-based) in the
+            order of iverts.
+        """
+        node = self.cell_index.nearest(x, y)
+        if np.isscalar(x) and np.isscalar(y):
+            return int(node[0])
+        return node
+
     def get_extent(self):
         """
         Get the extent of the grid
@@ -0,0 +1,376 @@
+"""
+Module for working with the routing connections of a stream network, such as
+the segments of the MODFLOW SFR2 package.
+
+"""
+import numpy as np
+
+
+class SegmentRouting(object):
+    """
+    Routing connections between stream segments.
+
+    Each segment routes to at most one downstream segment, so the network is
+    stored as an array with the downstream segment of each segment and a
+    compressed sparse row (CSR) array of the upstream segments of each
+    segment. Outlets, upstream and downstream segments, circular routing,
+    and the topological order of the segments are computed in time that is
+    linear in the number of segments.
+
+    Parameters
+    ----------
+    nseg : array of ints
+        Segment numbers
+    outseg : array of ints
+        Segment number that each segment routes to. Values that are not
+        segment numbers (0 for outlets, negative lake numbers, etc.) end
+        the routing.
+
+    Attributes
+    ----------
+    downstream : ndarray
+        Index (not segment number) of the downstream segment of each
+        segment; -1 for segments that do not route to another segment.
+    cycles : list of lists
+        Segment numbers of each circular routing sequence.
+
+    Examples
+    --------
+    >>> from flopy.utils.routing import SegmentRouting
+    >>> routing = SegmentRouting([1, 2, 3, 4], [3, 3, 4, 0])
+    >>> routing.get_upstream(4)
+    array([3, 1, 2])
+    >>> routing.get_outlets()
+    {1: 4, 2: 4, 3: 4, 4: 4}
+
+    """
+
+    def __init__(self, nseg, outseg):
+        self.nseg = np.array(nseg, dtype=np.int).ravel()
+        self.outseg = np.array(outseg, dtype=np.int).ravel()
+        n = len(self.nseg)
+        self.nsegments = n
+
+        # index of the downstream segment of each segment
+        order = np.argsort(self.nseg, kind='mergesort')
+        self._sorted = self.nseg[order]
+        self._order = order
+        self.downstream = self._index(self.outseg)
+        self.downstream[self.outseg <= 0] = -1
+
+        # CSR array of upstream segments, in the order of the segments
+        routed = np.where(self.downstream >= 0)[0]
+        idx = np.argsort(self.downstream[routed], kind='mergesort')
+        self._up_idx = routed[idx]
+        self._up_ptr = np.zeros(n + 1, dtype=np.int)
+        # minlength must be positive in older versions of numpy
+        if n > 0:
+            np.cumsum(np.bincount(self.downstream[routed], minlength=n),
+                      out=self._up_ptr[1:])
+
+        self._traverse()
+
+    def _index(self, segments):
+        """index of segment numbers, -1 for values that are not segments"""
+        segments = np.atleast_1d(np.asarray(segments, dtype=np.int))
+        if self.nsegments == 0:
+            return np.full(segments.shape, -1, dtype=np.int)
+        pos = np.searchsorted(self._sorted, segments)
+        pos = np.clip(pos, 0, self.nsegments - 1)
+        found = self._sorted[pos] == segments
+        return np.where(found, self._order[pos], -1)
+
+    def _children(self, i):
+        return self._up_idx[self._up_ptr[i]:self._up_ptr[i + 1]]
+
+    def _traverse(self):
+        n = self.nsegments
+        self.roots = np.where(self.downstream < 0)[0]
+
+        # depth first (pre-order) traversal of the upstream segments of
+        # each root; the upstream segments of a segment are the segments
+        # that follow it in the pre-order, up to the size of its subtree
+        preorder = np.empty(n, dtype=np.int)
+        root = np.full(n, -1, dtype=np.int)
+        depth = np.full(n, -1, dtype=np.int)
+        k = 0
+        for r in self.roots:
+            stack = [r]
+            root[r] = r
+            depth[r] = 0
+            while stack:
+                i = stack.pop()
+                preorder[k] = i
+                k += 1
+                children = self._children(i)
+                root[children] = root[i]
+                depth[children] = depth[i] + 1
+                # reversed so that upstream segments are visited in order
+                stack.extend(children[::-1].tolist())
+        self._preorder = preorder[:k]
+        self._pos = np.full(n, -1, dtype=np.int)
+        self._pos[self._preorder] = np.arange(k)
+        size = np.ones(n, dtype=np.int)
+        for i in self._preorder[::-1]:
+            d = self.downstream[i]
+            if d >= 0:
+                size[d] += size[i]
+        self._size = size
+        self._root = root
+        self.depth = depth
+
+        # segments that are not upstream of a root are in, or upstream
+        # of, circular routing sequences
+        self.cycles = []
+        self._incycle = np.zeros(n, dtype=bool)
+        state = np.where(root >= 0, 2, 0)
+        for i in np.where(state == 0)[0]:
+            if state[i] != 0:
+                continue
+            path = []
+            onpath = {}
+            j = i
+            while j >= 0 and state[j] == 0:
+                state[j] = 1
+                onpath[j] = len(path)
+                path.append(j)
+                j = self.downstream[j]
+            if j >= 0 and state[j] == 1:
+                self.cycles.append(self.nseg[path[onpath[j]:]].tolist())
+                self._incycle[path[onpath[j]:]] = True
+            state[path] = 2
+
+    @property
+    def has_cycles(self):
+        """True if there is circular routing."""
+        return len(self.cycles) > 0
+
+    def get_topological_order(self):
+        """
+        Return the segments in an order where each segment is before the
+        segment it routes to (from the headwaters to the outlets). Segments
+        in, or upstream of, circular routing are not included.
+
+        Returns
+        -------
+        segments : ndarray
+            Segment numbers
+
+        """
+        return self.nseg[self._preorder[::-1]]
+
+    def get_breadth_first_order(self):
+        """
+        Return the segments in breadth first order from the outlets: the
+        segments without a downstream segment, then the segments that
+        route to them, and so on. Segments in, or upstream of, circular
+        routing are not included.
+
+        Returns
+        -------
+        segments : ndarray
+            Segment numbers
+
+        """
+        order = []
+        level = self.roots
+        while len(level) > 0:
+            order.append(level)
+            start = self._up_ptr[level]
+            count = self._up_ptr[level + 1] - start
+            k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count,
+                                                   count)
+            level = self._up_idx[np.repeat(start, count) + k]
+        if not order:
+            return self.nseg[:0]
+        return self.nseg[np.concatenate(order)]
+
+    def get_headwaters(self):
+        """
+        Return the segments that no other segment routes to.
+
+        """
+        return self.nseg[np.diff(self._up_ptr) == 0]
+
+    def get_upstream(self, segment, include_self=False):
+        """
+        Return all segments upstream of a segment.
+
+        Parameters
+        ----------
+        segment : int
+            Segment number
+        include_self : bool
+            If True, the segment is included in the result (default False)
+
+        Returns
+        -------
+        segments : ndarray
+            Segment numbers. Segments in the same branch are ordered from
+            downstream to upstream.
+
+        """
+        i = self._index(segment)[0]
+        if i < 0:
+            raise ValueError('{} is not a segment'.format(segment))
+        idx = self._upstream_index(i)
+        if not include_self:
+            idx = idx[1:]
+        return self.nseg[idx]
+
+    def _upstream_index(self, i):
+        """upstream indices of segment index i, starting with i"""
+        if self._pos[i] >= 0:
+            p = self._pos[i]
+            return self._preorder[p:p + self._size[i]]
+        # segment is in or upstream of circular routing
+        visited = {i: None}
+        stack = [i]
+        result = []
+        while stack:
+            j = stack.pop()
+            result.append(j)
+            for c in self._children(j)[::-1].tolist():
+                if c not in visited:
+                    visited[c] = None
+                    stack.append(c)
+        return np.array(result, dtype=np.int)
+
+    def get_downstream(self, segment, include_self=False):
+        """
+        Return the segments downstream of a segment, in the order that
+        they are routed to. For segments upstream of circular routing, the
+        sequence ends when a segment repeats.
+
+        Parameters
+        ----------
+        segment : int
+            Segment number
+        include_self : bool
+            If True, the segment is included in the result (default False)
+
+        Returns
+        -------
+        segments : ndarray
+            Segment numbers
+
+        """
+        i = self._index(segment)[0]
+        if i < 0:
+            raise ValueError('{} is not a segment'.format(segment))
+        path = [i]
+        seen = {i: None}
+        j = self.downstream[i]
+        while j >= 0 and j not in seen:
+            path.append(j)
+            seen[j] = None
+            j = self.downstream[j]
+        if not include_self:
+            path = path[1:]
+        return self.nseg[np.array(path, dtype=np.int)]
+
+    def get_all_upstream(self):
+        """
+        Return the upstream segments of all segments that other segments
+        route to.
+
+        Returns
+        -------
+        upsegs : dict
+            Dictionary of the form {outseg: array of upstream segments},
+            for each positive outseg value. Values of outseg that are not
+            segment numbers are included, with the segments that route to
+            them and their upstream segments. Segments in circular routing
+            are upstream of themselves.
+
+        """
+        upsegs = {}
+        outsegs = np.unique(self.outseg[self.outseg > 0])
+        for o in outsegs.tolist():
+            i = self._index(o)[0]
+            if i >= 0:
+                idx = self._upstream_index(i)
+                if not self._incycle[i]:
+                    idx = idx[1:]
+            else:
+                direct = np.where(self.outseg == o)[0]
+                idx = np.concatenate([self._upstream_index(d)
+                                      for d in direct])
+            upsegs[o] = np.sort(np.unique(self.nseg[idx]))
+        return upsegs
+
+    def get_outlets(self):
+        """
+        Return the outlet of each segment.
+
+        Returns
+        -------
+        outlets : dict
+            Dictionary of the form {segment: outlet}. The outlet is the
+            last segment in the routing sequence, or the outseg value of
+            that segment if it is not 0 or 999999 (for example, a lake
+            number). The outlet is 0 for segments in, or upstream of,
+            circular routing.
+
+        """
+        outlet = np.zeros(self.nsegments, dtype=np.int)
+        reached = self._root >= 0
+        root = self._root[reached]
+        rootout = self.outseg[root]
+        outlet[reached] = np.where((rootout == 0) | (rootout == 999999),
+                                   self.nseg[root], rootout)
+        return dict(zip(self.nseg.tolist(), outlet.tolist()))
+
+    def get_outseg_sequences(self):
+        """
+        Return the sequence of outsegs for each segment.
+
+        Returns
+        -------
+        outsegs : ndarray
+            Array with one column for each segment. The first row contains
+            the segment numbers, the second row the outsegs of the
+            segments, the third row the outsegs of the outsegs, and so on,
+            until all outlets have been reached. Rows end with zeros after
+            the outlet. For segments in circular routing, the sequence
+            repeats until the rows of the other segments end, or until
+            each circle is complete.
+
+        """
+        nlevels = 1
+        if np.any(self.depth >= 0):
+            nlevels = self.depth.max() + 2
+        if self.cycles:
+            nlevels += max(len(c) for c in self.cycles)
+        rows = [self.nseg]
+        cur = np.arange(self.nsegments)
+        for level in range(nlevels):
+            valid = cur >= 0
+            row = np.zeros(self.nsegments, dtype=np.int)
+            row[valid] = self.outseg[cur[valid]]
+            rows.append(row)
+            cur = np.where(valid, self.downstream[np.maximum(cur, 0)], -1)
+            if row.max() <= 0:
+                break
+        return np.vstack(rows)
+
+    def get_renumbering(self):
+        """
+        Return new segment numbers that are continuous and increase in the
+        downstream direction. Segments are numbered in reverse breadth
+        first order from the outlets.
+
+        Returns
+        -------
+        renumbering : dict
+            Dictionary of the form {old segment number: new segment number}
+
+        """
+        if self.has_cycles:
+            raise ValueError('segments can not be renumbered when there ' +
+                             'is circular routing: {}'.format(self.cycles))
+        order = self.get_breadth_first_order()
+        new = np.arange(self.nsegments, self.nsegments - len(order), -1)
+        r = {0: 0}
+        r.update(zip(order.tolist(), new.tolist()))
+        return r
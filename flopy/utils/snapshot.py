@@ -0,0 +1,315 @@
+"""
+Module for writing and reading binary snapshots of flopy models.
+
+A snapshot is a single file with a JSON description of the model object
+graph (models, packages, Util2d, Util3d, Transient2d, MfList instances,
+etc.) followed by a block containing the raw data of every numpy array.
+Arrays are reloaded as views into a memory map of the file, so a model can
+be reconstituted without parsing the MODFLOW text input files.
+
+"""
+import io
+import sys
+import json
+import struct
+import importlib
+from collections import OrderedDict
+
+import numpy as np
+
+from ..version import __version__
+
+_magic = b'FLOPYSNP'
+_snapshot_version = 1
+_header = struct.Struct('<8sIQ')
+_alignment = 64
+
+
+def _type_path(t):
+    name = getattr(t, '__qualname__', t.__name__)
+    return '{}:{}'.format(t.__module__, name)
+
+
+def _import_type(path):
+    module, name = path.split(':')
+    obj = importlib.import_module(module)
+    for attr in name.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _dtype_descr(dtype):
+    if dtype.fields is None:
+        return dtype.str
+    return [[name, _dtype_descr(dtype.fields[name][0])]
+            for name in dtype.names]
+
+
+def _dtype_from_descr(descr):
+    if isinstance(descr, list):
+        return np.dtype([(str(name), _dtype_from_descr(d))
+                         for name, d in descr])
+    return np.dtype(str(descr))
+
+
+def _has_object(dtype):
+    if dtype.fields is None:
+        return dtype.hasobject
+    return any(_has_object(dtype.fields[name][0]) for name in dtype.names)
+
+
+class _SnapshotWriter(object):
+    """
+    Encode an object graph to JSON-compatible data. numpy array data are
+    collected separately so they can be written as one binary block.
+
+    """
+
+    def __init__(self):
+        self.objects = []
+        self.arrays = []
+        self.array_info = []
+        self.nbytes = 0
+        self._memo = {}
+        self._array_memo = {}
+        # keep references so that ids are not reused while encoding
+        self._keep = []
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, float, str)):
+            return value
+        if isinstance(value, int):
+            return value
+        if sys.version_info[0] < 3 and isinstance(value, (long, unicode)):
+            return value
+        if isinstance(value, bytes):
+            return {'__bytes__': value.decode('latin-1')}
+        if isinstance(value, np.generic):
+            if isinstance(value, np.void) or value.dtype.hasobject:
+                return self.encode(tuple(value.tolist()))
+            return {'__scalar__': value.dtype.str, 'value': value.item()}
+        if isinstance(value, np.dtype):
+            return {'__dtype__': _dtype_descr(value)}
+        if isinstance(value, np.ndarray):
+            return self._encode_array(value)
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        if isinstance(value, tuple):
+            return {'__tuple__': [self.encode(v) for v in value]}
+        if isinstance(value, (set, frozenset)):
+            return {'__set__': [self.encode(v) for v in value]}
+        if isinstance(value, dict):
+            items = [[self.encode(k), self.encode(v)]
+                     for k, v in value.items()]
+            if isinstance(value, OrderedDict):
+                return {'__odict__': items}
+            return {'__dict__': items}
+        if isinstance(value, type):
+            return {'__type__': _type_path(value)}
+        if hasattr(value, '__dict__') and not callable(value) and \
+                not isinstance(value, io.IOBase):
+            return self._encode_object(value)
+        raise TypeError('snapshot error: can not save object of type ' +
+                        '{}'.format(type(value)))
+
+    def _encode_object(self, obj):
+        key = id(obj)
+        if key in self._memo:
+            return {'__ref__': self._memo[key]}
+        idx = len(self.objects)
+        self._memo[key] = idx
+        self._keep.append(obj)
+        self.objects.append(None)
+        state = [[k, self.encode(v)] for k, v in vars(obj).items()]
+        self.objects[idx] = {'type': _type_path(type(obj)), 'state': state}
+        return {'__ref__': idx}
+
+    def _encode_array(self, a):
+        key = id(a)
+        if key in self._array_memo:
+            return {'__array__': self._array_memo[key]}
+        self._keep.append(a)
+        idx = len(self.array_info)
+        self._array_memo[key] = idx
+        self.array_info.append(None)
+        if isinstance(a, np.ma.MaskedArray):
+            info = {'masked': True,
+                    'data': self.encode(a.data),
+                    'mask': self.encode(np.ma.getmaskarray(a)),
+                    'fill_value': self.encode(a.fill_value)}
+        elif _has_object(a.dtype):
+            # object data can not be memory mapped
+            info = {'dtype': _dtype_descr(a.dtype), 'shape': list(a.shape),
+                    'values': self.encode(a.ravel().tolist())}
+        else:
+            data = np.ascontiguousarray(a)
+            offset = self.nbytes
+            self.arrays.append((offset, data))
+            self.nbytes += data.nbytes
+            # align the start of the next array
+            self.nbytes += -self.nbytes % _alignment
+            info = {'dtype': _dtype_descr(a.dtype), 'shape': list(a.shape),
+                    'offset': offset}
+        info['recarray'] = isinstance(a, np.recarray)
+        self.array_info[idx] = info
+        return {'__array__': idx}
+
+
+class _SnapshotReader(object):
+    """
+    Rebuild an object graph from the data created by _SnapshotWriter.
+
+    """
+
+    def __init__(self, objects, arrays, data):
+        self._object_info = objects
+        self._array_info = arrays
+        self._data = data
+        self.arrays = [None for info in arrays]
+        # create all objects first so that references between objects,
+        # including cycles, can be resolved
+        self.objects = []
+        for info in objects:
+            cls = _import_type(info['type'])
+            self.objects.append(cls.__new__(cls))
+        for obj, info in zip(self.objects, objects):
+            # bypass __setattr__ methods that convert values
+            obj.__dict__.update((str(k), self.decode(v))
+                                for k, v in info['state'])
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if '__ref__' in value:
+            return self.objects[value['__ref__']]
+        if '__array__' in value:
+            return self._decode_array(value['__array__'])
+        if '__tuple__' in value:
+            return tuple(self.decode(v) for v in value['__tuple__'])
+        if '__dict__' in value:
+            return dict((self.decode(k), self.decode(v))
+                        for k, v in value['__dict__'])
+        if '__odict__' in value:
+            return OrderedDict((self.decode(k), self.decode(v))
+                               for k, v in value['__odict__'])
+        if '__set__' in value:
+            return set(self.decode(v) for v in value['__set__'])
+        if '__scalar__' in value:
+            return np.dtype(str(value['__scalar__'])).type(value['value'])
+        if '__dtype__' in value:
+            return _dtype_from_descr(value['__dtype__'])
+        if '__type__' in value:
+            return _import_type(value['__type__'])
+        if '__bytes__' in value:
+            return value['__bytes__'].encode('latin-1')
+        raise ValueError('snapshot error: unknown entry {}'.format(value))
+
+    def _decode_array(self, idx):
+        if self.arrays[idx] is not None:
+            return self.arrays[idx]
+        info = self._array_info[idx]
+        if info.get('masked', False):
+            a = np.ma.masked_array(self.decode(info['data']),
+                                   mask=self.decode(info['mask']),
+                                   fill_value=self.decode(info['fill_value']))
+        else:
+            dtype = _dtype_from_descr(info['dtype'])
+            shape = tuple(info['shape'])
+            if 'values' in info:
+                values = self.decode(info['values'])
+                a = np.empty(len(values), dtype=dtype)
+                for i, v in enumerate(values):
+                    a[i] = v
+                a = a.reshape(shape)
+            else:
+                count = int(np.prod(shape))
+                offset = info['offset']
+                nbytes = count * dtype.itemsize
+                if nbytes == 0:
+                    a = np.empty(shape, dtype=dtype)
+                else:
+                    a = self._data[offset:offset + nbytes]
+                    a = a.view(np.ndarray).view(dtype).reshape(shape)
+            if info['recarray']:
+                a = a.view(np.recarray)
+        self.arrays[idx] = a
+        return a
+
+
+def save_snapshot(obj, filename):
+    """
+    Write a binary snapshot of a flopy object, typically a model.
+
+    Parameters
+    ----------
+    obj : object
+        Object to save. All objects it references are saved with it.
+    filename : str
+        Name of the snapshot file.
+
+    """
+    writer = _SnapshotWriter()
+    root = writer.encode(obj)
+    meta = {'flopy_version': __version__,
+            'root': root,
+            'objects': writer.objects,
+            'arrays': writer.array_info}
+    text = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    start = _header.size + len(text)
+    start += -start % _alignment
+    with open(filename, 'wb') as f:
+        f.write(_header.pack(_magic, _snapshot_version, len(text)))
+        f.write(text)
+        f.write(b'\0' * (start - _header.size - len(text)))
+        for offset, data in writer.arrays:
+            f.seek(start + offset)
+            data.tofile(f)
+        # make sure the file covers the padding after the last array
+        f.truncate(start + writer.nbytes)
+
+
+def load_snapshot(filename, mmap=True):
+    """
+    Read a binary snapshot written by save_snapshot.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the snapshot file.
+    mmap : bool
+        If True, arrays are copy-on-write views of a memory map of the file
+        and array data is only read from disk when it is used. If False,
+        all array data are read into memory. (default is True)
+
+    Returns
+    -------
+    obj : object
+        The object that was saved.
+
+    """
+    with open(filename, 'rb') as f:
+        magic, version, ntext = _header.unpack(f.read(_header.size))
+        if magic != _magic:
+            raise ValueError('{} is not a flopy snapshot file'.format(
+                filename))
+        if version != _snapshot_version:
+            raise ValueError('unsupported snapshot version {}'.format(
+                version))
+        meta = json.loads(f.read(ntext).decode('utf-8'),
+                          object_pairs_hook=OrderedDict)
+        start = _header.size + ntext
+        start += -start % _alignment
+        f.seek(0, 2)
+        nbytes = f.tell() - start
+        if nbytes == 0:
+            data = np.empty(0, dtype=np.uint8)
+        elif mmap:
+            data = np.memmap(f, dtype=np.uint8, mode='c', offset=start,
+                             shape=(nbytes,))
+        else:
+            f.seek(start)
+            data = np.fromfile(f, dtype=np.uint8, count=nbytes)
+    reader = _SnapshotReader(meta['objects'], meta['arrays'], data)
+    return reader.decode(meta['root'])
@@ -14,6 +14,7 @@ import copy
 import numbers
 import numpy as np
 from ..utils.binaryfile import BinaryHeader
+from ..utils.utils_def import get_content_hash
 
 
 class ArrayFormat(object):
@@ -575,6 +576,15 @@ class Util3d(object):
             # set the attribute for u3d
             super(Util3d, self).__setattr__(key, value)
 
+    @property
+    def content_hash(self):
+        """
+        Hash of the layer arrays and their settings.
+
+        """
+        from ..mbase import BaseModel
+        return get_content_hash(self, skip_types=(BaseModel,))
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.util3d_helper(f, self, **kwargs)
@@ -1464,6 +1474,15 @@ class Transient2d(object):
             arr[kper, 0, :, :] = u2d.array
         return arr
 
+    @property
+    def content_hash(self):
+        """
+        Hash of the arrays for all stress periods.
+
+        """
+        from ..mbase import BaseModel
+        return get_content_hash(self, skip_types=(BaseModel,))
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.transient2d_helper(f, self, **kwargs)
@@ -1797,6 +1816,16 @@ class Util2d(object):
                                      names=title, filenames=filename,
                                      fignum=fignum, **kwargs)
 
+    @property
+    def content_hash(self):
+        """
+        Hash of the array value, format, and settings. The hash also
+        changes if the array is changed in place.
+
+        """
+        from ..mbase import BaseModel
+        return get_content_hash(self, skip_types=(BaseModel,))
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.util2d_helper(f, self, **kwargs)
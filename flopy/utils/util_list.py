@@ -12,6 +12,7 @@ from __future__ import division, print_function
 import os
 import warnings
 import numpy as np
+from .utils_def import get_content_hash
 
 
 class MfList(object):
@@ -90,6 +91,16 @@ class MfList(object):
         d[:, :] = -1.0E+10
         return d
 
+    @property
+    def content_hash(self):
+        """
+        Hash of the stress period data.
+
+        """
+        from ..mbase import BaseModel
+        from ..pakbase import Package
+        return get_content_hash(self, skip_types=(BaseModel, Package))
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.mflist_helper(f, self, **kwargs)
@@ -979,33 +990,65 @@ class MfList(object):
             assert m4d.ndim == 4
         keys = list(m4ds.keys())
 
-        for i1, key1 in enumerate(keys):
-            a1 = np.isnan(m4ds[key1])
-            for i2, key2 in enumerate(keys[i1:]):
-                a2 = np.isnan(m4ds[key2])
-                if not np.array_equal(a1, a2):
-                    raise Exception("Transient2d error: masking not equal" + \
-                                    " for {0} and {1}".format(key1, key2))
+        key1 = keys[0]
+        active = ~np.isnan(m4ds[key1])
+        for key2 in keys[1:]:
+            if not np.array_equal(active, ~np.isnan(m4ds[key2])):
+                raise Exception("Transient2d error: masking not equal" + \
+                                " for {0} and {1}".format(key1, key2))
+
+        # cells with data in all stress periods, in kper order
+        kper, kk, ii, jj = np.nonzero(active)
+        vals = {}
+        for name, m4d in m4ds.items():
+            vals[name] = m4d[kper, kk, ii, jj]
+        nper = active.shape[0]
+        bounds = np.searchsorted(kper, np.arange(nper + 1))
+
+        sp_data = {}
+        for iper in range(nper):
+            i0, i1 = bounds[iper], bounds[iper + 1]
+            spd = np.recarray(shape=i1 - i0, dtype=dtype)
+            spd["i"] = ii[i0:i1]
+            spd["k"] = kk[i0:i1]
+            spd["j"] = jj[i0:i1]
+            for n, v in vals.items():
+                spd[n] = v[i0:i1]
+            sp_data[iper] = spd
+        return sp_data
+
+    @staticmethod
+    def sparse_to_stress_period_data(dtype, sparse, nrow, ncol):
+        """ convert a dictionary of sparse (node, values) data to
+            a stress_period_data style dict of recarray, without building
+            4-dim arrays
+        Parameters
+        ----------
+            dtype : numpy dtype
 
+            sparse : dict {kper:(node, {name:values})}
+                node is an array of zero-based node numbers
+                (k * nrow * ncol + i * ncol + j) and values are arrays
+                of the same length as node
+            nrow : int
+                number of rows of the model grid
+            ncol : int
+                number of columns of the model grid
+        Returns
+        -------
+            dict {kper:recarray}
+        """
+        assert isinstance(sparse, dict)
         sp_data = {}
-        for kper in range(m4d.shape[0]):
-            vals = {}
-            for name, m4d in m4ds.items():
-                arr = m4d[kper, :, :, :]
-                isnan = np.argwhere(~np.isnan(arr))
-                v = []
-                for k, i, j in isnan:
-                    v.append(arr[k, i, j])
-                vals[name] = v
-                kk = isnan[:, 0]
-                ii = isnan[:, 1]
-                jj = isnan[:, 2]
-
-            spd = np.recarray(shape=isnan.shape[0], dtype=dtype)
-            spd["i"] = ii
-            spd["k"] = kk
-            spd["j"] = jj
+        for kper, (node, vals) in sparse.items():
+            node = np.asarray(node)
+            assert node.ndim == 1
+            spd = np.recarray(shape=node.shape[0], dtype=dtype)
+            spd["i"] = (node // ncol) % nrow
+            spd["k"] = node // (nrow * ncol)
+            spd["j"] = node % ncol
             for n, v in vals.items():
+                assert n in dtype.names
                 spd[n] = v
             sp_data[kper] = spd
         return sp_data
@@ -2,6 +2,8 @@
 Generic classes and utility functions
 """
 
+import os
+import hashlib
 from datetime import timedelta
 import numpy as np
 
@@ -103,3 +105,113 @@ def totim_to_datetime(totim, start='1-1-1970', timeunit='D'):
         t = timedelta(**kwargs)
         out.append(start + t)
     return out
+
+
+def get_content_hash(obj, skip_types=None, skip_files=None):
+    """
+    Calculate a hash of the data held by a flopy object (for example a
+    Package, Util2d, Util3d, Transient2d, or MfList instance). The hash
+    changes if any array, list, or scalar attribute of the object or of
+    the objects it holds changes, including changes made in place to numpy
+    arrays.
+
+    Parameters
+    ----------
+    obj : object
+        object to hash
+    skip_types : tuple of types
+        objects of these types are not included in the hash if they are
+        held by obj (for example, references back to the parent model).
+        (default is None)
+    skip_files : list of str
+        The modification time of existing files named by string attributes
+        is included in the hash, except for these files (for example, the
+        files that are written from obj). (default is None)
+
+    Returns
+    -------
+    hash : str
+        hexadecimal md5 digest
+
+    """
+    h = hashlib.md5()
+    if skip_files is not None:
+        skip_files = set(os.path.abspath(f) for f in skip_files)
+    _update_hash(h, obj, {id(obj)}, skip_types, skip_files, root=obj)
+    return h.hexdigest()
+
+
+def _callable_name(value):
+    # module and qualified name of a class, function, or method; the type
+    # for other callable objects
+    func = getattr(value, '__func__', value)
+    name = getattr(func, '__qualname__', getattr(func, '__name__', None))
+    if not isinstance(name, str):
+        func = type(value)
+        name = getattr(func, '__qualname__', func.__name__)
+    return '{}.{}'.format(getattr(func, '__module__', None), name)
+
+
+def _update_hash(h, value, memo, skip_types, skip_files, root=None):
+    def update(s):
+        h.update(s.encode('utf-8'))
+
+    if value is None or isinstance(value, (bool, int, float, np.generic)):
+        update('{!r}:{!r};'.format(type(value).__name__, value))
+    elif isinstance(value, str):
+        update('s:{!r};'.format(value))
+        # external files are identified by their name and modification time
+        if os.path.isfile(value) and (skip_files is None or
+                                      os.path.abspath(value) not in skip_files):
+            st = os.stat(value)
+            update('f:{!r}:{!r};'.format(st.st_size, st.st_mtime))
+    elif isinstance(value, bytes):
+        update('b:{!r};'.format(len(value)))
+        h.update(value)
+    elif isinstance(value, np.ndarray):
+        update('a:{}:{!r}:{!r};'.format(type(value).__name__, value.dtype.descr,
+                                        value.shape))
+        if isinstance(value, np.ma.MaskedArray):
+            h.update(np.ascontiguousarray(np.ma.getmaskarray(value)).data)
+            value = value.data
+        if value.dtype.hasobject:
+            update(repr(value.tolist()))
+        else:
+            h.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, (list, tuple)):
+        update('l:{}:{};'.format(type(value).__name__, len(value)))
+        for v in value:
+            _update_hash(h, v, memo, skip_types, skip_files)
+    elif isinstance(value, dict):
+        update('d:{};'.format(len(value)))
+        for k in sorted(value.keys(), key=repr):
+            _update_hash(h, k, memo, skip_types, skip_files)
+            _update_hash(h, value[k], memo, skip_types, skip_files)
+    elif isinstance(value, (set, frozenset)):
+        update('S:{!r};'.format(sorted(repr(v) for v in value)))
+    elif isinstance(value, np.dtype):
+        update('t:{!r};'.format(value))
+    elif isinstance(value, type) or callable(value):
+        # the repr of functions and methods includes their address, which
+        # changes from one session to the next
+        update('c:{};'.format(_callable_name(value)))
+    elif hasattr(value, '__dict__'):
+        if value is not root:
+            if skip_types is not None and isinstance(value, skip_types):
+                update('o:{};'.format(type(value).__name__))
+                return
+            # objects that are referenced more than once, including
+            # references back to an object that is being hashed
+            if id(value) in memo:
+                update('r:{};'.format(type(value).__name__))
+                return
+            memo.add(id(value))
+        update('o:{};'.format(type(value).__name__))
+        for k in sorted(vars(value).keys()):
+            # skip cached arrays that are built from other attributes
+            if k.endswith('_built'):
+                continue
+            update('k:{};'.format(k))
+            _update_hash(h, vars(value)[k], memo, skip_types, skip_files)
+    else:
+        update('u:{}:{!r};'.format(type(value).__name__, value))
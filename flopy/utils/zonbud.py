@@ -194,6 +194,9 @@ class ZoneBudget(object):
         self.ssst_record_names = [n for n in self.record_names
                                   if n not in internal_flow_terms]
 
+        # Reused for the constant head records of each time
+        self._full3D_buffer = np.ma.zeros(self.cbc_shape, np.float32)
+
         # Build budget record array
         array_list = []
         if self.kstpkper is not None:
@@ -414,7 +417,8 @@ class ZoneBudget(object):
         if 'CONSTANT HEAD' in reclist:
             reclist.remove('CONSTANT HEAD')
             chd = self.cbc.get_data(text='CONSTANT HEAD', full3D=True,
-                                    kstpkper=kstpkper, totim=totim)[0]
+                                    kstpkper=kstpkper, totim=totim,
+                                    out=self._full3D_buffer)[0]
             ich = np.zeros(self.cbc_shape, self.int_type)
             ich[chd != 0] = 1
         if 'FLOW RIGHT FACE' in reclist:
@@ -435,7 +439,8 @@ class ZoneBudget(object):
         if 'SWIADDTOCH' in reclist:
             reclist.remove('SWIADDTOCH')
             swichd = self.cbc.get_data(text='SWIADDTOCH', full3D=True,
-                                       kstpkper=kstpkper, totim=totim)[0]
+                                       kstpkper=kstpkper, totim=totim,
+                                       out=self._full3D_buffer)[0]
             swiich = np.zeros(self.cbc_shape, self.int_type)
             swiich[swichd != 0] = 1
         if 'SWIADDTOFRF' in reclist:
@@ -472,12 +477,10 @@ class ZoneBudget(object):
                                   self.float_type)
                 qout = np.ma.zeros((self.nlay * self.nrow * self.ncol),
                                    self.float_type)
-                for [node, q] in zip(data['node'], data['q']):
-                    idx = node - 1
-                    if q > 0:
-                        qin.data[idx] += q
-                    elif q < 0:
-                        qout.data[idx] += q
+                q = data['q']
+                idx = data['node'] - 1
+                np.add.at(qin.data, idx[q > 0], q[q > 0])
+                np.add.at(qout.data, idx[q < 0], q[q < 0])
                 qin = np.ma.reshape(qin, (self.nlay, self.nrow, self.ncol))
                 qout = np.ma.reshape(qout, (self.nlay, self.nrow, self.ncol))
             elif imeth == 0 or imeth == 1:
@@ -490,8 +493,8 @@ class ZoneBudget(object):
                 # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
                 rlay, rdata = data[0], data[1]
                 data = np.ma.zeros(self.cbc_shape, self.float_type)
-                for (r, c), l in np.ndenumerate(rlay):
-                    data[l - 1, r, c] = rdata[r, c]
+                r, c = np.indices(rlay.shape)
+                data[rlay - 1, r, c] = rdata
                 qin = np.ma.zeros(self.cbc_shape, self.float_type)
                 qout = np.ma.zeros(self.cbc_shape, self.float_type)
                 qin[data > 0] = data[data > 0]